@@ -1,8 +1,9 @@
+import os
 from datetime import datetime, timedelta
 from typing import Optional
 import jwt  # Changed from jose import jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -13,6 +14,13 @@ from .models import User
 SECRET_KEY = "your-secret-key-change-in-production-make-it-long-and-random"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 1 week
+# Feed tokens end up in calendar apps and shared URLs; signing them with their own key
+# means a leaked one can never pass as an API access token
+CALENDAR_SECRET_KEY = os.getenv("CALENDAR_SECRET_KEY", SECRET_KEY + ":calendar-feed")
+CALENDAR_AUDIENCE = "sciflow:calendar"
+
+# Set on POST /batch sub-requests: the caller (or None) was resolved once for the whole batch
+BATCH_USER_SCOPE_KEY = "sciflow.batch_user"
 
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
@@ -37,7 +45,52 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
+def decode_access_token(token: str) -> Optional[dict]:
+    """Claims of a valid API access token, or None. Calendar feed tokens never qualify."""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.InvalidTokenError:
+        return None
+    # Feed tokens issued before they had their own key carried this scope
+    if payload.get("scope") == "calendar" or payload.get("sub") is None:
+        return None
+    return payload
+
+
+def create_calendar_token(user: User) -> str:
+    """
+    Long-lived, read-only token embedded in ICS subscription URLs. It carries
+    the user's calendar_token_version, so rotating the version revokes it.
+    """
+    return jwt.encode(
+        {"sub": user.id, "aud": CALENDAR_AUDIENCE, "ver": user.calendar_token_version or 0},
+        CALENDAR_SECRET_KEY,
+        algorithm=ALGORITHM,
+    )
+
+
+async def get_calendar_user(
+    token: str = Query(...),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """Calendar clients cannot send Authorization headers, so the feed token travels in the query string."""
+    invalid = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid calendar token")
+    try:
+        payload = jwt.decode(token, CALENDAR_SECRET_KEY, algorithms=[ALGORITHM], audience=CALENDAR_AUDIENCE)
+    except jwt.InvalidTokenError:
+        raise invalid
+    if payload.get("sub") is None:
+        raise invalid
+
+    result = await db.execute(select(User).where(User.id == payload["sub"]))
+    user = result.scalar_one_or_none()
+    if user is None or payload.get("ver") != (user.calendar_token_version or 0):
+        raise invalid
+    return user
+
+
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ) -> User:
@@ -46,17 +99,18 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    if BATCH_USER_SCOPE_KEY in request.scope:
+        user = request.scope[BATCH_USER_SCOPE_KEY]
+        if user is None:
+            raise credentials_exception
+        return user
     if not token:
         raise credentials_exception
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except jwt.InvalidTokenError:  # Changed from JWTError
+    payload = decode_access_token(token)
+    if payload is None:
         raise credentials_exception
 
-    result = await db.execute(select(User).where(User.id == user_id))
+    result = await db.execute(select(User).where(User.id == payload["sub"]))
     user = result.scalar_one_or_none()
     if user is None:
         raise credentials_exception
@@ -74,12 +128,15 @@ async def get_current_organizer(current_user: User = Depends(get_current_user))
 
 # Optional: for endpoints that may or may not require auth
 async def get_current_user_optional(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     token: Optional[str] = Depends(oauth2_scheme)
 ) -> Optional[User]:
+    if BATCH_USER_SCOPE_KEY in request.scope:
+        return request.scope[BATCH_USER_SCOPE_KEY]
     if not token:
         return None
     try:
-        return await get_current_user(token, db)
+        return await get_current_user(request, token, db)
     except HTTPException:
         return None
@@ -0,0 +1,444 @@
+import asyncio
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+# memory (per worker), file (SQLite file shared by the workers on one host) or redis
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_FILE = os.getenv("CACHE_FILE", "./sciflow-cache.db")
+# Any Redis-protocol server (Redis, Valkey, KeyDB, ...); needs `pip install redis`
+CACHE_URL = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+# How often the file backend checks for invalidations published by other workers
+CACHE_BUS_POLL_SECONDS = float(os.getenv("CACHE_BUS_POLL_SECONDS", "1.0"))
+
+KEY_PREFIX = "sciflow:"
+BUS_CHANNEL = KEY_PREFIX + "invalidate"
+_MISSING = object()
+_worker_id: Optional[Tuple[int, str]] = None
+
+
+def worker_id() -> str:
+    """
+    Identifies this worker's own bus messages (so it does not handle them
+    twice) and the jobs it has claimed. Made on first use in each process, so
+    workers forked from a gunicorn --preload master do not share one.
+    """
+    global _worker_id
+    pid = os.getpid()
+    if _worker_id is None or _worker_id[0] != pid:
+        _worker_id = (pid, f"{pid}-{uuid.uuid4().hex[:8]}")
+    return _worker_id[1]
+
+
+class TTLCache:
+    """
+    Small in-process cache with per-entry expiry.
+    Callers invalidate explicitly after writes; the TTL only bounds staleness.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._data.pop(key, None)
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        if len(self._data) >= self.maxsize and key not in self._data:
+            # Drop the entry closest to expiry to make room
+            oldest = min(self._data, key=lambda k: self._data[k][0])
+            self._data.pop(oldest, None)
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._data[key] = (time.monotonic() + ttl, value)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    def invalidate_prefix(self, prefix: str):
+        for key in [k for k in self._data if isinstance(k, str) and k.startswith(prefix)]:
+            self._data.pop(key, None)
+
+
+class MemoryBackend:
+    """Per-process storage; invalidations only reach the current worker."""
+
+    def __init__(self, maxsize: int = 4096):
+        self._store = TTLCache(ttl_seconds=300, maxsize=maxsize)
+
+    async def get(self, key: str) -> Any:
+        return self._store.get(key, _MISSING)
+
+    async def get_many(self, keys: List[str]) -> List[Any]:
+        return [self._store.get(key, _MISSING) for key in keys]
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self._store.set(key, value, ttl)
+
+    async def set_many(self, items: Dict[str, Any], ttl: float):
+        for key, value in items.items():
+            self._store.set(key, value, ttl)
+
+    async def delete(self, key: str):
+        self._store.invalidate(key)
+
+    async def delete_prefix(self, prefix: str):
+        self._store.invalidate_prefix(prefix)
+
+    async def publish(self, message: str):
+        pass
+
+    async def listen(self) -> AsyncIterator[str]:
+        # Nothing to receive; park until the bus task is cancelled
+        await asyncio.Event().wait()
+        yield ""
+
+    async def close(self):
+        pass
+
+
+class FileBackend:
+    """
+    SQLite file shared by every worker on the host. Values are pickled; the
+    events table doubles as the invalidation bus, polled by each worker.
+    """
+
+    def __init__(self, path: str = CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_events "
+                "(id INTEGER PRIMARY KEY AUTOINCREMENT, message TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _run(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    def _run_many(self, sql: str, rows: List[tuple]):
+        with self._lock:
+            conn = self._connection()
+            # One transaction, so one fsync for the whole batch
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(sql, rows)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    async def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        return await asyncio.to_thread(self._run, sql, params)
+
+    async def get(self, key: str) -> Any:
+        rows = await self._execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        )
+        return pickle.loads(rows[0][0]) if rows else _MISSING
+
+    async def get_many(self, keys: List[str]) -> List[Any]:
+        found: Dict[str, Any] = {}
+        now = time.time()
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = await self._execute(
+                f"SELECT key, value FROM cache_entries WHERE key IN ({','.join('?' * len(chunk))}) AND expires_at > ?",
+                (*chunk, now),
+            )
+            found.update((key, pickle.loads(value)) for key, value in rows)
+        return [found.get(key, _MISSING) for key in keys]
+
+    async def set(self, key: str, value: Any, ttl: float):
+        await self._execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), time.time() + ttl),
+        )
+
+    async def set_many(self, items: Dict[str, Any], ttl: float):
+        expires_at = time.time() + ttl
+        rows = [
+            (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expires_at)
+            for key, value in items.items()
+        ]
+        await asyncio.to_thread(
+            self._run_many, "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)", rows
+        )
+
+    async def delete(self, key: str):
+        await self._execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    async def delete_prefix(self, prefix: str):
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        await self._execute("DELETE FROM cache_entries WHERE key LIKE ? ESCAPE '\\'", (escaped + "%",))
+
+    async def publish(self, message: str):
+        now = time.time()
+        await self._execute("INSERT INTO cache_events (message, created_at) VALUES (?, ?)", (message, now))
+        # Keep the bus table small; a minute is far longer than any poll interval
+        await self._execute("DELETE FROM cache_events WHERE created_at < ?", (now - 60,))
+        await self._execute("DELETE FROM cache_entries WHERE expires_at < ?", (now,))
+
+    async def listen(self) -> AsyncIterator[str]:
+        rows = await self._execute("SELECT COALESCE(MAX(id), 0) FROM cache_events")
+        last_id = rows[0][0]
+        while True:
+            await asyncio.sleep(CACHE_BUS_POLL_SECONDS)
+            rows = await self._execute(
+                "SELECT id, message FROM cache_events WHERE id > ? ORDER BY id", (last_id,)
+            )
+            for event_id, message in rows:
+                last_id = event_id
+                yield message
+
+    async def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class RedisBackend:
+    """Redis-protocol server shared by every worker and host; pub/sub carries the bus."""
+
+    def __init__(self, url: str = CACHE_URL, client=None):
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError:
+                raise RuntimeError("CACHE_BACKEND=redis needs the redis package (pip install redis)")
+            client = redis.Redis.from_url(url)
+        self.client = client
+
+    async def get(self, key: str) -> Any:
+        value = await self.client.get(key)
+        return _MISSING if value is None else pickle.loads(value)
+
+    async def get_many(self, keys: List[str]) -> List[Any]:
+        values = await self.client.mget(keys)
+        return [_MISSING if value is None else pickle.loads(value) for value in values]
+
+    async def set(self, key: str, value: Any, ttl: float):
+        await self.client.set(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), px=int(ttl * 1000))
+
+    async def set_many(self, items: Dict[str, Any], ttl: float):
+        # MSET has no expiry; pipelined SETs still cost one round trip
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), px=int(ttl * 1000))
+            await pipe.execute()
+
+    async def delete(self, key: str):
+        await self.client.delete(key)
+
+    async def delete_prefix(self, prefix: str):
+        keys = [key async for key in self.client.scan_iter(match=prefix + "*", count=500)]
+        if keys:
+            await self.client.delete(*keys)
+
+    async def publish(self, message: str):
+        await self.client.publish(BUS_CHANNEL, message)
+
+    async def listen(self) -> AsyncIterator[str]:
+        pubsub = self.client.pubsub()
+        await pubsub.subscribe(BUS_CHANNEL)
+        try:
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None:
+                    continue
+                data = message["data"]
+                yield data.decode() if isinstance(data, bytes) else data
+        finally:
+            await pubsub.unsubscribe(BUS_CHANNEL)
+            await pubsub.close()
+
+    async def close(self):
+        await self.client.close()
+
+
+def create_backend(kind: str = CACHE_BACKEND):
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "file":
+        return FileBackend()
+    if kind == "redis":
+        return RedisBackend()
+    raise ValueError(f"Unknown CACHE_BACKEND: {kind}")
+
+
+backend = create_backend()
+
+
+def set_backend(new_backend):
+    """Swap the storage/bus backend, e.g. for a Redis stand-in in local testing."""
+    global backend
+    backend = new_backend
+
+
+def _encode_key(key: Hashable) -> str:
+    if isinstance(key, tuple):
+        return ":".join("" if part is None else str(part) for part in key)
+    return str(key)
+
+
+class Cache:
+    """
+    A namespace on the configured backend. get_or_set() coalesces concurrent
+    misses for the same key in this worker into a single load.
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: float):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self._prefix = f"{KEY_PREFIX}{namespace}:"
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _key(self, key: Hashable) -> str:
+        return self._prefix + _encode_key(key)
+
+    async def get(self, key: Hashable, default: Any = None) -> Any:
+        value = await backend.get(self._key(key))
+        return default if value is _MISSING else value
+
+    async def get_many(self, keys: List[Hashable]) -> Dict[Hashable, Any]:
+        """Cached values for whichever of `keys` are present, in one backend round trip."""
+        if not keys:
+            return {}
+        values = await backend.get_many([self._key(key) for key in keys])
+        return {key: value for key, value in zip(keys, values) if value is not _MISSING}
+
+    async def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        await backend.set(self._key(key), value, ttl_seconds or self.ttl_seconds)
+
+    async def set_many(self, items: Dict[Hashable, Any], ttl_seconds: Optional[float] = None):
+        if items:
+            await backend.set_many(
+                {self._key(key): value for key, value in items.items()}, ttl_seconds or self.ttl_seconds
+            )
+
+    async def delete(self, key: Hashable):
+        await backend.delete(self._key(key))
+
+    async def clear(self):
+        await backend.delete_prefix(self._prefix)
+
+    async def clear_prefix(self, prefix: Hashable):
+        """Drop every tuple key starting with `prefix`, e.g. all (conference_id, ...) entries."""
+        await backend.delete_prefix(self._key(prefix) + ":")
+
+    async def get_or_set(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        full_key = self._key(key)
+        value = await backend.get(full_key)
+        if value is not _MISSING:
+            return value
+
+        pending = self._inflight.get(full_key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[full_key] = future
+        try:
+            value = await loader()
+            await backend.set(full_key, value, self.ttl_seconds)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an error nobody else awaited is not logged
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(full_key, None)
+
+
+Handler = Callable[[dict], Awaitable[None]]
+
+
+class InvalidationBus:
+    """
+    Named events (e.g. "conference.changed") fanned out to handlers in every
+    worker. publish() runs this worker's handlers before returning, so a write
+    reads its own result; other workers get the event through the backend.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, event: str, handler: Handler):
+        self._handlers.setdefault(event, []).append(handler)
+
+    async def _dispatch(self, event: str, data: dict):
+        for handler in self._handlers.get(event, []):
+            try:
+                await handler(data)
+            except Exception as e:
+                print(f"Error handling {event}: {e}")
+
+    async def publish(self, event: str, **data):
+        await self._dispatch(event, data)
+        message = json.dumps({"origin": worker_id(), "event": event, "data": data}, default=str)
+        try:
+            await backend.publish(message)
+        except Exception as e:
+            # Other workers fall back to TTL expiry for this event
+            print(f"Error publishing {event}: {e}")
+
+    async def _listen(self):
+        while True:
+            try:
+                async for message in backend.listen():
+                    if not message:
+                        continue
+                    payload = json.loads(message)
+                    if payload.get("origin") == worker_id():
+                        continue
+                    await self._dispatch(payload["event"], payload.get("data") or {})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error reading cache invalidation bus: {e}")
+                await asyncio.sleep(5)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await backend.close()
+
+
+bus = InvalidationBus()
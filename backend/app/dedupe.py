@@ -0,0 +1,191 @@
+import math
+import os
+import re
+import unicodedata
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Conference, ExternalEvent
+
+# Trigram Jaccard similarity at which two normalized names count as the same event
+DEDUPE_NAME_THRESHOLD = float(os.getenv("DEDUPE_NAME_THRESHOLD", "0.7"))
+# Similar names further apart than this are different editions, not duplicates
+DEDUPE_DATE_TOLERANCE_DAYS = int(os.getenv("DEDUPE_DATE_TOLERANCE_DAYS", "14"))
+
+TRACKING_PARAMS = {"ref", "source", "fbclid", "gclid", "mc_cid", "mc_eid", "igshid", "yclid"}
+# Words nearly every conference name has; they make unrelated names look alike
+STOPWORDS = {
+    "the", "of", "on", "in", "and", "for", "a", "an",
+    "international", "intl", "annual", "conference", "conf", "symposium", "summit", "workshop", "meeting",
+}
+MIN_NAME_LENGTH = 4
+_YEAR = re.compile(r"\b(?:19|20)\d{2}\b")
+
+
+def canonical_url(url: Optional[str]) -> Optional[str]:
+    """
+    Scheme-less, lower-cased host without www., default port, fragment,
+    tracking parameters or trailing slash; remaining query params sorted.
+    """
+    if not url:
+        return None
+    parts = urlsplit(url.strip() if "//" in url else "//" + url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/")
+    canonical = host + path
+    if query:
+        canonical += "?" + urlencode(query)
+    return canonical or None
+
+
+def fold(text: Optional[str]) -> List[str]:
+    """Lower-cased, accent-free alphanumeric words."""
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return re.sub(r"[^a-z0-9]+", " ", text).split()
+
+
+def normalize_name(name: Optional[str]) -> str:
+    return " ".join(w for w in fold(name) if w not in STOPWORDS)
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _dates_agree(a: Optional[date], b: Optional[date]) -> bool:
+    return a is None or b is None or abs((a - b).days) <= DEDUPE_DATE_TOLERANCE_DAYS
+
+
+class Candidate(NamedTuple):
+    conference_id: int
+    is_external: bool
+    # Feed owning the conference, if it came from one
+    source: Optional[str]
+    start_date: Optional[date]
+    years: frozenset
+
+
+class DuplicateIndex:
+    """
+    Canonical-URL map plus an inverted trigram index over normalized
+    names/acronyms. A lookup only scores conferences sharing a trigram with
+    the query, instead of comparing against the whole catalog.
+    """
+
+    def __init__(self):
+        self._by_url: Dict[str, List[int]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        # entry id -> (conference id, trigrams); a conference has one entry per name/acronym
+        self._entries: List[tuple] = []
+        self._candidates: Dict[int, Candidate] = {}
+
+    def __len__(self) -> int:
+        return len(self._candidates)
+
+    def add(
+        self,
+        conference_id: int,
+        name: Optional[str],
+        acronym: Optional[str] = None,
+        website: Optional[str] = None,
+        start_date: Optional[date] = None,
+        is_external: bool = False,
+        source: Optional[str] = None,
+    ):
+        self._candidates[conference_id] = Candidate(
+            conference_id, is_external, source, start_date, frozenset(_YEAR.findall(name or "")),
+        )
+        url = canonical_url(website)
+        if url:
+            self._by_url.setdefault(url, []).append(conference_id)
+        for text in {normalize_name(name), normalize_name(acronym)}:
+            if len(text) < MIN_NAME_LENGTH:
+                continue
+            grams = trigrams(text)
+            entry_id = len(self._entries)
+            self._entries.append((conference_id, frozenset(grams)))
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(entry_id)
+
+    def get(self, conference_id: int) -> Optional[Candidate]:
+        return self._candidates.get(conference_id)
+
+    def by_url(self, website: Optional[str], start_date: Optional[date] = None) -> Optional[Candidate]:
+        # A series often keeps one website across editions, so dates still have to agree
+        for conference_id in self._by_url.get(canonical_url(website) or "", ()):
+            candidate = self._candidates[conference_id]
+            if _dates_agree(start_date, candidate.start_date):
+                return candidate
+        return None
+
+    def similar(self, name: Optional[str], start_date: Optional[date] = None, threshold: float = DEDUPE_NAME_THRESHOLD):
+        """Best (candidate, similarity) for the name at or above threshold, or None."""
+        text = normalize_name(name)
+        if len(text) < MIN_NAME_LENGTH:
+            return None
+        grams = trigrams(text)
+        # Prefix filter: Jaccard >= threshold needs at least ceil(threshold * |grams|) shared
+        # trigrams, so a match must share one of the rarest |grams| - that + 1 of them
+        rarest = sorted(grams, key=lambda g: len(self._postings.get(g, ())))
+        prefix = len(grams) - math.ceil(threshold * len(grams)) + 1
+        entry_ids = set()
+        for gram in rarest[:prefix]:
+            entry_ids.update(self._postings.get(gram, ()))
+
+        years = frozenset(_YEAR.findall(name or ""))
+        best = None
+        for entry_id in entry_ids:
+            conference_id, other = self._entries[entry_id]
+            overlap = len(grams & other)
+            similarity = overlap / (len(grams) + len(other) - overlap)
+            if similarity < threshold or (best and similarity <= best[1]):
+                continue
+            candidate = self._candidates[conference_id]
+            if years and candidate.years and not years & candidate.years:
+                continue
+            if not _dates_agree(start_date, candidate.start_date):
+                continue
+            best = (candidate, similarity)
+        return best
+
+    def find(self, name: Optional[str], website: Optional[str] = None, start_date: Optional[date] = None) -> Optional[Candidate]:
+        """The existing conference this event duplicates: same canonical URL, else a similar name."""
+        candidate = self.by_url(website, start_date)
+        if candidate is not None:
+            return candidate
+        match = self.similar(name, start_date)
+        return match[0] if match else None
+
+
+async def build_index(db: AsyncSession) -> DuplicateIndex:
+    result = await db.execute(
+        select(
+            Conference.id,
+            Conference.name,
+            Conference.acronym,
+            Conference.website,
+            Conference.start_date,
+            Conference.is_external,
+            ExternalEvent.source,
+        ).outerjoin(ExternalEvent, ExternalEvent.conference_id == Conference.id)
+    )
+    index = DuplicateIndex()
+    for conference_id, name, acronym, website, start_date, is_external, source in result.all():
+        index.add(conference_id, name, acronym, website, start_date, bool(is_external), source)
+    return index
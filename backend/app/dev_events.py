@@ -0,0 +1,138 @@
+import xml.etree.ElementTree as ET
+import re
+from datetime import date
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Refuse feeds past this size; parsing is streamed, this only guards runaway responses
+MAX_FEED_BYTES = 20 * 1024 * 1024
+
+# Description format: "<title> is happening on <dates>, <location>. More information: ..."
+_DESCRIPTION_RE = re.compile(r"is happening on (?P<when>.+?)\. More information:", re.S)
+
+# Dates seen in the feed, optionally followed by ", <location>":
+#   "September 24, 2026"  "Sep 24-25 2026"  "Sep 30 - Oct 2, 2026"  "Dec 30, 2026 - Jan 2, 2027"
+_WHEN_RE = re.compile(
+    r"^(?P<m1>[A-Za-z]+)\.?\s+(?P<d1>\d{1,2})(?:,?\s+(?P<y1>\d{4}))?"
+    r"(?:\s*[-–]\s*(?:(?P<m2>[A-Za-z]+)\.?\s+)?(?P<d2>\d{1,2}))?"
+    r",?\s+(?P<y2>\d{4})"
+    r"(?:\s*,\s*(?P<location>.+))?$",
+    re.S,
+)
+
+_MONTHS = {
+    name: index
+    for index, name in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+    )
+}
+
+
+def _month(name: Optional[str]) -> Optional[int]:
+    if not name:
+        return None
+    return _MONTHS.get(name[:3].lower())
+
+
+def parse_when(text: str) -> Tuple[Optional[date], Optional[date], Optional[str]]:
+    """Parse "<dates>[, <location>]" into (start_date, end_date, location)."""
+    match = _WHEN_RE.match(text.strip())
+    if not match:
+        return None, None, None
+
+    start_month = _month(match.group("m1"))
+    if start_month is None:
+        return None, None, None
+    end_year = int(match.group("y2"))
+    end_month = _month(match.group("m2")) or start_month
+    start_day = int(match.group("d1"))
+    end_day = int(match.group("d2")) if match.group("d2") else None
+    if match.group("y1"):
+        start_year = int(match.group("y1"))
+    elif end_day is not None and (end_month, end_day) < (start_month, start_day):
+        # "Dec 30 - Jan 2, 2027": only the end carries the year
+        start_year = end_year - 1
+    else:
+        start_year = end_year
+
+    try:
+        start_date = date(start_year, start_month, start_day)
+        end_date = start_date
+        if end_day is not None:
+            end_date = date(end_year, end_month, end_day)
+    except ValueError:
+        return None, None, None
+
+    location = match.group("location")
+    return start_date, end_date, location.strip() if location else None
+
+
+def _normalize_item(fields: dict) -> Optional[dict]:
+    link = (fields.get("link") or "").strip()
+    if not link:
+        # The link is the upsert key; items without one cannot be tracked
+        return None
+
+    description = fields.get("description") or ""
+    start_date = end_date = None
+    location = "Unknown"
+
+    match = _DESCRIPTION_RE.search(description)
+    if match:
+        start_date, end_date, parsed_location = parse_when(match.group("when"))
+        if parsed_location:
+            location = parsed_location
+
+    return {
+        "name": (fields.get("title") or "Unknown Conference").strip(),
+        "description": description,
+        "location": location,
+        "start_date": start_date,
+        "end_date": end_date,
+        "website": link,
+    }
+
+
+class FeedParser:
+    """
+    Incremental RSS parser: feed it byte chunks, collect normalized items.
+    Each <item> is detached from the tree once read, so memory stays bounded
+    by the largest single item rather than the whole document.
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._channel = None
+
+    def feed(self, chunk: bytes) -> List[dict]:
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> List[dict]:
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> List[dict]:
+        items = []
+        for event, element in self._parser.read_events():
+            if event == "start":
+                if element.tag == "channel":
+                    self._channel = element
+                continue
+            if element.tag != "item":
+                continue
+            # Single pass over children instead of repeated find() calls
+            fields = {child.tag: child.text for child in element}
+            item = _normalize_item(fields)
+            if item:
+                items.append(item)
+            element.clear()
+            if self._channel is not None:
+                self._channel.remove(element)
+        return items
+
+
+def parse_feed(chunks: Iterable[bytes]) -> Iterator[dict]:
+    parser = FeedParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
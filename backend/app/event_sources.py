@@ -0,0 +1,358 @@
+import abc
+import asyncio
+import json
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from .http_client import http_clients
+from .dev_events import FeedParser, MAX_FEED_BYTES
+
+# Whole fan-out must finish within this, however many sources are configured
+INGEST_DEADLINE_SECONDS = float(os.getenv("INGEST_DEADLINE_SECONDS", "20"))
+
+
+class CircuitBreaker:
+    """
+    Stops calling a source after `failure_threshold` consecutive failures,
+    then lets a single trial call through once `reset_timeout` has passed.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 600.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+# Adapters are incremental parsers: feed(chunk)/close() return Conference field dicts
+class BufferedAdapter(abc.ABC):
+    """Base for formats parsed in one go; buffers chunks until close()."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def feed(self, chunk: bytes) -> List[dict]:
+        self._chunks.append(chunk)
+        return []
+
+    def close(self) -> List[dict]:
+        return self.parse(b"".join(self._chunks))
+
+    @abc.abstractmethod
+    def parse(self, body: bytes) -> List[dict]:
+        ...
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    value = value.strip()
+    for fmt, size in (("%Y-%m-%d", 10), ("%Y%m%d", 8)):
+        try:
+            return datetime.strptime(value[:size], fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _event(name, website, description=None, location=None, start_date=None, end_date=None) -> Optional[dict]:
+    if not website:
+        return None
+    return {
+        "name": (name or "Unknown Conference").strip(),
+        "description": description or "",
+        "location": location or "Unknown",
+        "start_date": start_date,
+        "end_date": end_date or start_date,
+        "website": website.strip(),
+    }
+
+
+_ATOM_NS = "{http://www.w3.org/2005/Atom}"
+
+
+class AtomAdapter:
+    """Streaming Atom parser; like the RSS one, entries are dropped once read."""
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._feed = None
+
+    def feed(self, chunk: bytes) -> List[dict]:
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> List[dict]:
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> List[dict]:
+        items = []
+        for event, element in self._parser.read_events():
+            if event == "start":
+                if element.tag == f"{_ATOM_NS}feed":
+                    self._feed = element
+                continue
+            if element.tag != f"{_ATOM_NS}entry":
+                continue
+            fields = {}
+            link = None
+            for child in element:
+                tag = child.tag.replace(_ATOM_NS, "")
+                if tag == "link" and (link is None or child.get("rel", "alternate") == "alternate"):
+                    link = child.get("href")
+                else:
+                    fields[tag] = child.text
+            item = _event(
+                fields.get("title"),
+                link,
+                description=fields.get("summary") or fields.get("content"),
+                start_date=_parse_date(fields.get("published") or fields.get("updated")),
+            )
+            if item:
+                items.append(item)
+            element.clear()
+            if self._feed is not None:
+                self._feed.remove(element)
+        return items
+
+
+_ICAL_ESCAPES = re.compile(r"\\([\\;,nN])")
+
+
+class ICalAdapter(BufferedAdapter):
+    def parse(self, body: bytes) -> List[dict]:
+        # Unfold continuation lines (RFC 5545 3.1) before splitting properties
+        text = body.decode("utf-8", errors="replace").replace("\r\n ", "").replace("\n ", "")
+        items = []
+        current = None
+        for line in text.splitlines():
+            if line == "BEGIN:VEVENT":
+                current = {}
+            elif line == "END:VEVENT" and current is not None:
+                start_date = _parse_date(current.get("DTSTART"))
+                end_date = _parse_date(current.get("DTEND"))
+                if end_date and len(current.get("DTEND", "")) == 8:
+                    # All-day DTEND is exclusive
+                    end_date = max(end_date - timedelta(days=1), start_date or end_date)
+                item = _event(
+                    current.get("SUMMARY"),
+                    current.get("URL"),
+                    description=current.get("DESCRIPTION"),
+                    location=current.get("LOCATION"),
+                    start_date=start_date,
+                    end_date=end_date,
+                )
+                if item:
+                    items.append(item)
+                current = None
+            elif current is not None and ":" in line:
+                name, value = line.split(":", 1)
+                value = _ICAL_ESCAPES.sub(lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+                current[name.split(";", 1)[0].upper()] = value
+        return items
+
+
+def _text(value) -> Optional[str]:
+    # JSON feeds are free-form: a number or object where a string belongs is treated as missing
+    return value if isinstance(value, str) else None
+
+
+class JSONAdapter(BufferedAdapter):
+    """A JSON array of objects, or {"events": [...]}, with conference-like keys."""
+
+    def parse(self, body: bytes) -> List[dict]:
+        data = json.loads(body)
+        if isinstance(data, dict):
+            data = data.get("events") or data.get("items") or []
+        if not isinstance(data, list):
+            return []
+        items = []
+        for entry in data:
+            if not isinstance(entry, dict):
+                continue
+            item = _event(
+                _text(entry.get("name")) or _text(entry.get("title")),
+                _text(entry.get("website")) or _text(entry.get("url")) or _text(entry.get("link")),
+                description=_text(entry.get("description")),
+                location=_text(entry.get("location")),
+                start_date=_parse_date(_text(entry.get("start_date"))),
+                end_date=_parse_date(_text(entry.get("end_date"))),
+            )
+            if item:
+                items.append(item)
+        return items
+
+
+ADAPTERS: Dict[str, Callable] = {
+    "rss": FeedParser,
+    "atom": AtomAdapter,
+    "ical": ICalAdapter,
+    "json": JSONAdapter,
+}
+
+
+class EventSource:
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        kind: str = "rss",
+        timeout: float = 10.0,
+        retries: int = 1,
+        failure_threshold: int = 3,
+        reset_timeout: float = 600.0,
+    ):
+        if kind not in ADAPTERS:
+            raise ValueError(f"Unknown source kind: {kind}")
+        self.name = name
+        self.url = url
+        self.kind = kind
+        self.timeout = timeout
+        self.retries = retries
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.last_success_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.last_latency_ms: Optional[float] = None
+        self.last_item_count: Optional[int] = None
+
+    async def _fetch_once(self) -> List[dict]:
+        adapter = ADAPTERS[self.kind]()
+        items = []
+        received = 0
+        async with http_clients.stream("GET", self.url, timeout=self.timeout) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                received += len(chunk)
+                if received > MAX_FEED_BYTES:
+                    raise ValueError(f"feed exceeds {MAX_FEED_BYTES} bytes")
+                items.extend(adapter.feed(chunk))
+        items.extend(adapter.close())
+        return items
+
+    async def fetch(self) -> Optional[List[dict]]:
+        """Fetch with this source's retry budget; None means the fetch failed or was skipped."""
+        if not self.breaker.allow():
+            return None
+
+        started = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(min(2 ** attempt, 5))
+            try:
+                items = await self._fetch_once()
+            except (httpx.HTTPError, ET.ParseError, ValueError) as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                continue
+            except Exception as e:
+                # A bug or a feed shape no adapter expected: not worth retrying, but it
+                # must only fail this source
+                self.last_error = f"{type(e).__name__}: {e}"
+                break
+            self.breaker.record_success()
+            self.last_success_at = datetime.utcnow()
+            self.last_error = None
+            self.last_latency_ms = (time.perf_counter() - started) * 1000
+            self.last_item_count = len(items)
+            return items
+
+        self.breaker.record_failure()
+        print(f"Error fetching {self.name}: {self.last_error}")
+        return None
+
+    def health(self) -> dict:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "url": self.url,
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "last_success_at": self.last_success_at,
+            "last_error": self.last_error,
+            "last_latency_ms": self.last_latency_ms,
+            "last_item_count": self.last_item_count,
+        }
+
+
+def _load_sources() -> List[EventSource]:
+    sources = [EventSource("dev.events", "https://dev.events/rss.xml", "rss", timeout=10.0, retries=1)]
+    # Extra feeds, e.g. EXTERNAL_EVENT_SOURCES='[{"name": "x", "url": "...", "kind": "ical"}]'
+    extra = os.getenv("EXTERNAL_EVENT_SOURCES")
+    if extra:
+        for cfg in json.loads(extra):
+            sources.append(EventSource(**cfg))
+    return sources
+
+
+SOURCES: List[EventSource] = _load_sources()
+
+
+async def _fetch_with_deadline(source: EventSource, deadline: float):
+    try:
+        return await asyncio.wait_for(source.fetch(), timeout=max(deadline - time.monotonic(), 0))
+    except asyncio.TimeoutError:
+        source.last_error = "TimeoutError: global ingest deadline exceeded"
+        source.breaker.record_failure()
+        return None
+
+
+async def fetch_all_sources(sources: Optional[List[EventSource]] = None) -> Dict[str, Optional[List[dict]]]:
+    """
+    Fetch every source concurrently under a global deadline, then drop items whose
+    website was already produced by an earlier source. A slow or failing source only
+    yields None for itself.
+    """
+    sources = sources if sources is not None else SOURCES
+    deadline = time.monotonic() + INGEST_DEADLINE_SECONDS
+    results = await asyncio.gather(
+        *[_fetch_with_deadline(source, deadline) for source in sources],
+        return_exceptions=True,
+    )
+
+    seen = set()
+    by_source: Dict[str, Optional[List[dict]]] = {}
+    for source, items in zip(sources, results):
+        if isinstance(items, BaseException):
+            print(f"Error fetching {source.name}: {items}")
+            source.last_error = f"{type(items).__name__}: {items}"
+            items = None
+        if items is None:
+            by_source[source.name] = None
+            continue
+        unique = []
+        for item in items:
+            if item["website"] not in seen:
+                seen.add(item["website"])
+                unique.append(item)
+        by_source[source.name] = unique
+    return by_source
+
+
+def sources_health() -> List[dict]:
+    return [source.health() for source in SOURCES]
@@ -0,0 +1,239 @@
+import csv
+import math
+import os
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .cache import bus
+from .db import async_session
+from .dedupe import fold
+from .models import Conference, ExternalEvent
+
+# Grid cell size of the nearby index; a query only measures points in the cells its radius touches
+GEO_CELL_DEGREES = float(os.getenv("GEO_CELL_DEGREES", "1.0"))
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), "gazetteer.csv")
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Spellings seen in location strings -> country name used in the gazetteer
+COUNTRY_ALIASES = {
+    "usa": "United States", "us": "United States", "u s": "United States", "u s a": "United States",
+    "united states of america": "United States", "america": "United States",
+    "uk": "United Kingdom", "u k": "United Kingdom", "great britain": "United Kingdom", "britain": "United Kingdom",
+    "england": "United Kingdom", "scotland": "United Kingdom", "wales": "United Kingdom",
+    "northern ireland": "United Kingdom",
+    "uae": "United Arab Emirates", "korea": "South Korea", "republic of korea": "South Korea",
+    "czechia": "Czech Republic", "holland": "Netherlands", "the netherlands": "Netherlands",
+    "turkiye": "Turkey", "prc": "China", "cote d ivoire": "Ivory Coast", "russian federation": "Russia",
+}
+# US states and Canadian provinces, so "Cambridge, MA" is not read as Cambridge, UK
+US_STATES = (
+    "al ak az ar ca co ct de fl ga hi id il in ia ks ky la me md ma mi mn ms mo mt ne nv nh nj nm ny nc nd "
+    "oh ok or pa ri sc sd tn tx ut vt va wa wv wi wy dc "
+    "alabama alaska arizona arkansas california colorado connecticut delaware florida hawaii idaho illinois "
+    "indiana iowa kansas kentucky louisiana maine maryland massachusetts michigan minnesota mississippi "
+    "missouri montana nebraska nevada ohio oklahoma oregon pennsylvania tennessee texas utah vermont "
+    "virginia washington wisconsin wyoming"
+).split() + ["new hampshire", "new jersey", "new mexico", "new york", "north carolina", "north dakota",
+             "rhode island", "south carolina", "south dakota", "west virginia"]
+CANADIAN_PROVINCES = (
+    "bc ab sk mb on qc ns nb nl pe alberta saskatchewan manitoba ontario"
+).split() + ["british columbia", "nova scotia", "new brunswick", "newfoundland", "prince edward island"]
+
+
+@lru_cache()
+def _gazetteer() -> Dict[str, List[Tuple[str, float, float]]]:
+    """Folded city name -> [(country, lat, lon)], most prominent first; read once per process."""
+    places: Dict[str, List[Tuple[str, float, float]]] = {}
+    with open(GAZETTEER_PATH, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            places.setdefault(" ".join(fold(row["city"])), []).append(
+                (row["country"], float(row["latitude"]), float(row["longitude"]))
+            )
+    return places
+
+
+@lru_cache()
+def _countries() -> Dict[str, str]:
+    countries = {" ".join(fold(c)): c for entries in _gazetteer().values() for c, _, _ in entries}
+    countries.update(COUNTRY_ALIASES)
+    countries.update({state: "United States" for state in US_STATES})
+    countries.update({province: "Canada" for province in CANADIAN_PROVINCES})
+    return countries
+
+
+def geocode(location: Optional[str]) -> Optional[Tuple[float, float]]:
+    """
+    (lat, lon) of a free-text location like "Vancouver, Canada" from the
+    bundled gazetteer, or None (online events, unknown places). No network.
+    """
+    parts = [" ".join(fold(part)) for part in (location or "").split(",")]
+    parts = [part for part in parts if part]
+    if not parts:
+        return None
+    countries = _countries()
+    country = next((countries[part] for part in reversed(parts) if part in countries), None)
+    places = _gazetteer()
+    # "Singapore" or "New York, NY": a part can be the city and the region at once
+    for part in parts:
+        entries = places.get(part)
+        if not entries:
+            continue
+        for entry_country, lat, lon in entries:
+            if entry_country == country:
+                return lat, lon
+        # Unknown or mismatched country: the most prominent city of that name
+        return entries[0][1], entries[0][2]
+    return None
+
+
+def set_coordinates(conf: Conference):
+    """Geocode conf.location onto latitude/longitude. Caller commits."""
+    point = geocode(conf.location)
+    conf.latitude, conf.longitude = point if point else (None, None)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GeoIndex:
+    """
+    Geocoded conferences bucketed into GEO_CELL_DEGREES lat/lon cells, kept in
+    memory per worker. A radius query measures exact distances only for
+    points in the cells overlapping the radius' bounding box.
+    """
+
+    def __init__(self, cell_degrees: float = GEO_CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self.built_at: Optional[datetime] = None
+        self._lon_cells = math.ceil(360 / cell_degrees)
+        self._cells: Dict[Tuple[int, int], Dict[int, Tuple[float, float]]] = {}
+        self._cell_of: Dict[int, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._cell_of)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return (
+            math.floor((lat + 90) / self.cell_degrees),
+            math.floor((lon + 180) / self.cell_degrees) % self._lon_cells,
+        )
+
+    def remove(self, conference_id: int):
+        cell = self._cell_of.pop(conference_id, None)
+        if cell is not None:
+            points = self._cells[cell]
+            points.pop(conference_id, None)
+            if not points:
+                del self._cells[cell]
+
+    def update(self, conference_id: int, lat: Optional[float], lon: Optional[float]):
+        self.remove(conference_id)
+        if lat is None or lon is None:
+            return
+        cell = self._cell(lat, lon)
+        self._cells.setdefault(cell, {})[conference_id] = (lat, lon)
+        self._cell_of[conference_id] = cell
+
+    def _candidate_cells(self, lat: float, lon: float, radius_km: float):
+        dlat = radius_km / KM_PER_DEGREE
+        lat_min, lat_max = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+        rows = range(self._cell(lat_min, 0)[0], self._cell(lat_max, 0)[0] + 1)
+        widest = max(abs(lat_min), abs(lat_max))
+        if widest >= 90 or dlat / math.cos(math.radians(widest)) >= 180:
+            # Radius reaches a pole or spans every meridian
+            cols = range(self._lon_cells)
+        else:
+            dlon = dlat / math.cos(math.radians(widest))
+            first = math.floor((lon - dlon + 180) / self.cell_degrees)
+            last = math.floor((lon + dlon + 180) / self.cell_degrees)
+            cols = {c % self._lon_cells for c in range(first, last + 1)}
+        for row in rows:
+            for col in cols:
+                points = self._cells.get((row, col))
+                if points:
+                    yield points
+
+    def nearby(self, lat: float, lon: float, radius_km: float, limit: int) -> List[Tuple[int, float]]:
+        """Up to `limit` (conference_id, distance_km) within radius_km, nearest first."""
+        found = []
+        for points in self._candidate_cells(lat, lon, radius_km):
+            for conference_id, (plat, plon) in points.items():
+                distance = haversine_km(lat, lon, plat, plon)
+                if distance <= radius_km:
+                    found.append((distance, conference_id))
+        found.sort()
+        return [(conference_id, round(distance, 2)) for distance, conference_id in found[:limit]]
+
+
+_index = GeoIndex()
+
+
+def _points_query():
+    vanished = select(ExternalEvent.conference_id).where(ExternalEvent.vanished_at.isnot(None))
+    return select(Conference.id, Conference.latitude, Conference.longitude).where(
+        Conference.latitude.isnot(None),
+        Conference.id.notin_(vanished),
+    )
+
+
+async def rebuild():
+    global _index
+    async with async_session() as db:
+        rows = (await db.execute(_points_query())).all()
+    index = GeoIndex()
+    for conference_id, lat, lon in rows:
+        index.update(conference_id, lat, lon)
+    index.built_at = datetime.utcnow()
+    _index = index
+
+
+async def load_geo_index() -> GeoIndex:
+    if _index.built_at is None:
+        await rebuild()
+    return _index
+
+
+async def backfill_coordinates(db: AsyncSession):
+    """Geocode conferences that have a location but no coordinates yet."""
+    result = await db.execute(
+        select(Conference.id, Conference.location).where(
+            Conference.location.isnot(None),
+            Conference.latitude.is_(None),
+        )
+    )
+    for conference_id, location in result.all():
+        point = geocode(location)
+        if point:
+            await db.execute(
+                update(Conference).where(Conference.id == conference_id).values(latitude=point[0], longitude=point[1])
+            )
+    await db.commit()
+
+
+async def _on_conference_changed(data: dict):
+    if _index.built_at is None:
+        return
+    conference_id = data.get("conference_id")
+    if conference_id is None:
+        # Feed ingestion: any number of events may have been added, moved or vanished
+        await rebuild()
+        return
+    async with async_session() as db:
+        row = (await db.execute(_points_query().where(Conference.id == conference_id))).first()
+    if row is None:
+        _index.remove(conference_id)
+    else:
+        _index.update(row[0], row[1], row[2])
+
+
+bus.subscribe("conference.changed", _on_conference_changed)
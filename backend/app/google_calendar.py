@@ -2,14 +2,16 @@
 
 import os
 import json
+import uuid
 import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
+
+if TYPE_CHECKING:
+    from google_auth_oauthlib.flow import Flow
+
+from .http_client import http_clients
 
 SCOPES = [
     "https://www.googleapis.com/auth/calendar.events",
@@ -18,6 +20,14 @@ SCOPES = [
     "https://www.googleapis.com/auth/userinfo.profile",
 ]
 
+# Overridable so the REST/batch code paths can run against a local mock server
+GOOGLE_TOKEN_URI = os.getenv("GOOGLE_TOKEN_URI", "https://oauth2.googleapis.com/token")
+GOOGLE_API_BASE_URL = os.getenv("GOOGLE_API_BASE_URL", "https://www.googleapis.com").rstrip("/")
+GOOGLE_USERINFO_URI = os.getenv("GOOGLE_USERINFO_URI", "https://www.googleapis.com/oauth2/v3/userinfo")
+REDIRECT_URI = "http://127.0.0.1:8000/google/callback"
+# Google rejects calendar batches larger than 50 sub-requests
+BATCH_LIMIT = 50
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # .../backend/app
 CLIENT_SECRETS_FILE = os.path.join(BASE_DIR, "google_client_secret.json")
 
@@ -43,10 +53,13 @@ def _load_raw_client_config():
     return cfg
 
 
-def get_flow() -> Flow:
+def get_flow() -> "Flow":
     """
     Build OAuth Flow from secrets file.
+    google_auth_oauthlib is heavy and only needed for /google/connect, so import it here.
     """
+    from google_auth_oauthlib.flow import Flow
+
     if not os.path.exists(CLIENT_SECRETS_FILE):
         raise HTTPException(status_code=500, detail="Google client secrets file not found")
 
@@ -54,50 +67,85 @@ def get_flow() -> Flow:
         CLIENT_SECRETS_FILE,
         scopes=SCOPES,
     )
-    flow.redirect_uri = "http://127.0.0.1:8000/google/callback"
+    flow.redirect_uri = REDIRECT_URI
     return flow
 
 
-def build_credentials(refresh_token: str) -> Credentials:
+async def exchange_code(code: str) -> dict:
     """
-    Recreate credentials using refresh token and client id/secret.
+    Exchange the OAuth authorization code for tokens.
+    Returns Google's token response (access_token, refresh_token when granted, ...).
     """
     cfg = _load_raw_client_config()
+    response = await http_clients.request(
+        "POST",
+        GOOGLE_TOKEN_URI,
+        data={
+            "grant_type": "authorization_code",
+            "code": code,
+            "redirect_uri": REDIRECT_URI,
+            "client_id": cfg["client_id"],
+            "client_secret": cfg["client_secret"],
+        },
+    )
+    if response.status_code != 200:
+        raise HTTPException(status_code=400, detail="Google authorization failed")
+    return response.json()
 
-    creds = Credentials(
-        None,
-        refresh_token=refresh_token,
-        token_uri="https://oauth2.googleapis.com/token",
-        client_id=cfg["client_id"],
-        client_secret=cfg["client_secret"],
-        scopes=SCOPES,
+
+async def fetch_userinfo(access_token: str) -> Optional[dict]:
+    response = await http_clients.request(
+        "GET",
+        GOOGLE_USERINFO_URI,
+        headers={"Authorization": f"Bearer {access_token}"},
     )
-    creds.refresh(Request())
-    if not creds.valid:
-        raise HTTPException(status_code=400, detail="Invalid Google credentials")
-    return creds
+    if response.status_code != 200:
+        return None
+    return response.json()
 
 
-def create_calendar_event(
+async def create_calendar_event(
     refresh_token: str,
     summary: str,
     description: str,
     location: Optional[str],
     start_date: Optional[datetime.date],
     end_date: Optional[datetime.date],
-) -> str:
+) -> dict:
     """
     Create an all‑day event in user's primary Google Calendar.
+    Returns the created event resource.
     """
-    creds = build_credentials(refresh_token)
-    service = build("calendar", "v3", credentials=creds)
+    try:
+        access_token = await refresh_access_token(refresh_token)
+    except GoogleAPIError:
+        raise HTTPException(status_code=400, detail="Invalid Google credentials")
+
+    event_body = build_event_body(summary, description, location, start_date, end_date)
+    response = await http_clients.request(
+        "POST",
+        f"{GOOGLE_API_BASE_URL}/calendar/v3/calendars/primary/events",
+        json=event_body,
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    if response.status_code != 200:
+        raise HTTPException(status_code=502, detail="Google Calendar rejected the event")
+    return response.json()
 
+
+def build_event_body(
+    summary: str,
+    description: str,
+    location: Optional[str],
+    start_date: Optional[datetime.date],
+    end_date: Optional[datetime.date],
+) -> dict:
     if not start_date:
         start_date = datetime.date.today()
     if not end_date:
         end_date = start_date
 
-    event_body = {
+    return {
         "summary": summary,
         "location": location or "",
         "description": description or "",
@@ -108,5 +156,99 @@ def create_calendar_event(
         },
     }
 
-    event = service.events().insert(calendarId="primary", body=event_body).execute()
-    return event.get("htmlLink")
+
+class GoogleAPIError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+    @property
+    def retryable(self) -> bool:
+        return self.status_code == 429 or self.status_code >= 500
+
+
+async def refresh_access_token(refresh_token: str) -> str:
+    """Exchange a stored refresh token for a short-lived access token."""
+    cfg = _load_raw_client_config()
+    response = await http_clients.request(
+        "POST",
+        GOOGLE_TOKEN_URI,
+        data={
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token,
+            "client_id": cfg["client_id"],
+            "client_secret": cfg["client_secret"],
+        },
+    )
+    if response.status_code != 200:
+        raise GoogleAPIError(response.status_code, f"Token refresh failed: {response.text}")
+    return response.json()["access_token"]
+
+
+def _encode_batch(boundary: str, events: List[Tuple[str, dict]]) -> bytes:
+    parts = []
+    for content_id, body in events:
+        payload = json.dumps(body)
+        parts.append(
+            f"--{boundary}\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <{content_id}>\r\n\r\n"
+            "POST /calendar/v3/calendars/primary/events HTTP/1.1\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload.encode())}\r\n\r\n"
+            f"{payload}\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n")
+    return "".join(parts).encode()
+
+
+def _decode_batch(content_type: str, body: str) -> Dict[str, Tuple[int, dict]]:
+    """Parse a multipart/mixed batch response into {content_id: (status, json body)}."""
+    boundary = content_type.split("boundary=", 1)[1].strip().strip('"')
+    results = {}
+    for part in body.split(f"--{boundary}"):
+        part = part.strip()
+        if not part or part == "--":
+            continue
+        outer_headers, _, http_response = part.replace("\r\n", "\n").partition("\n\n")
+        content_id = None
+        for line in outer_headers.split("\n"):
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-id":
+                # Responses echo the request id as <response-{id}>
+                content_id = value.strip().strip("<>")
+                if content_id.startswith("response-"):
+                    content_id = content_id[len("response-"):]
+        status_line, _, rest = http_response.partition("\n")
+        _, _, payload = rest.partition("\n\n")
+        status_code = int(status_line.split()[1])
+        try:
+            data = json.loads(payload) if payload.strip() else {}
+        except ValueError:
+            data = {}
+        if content_id is not None:
+            results[content_id] = (status_code, data)
+    return results
+
+
+async def batch_insert_events(
+    access_token: str,
+    events: List[Tuple[str, dict]],
+) -> Dict[str, Tuple[int, dict]]:
+    """
+    Insert up to BATCH_LIMIT events in one Calendar batch request.
+    `events` is a list of (content_id, event body); returns {content_id: (status, response body)}.
+    """
+    boundary = f"batch_{uuid.uuid4().hex}"
+    response = await http_clients.request(
+        "POST",
+        f"{GOOGLE_API_BASE_URL}/batch/calendar/v3",
+        content=_encode_batch(boundary, events),
+        headers={
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": f"multipart/mixed; boundary={boundary}",
+        },
+    )
+    if response.status_code != 200:
+        raise GoogleAPIError(response.status_code, f"Calendar batch failed: {response.text}")
+    return _decode_batch(response.headers["content-type"], response.text)
@@ -0,0 +1,169 @@
+import asyncio
+import os
+import random
+from datetime import datetime
+from typing import List
+
+import httpx
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from .db import async_session
+from .models import Conference, GoogleCalendarEvent, GoogleSyncJob, Interest, User
+from .google_calendar import (
+    BATCH_LIMIT,
+    GoogleAPIError,
+    batch_insert_events,
+    build_event_body,
+    refresh_access_token,
+)
+
+# Batches in flight per job; keeps us well under Calendar per-user rate limits
+SYNC_CONCURRENCY = int(os.getenv("GOOGLE_SYNC_CONCURRENCY", "2"))
+SYNC_MAX_ATTEMPTS = int(os.getenv("GOOGLE_SYNC_MAX_ATTEMPTS", "5"))
+SYNC_BACKOFF_SECONDS = float(os.getenv("GOOGLE_SYNC_BACKOFF_SECONDS", "1.0"))
+
+def _backoff(attempt: int) -> float:
+    return SYNC_BACKOFF_SECONDS * (2 ** attempt) * (0.5 + random.random() / 2)
+
+
+async def _sync_batch(
+    access_token: str,
+    job_id: int,
+    user_id: int,
+    conferences: List[Conference],
+    semaphore: asyncio.Semaphore,
+):
+    pending = {str(c.id): c for c in conferences}
+    created = []
+    attempt = 0
+    while pending and attempt < SYNC_MAX_ATTEMPTS:
+        if attempt:
+            await asyncio.sleep(_backoff(attempt))
+        attempt += 1
+
+        events = [
+            (
+                content_id,
+                build_event_body(
+                    conf.name,
+                    (conf.description or "") + f"\nWebsite: {conf.website or ''}",
+                    conf.location,
+                    conf.start_date,
+                    conf.end_date,
+                ),
+            )
+            for content_id, conf in pending.items()
+        ]
+        try:
+            async with semaphore:
+                results = await batch_insert_events(access_token, events)
+        except GoogleAPIError as e:
+            if not e.retryable:
+                break
+            continue
+        except httpx.HTTPError:
+            continue
+
+        for content_id, (status_code, body) in results.items():
+            conf = pending.get(content_id)
+            if conf is None:
+                continue
+            if 200 <= status_code < 300:
+                created.append((conf.id, body))
+                del pending[content_id]
+            elif not (status_code == 429 or status_code == 403 or status_code >= 500):
+                # Permanent failure for this item; 403 is Calendar's rateLimitExceeded
+                del pending[content_id]
+
+    async with async_session() as db:
+        # One commit per row: an event recorded concurrently by google.add_event
+        # must not roll back the rest of the batch
+        for conference_id, body in created:
+            db.add(GoogleCalendarEvent(
+                user_id=user_id,
+                conference_id=conference_id,
+                event_id=body.get("id", ""),
+                html_link=body.get("htmlLink"),
+            ))
+            try:
+                await db.commit()
+            except IntegrityError:
+                await db.rollback()
+        # Batches finish concurrently, so increment in SQL rather than read-modify-write
+        await db.execute(
+            update(GoogleSyncJob)
+            .where(GoogleSyncJob.id == job_id)
+            .values(
+                synced=GoogleSyncJob.synced + len(created),
+                failed=GoogleSyncJob.failed + len(conferences) - len(created),
+            )
+        )
+        await db.commit()
+
+
+async def run_sync_job(job_id: int):
+    """
+    Push every conference the user is interested in to Google Calendar,
+    skipping ones already synced. However it ends (including cancellation by
+    the job timeout), the job row leaves "running", since an active job blocks
+    the user from starting another sync.
+    """
+    # Left as is only if cancelled; the finally block still records it before the cancellation propagates
+    status, error = "failed", "cancelled (job timeout or shutdown)"
+    try:
+        await _run_sync(job_id)
+        status, error = "completed", None
+    except Exception as e:
+        print(f"Google sync job {job_id} failed: {e}")
+        status, error = "failed", str(e) or type(e).__name__
+    finally:
+        async with async_session() as db:
+            await db.execute(
+                update(GoogleSyncJob)
+                .where(GoogleSyncJob.id == job_id)
+                .values(status=status, error=error, finished_at=datetime.utcnow())
+            )
+            await db.commit()
+
+
+async def _run_sync(job_id: int):
+    async with async_session() as db:
+        job = await db.get(GoogleSyncJob, job_id)
+        if job is None:
+            raise LookupError(f"Google sync job {job_id} no longer exists")
+        user = await db.get(User, job.user_id)
+        if user is None or not user.google_refresh_token:
+            raise LookupError("Google Calendar is no longer connected")
+
+        synced_ids = select(GoogleCalendarEvent.conference_id).where(
+            GoogleCalendarEvent.user_id == user.id
+        )
+        interested = await db.execute(
+            select(Conference.id).join(Interest).where(Interest.user_id == user.id)
+        )
+        interested_ids = interested.scalars().all()
+        result = await db.execute(
+            select(Conference)
+            .join(Interest)
+            .where(Interest.user_id == user.id, Conference.id.notin_(synced_ids))
+        )
+        conferences = result.scalars().all()
+
+        job.status = "running"
+        job.error = None
+        job.total = len(interested_ids)
+        job.skipped = len(interested_ids) - len(conferences)
+        user_id = user.id
+        refresh_token = user.google_refresh_token
+        await db.commit()
+
+    access_token = await refresh_access_token(refresh_token)
+    semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
+    batches = [
+        conferences[i:i + BATCH_LIMIT] for i in range(0, len(conferences), BATCH_LIMIT)
+    ]
+    await asyncio.gather(*[
+        _sync_batch(access_token, job_id, user_id, batch, semaphore)
+        for batch in batches
+    ])
@@ -0,0 +1,146 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "10"))
+HTTP_MAX_KEEPALIVE_PER_HOST = int(os.getenv("HTTP_MAX_KEEPALIVE_PER_HOST", "5"))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "60"))
+# Transport-level retries for failed connection attempts
+HTTP_CONNECT_RETRIES = int(os.getenv("HTTP_CONNECT_RETRIES", "2"))
+# HTTP/2 needs the optional `h2` package (pip install httpx[http2])
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() in ("1", "true", "yes")
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRYABLE_STATUS = {502, 503, 504}
+
+
+def _http2_available() -> bool:
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        print("HTTP2_ENABLED is set but the h2 package is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+class HostMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms: float, error: bool = False):
+        self.requests += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if error:
+            self.errors += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.requests, 2) if self.requests else None,
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class HTTPClientManager:
+    """
+    Application-wide registry of pooled async HTTP clients, one per host, so
+    outbound calls reuse warm keep-alive connections and each host gets its own
+    connection limit. Started and closed with the app; clients are created lazily.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._metrics: Dict[str, HostMetrics] = {}
+        self._http2: Optional[bool] = None
+
+    def _new_client(self) -> httpx.AsyncClient:
+        if self._http2 is None:
+            self._http2 = _http2_available()
+        limits = httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS_PER_HOST,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_PER_HOST,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        transport = httpx.AsyncHTTPTransport(
+            retries=HTTP_CONNECT_RETRIES, limits=limits, http2=self._http2
+        )
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=HTTP_TIMEOUT_SECONDS,
+            follow_redirects=True,
+        )
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        host = urlsplit(url).netloc
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            client = self._clients[host] = self._new_client()
+        return client
+
+    def _record(self, url: str, started: float, error: bool = False):
+        host = urlsplit(url).netloc
+        metrics = self._metrics.setdefault(host, HostMetrics())
+        metrics.record((time.perf_counter() - started) * 1000, error)
+
+    async def request(self, method: str, url: str, retries: Optional[int] = None, **kwargs) -> httpx.Response:
+        """
+        Send a request on the host's pooled client. Idempotent methods are retried
+        on 502/503/504 and transport errors; pass retries=0 to disable.
+        """
+        method = method.upper()
+        if retries is None:
+            retries = 2 if method in IDEMPOTENT_METHODS else 0
+        client = self.client_for(url)
+
+        for attempt in range(retries + 1):
+            if attempt:
+                await asyncio.sleep(min(0.25 * 2 ** attempt, 4))
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                self._record(url, started, error=True)
+                if attempt == retries:
+                    raise
+                continue
+            failed = response.status_code in RETRYABLE_STATUS
+            self._record(url, started, error=failed or response.status_code >= 500)
+            if not failed or attempt == retries:
+                return response
+        return response
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """Streaming request on the pooled client; latency covers the full body read."""
+        started = time.perf_counter()
+        error = True
+        try:
+            async with self.client_for(url).stream(method, url, **kwargs) as response:
+                yield response
+                error = response.status_code >= 500
+        finally:
+            self._record(url, started, error=error)
+
+    def metrics(self) -> Dict[str, dict]:
+        return {host: m.as_dict() for host, m in self._metrics.items()}
+
+    async def close(self):
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+http_clients = HTTPClientManager()
@@ -0,0 +1,104 @@
+import hashlib
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from .cache import Cache, bus
+from .models import Conference
+
+# Rendered feeds keyed by ("catalog", start, end) or ("user", user_id); holds (body, etag)
+calendar_cache = Cache("ics", ttl_seconds=900)
+
+ICS_MEDIA_TYPE = "text/calendar; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold content lines at 75 octets as required by RFC 5545."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while encoded:
+        limit = 75 if not parts else 74
+        cut = min(limit, len(encoded))
+        # Never split inside a multi-byte UTF-8 sequence
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+    return "\r\n ".join(parts)
+
+
+def build_calendar(conferences: Iterable[Conference], name: str) -> str:
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Sciflow//Conferences//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+    ]
+    for conf in conferences:
+        if not conf.start_date:
+            continue
+        # All-day events: DTEND is exclusive
+        end_date = (conf.end_date or conf.start_date) + timedelta(days=1)
+        stamp = conf.created_at or datetime.utcnow()
+        lines.extend([
+            "BEGIN:VEVENT",
+            f"UID:conference-{conf.id}@sciflow",
+            f"DTSTAMP:{stamp.strftime('%Y%m%dT%H%M%SZ')}",
+            f"DTSTART;VALUE=DATE:{conf.start_date.strftime('%Y%m%d')}",
+            f"DTEND;VALUE=DATE:{end_date.strftime('%Y%m%d')}",
+            f"SUMMARY:{_escape(conf.name)}",
+        ])
+        if conf.location:
+            lines.append(f"LOCATION:{_escape(conf.location)}")
+        if conf.description:
+            lines.append(f"DESCRIPTION:{_escape(conf.description)}")
+        if conf.website:
+            lines.append(f"URL:{conf.website}")
+        lines.append("END:VEVENT")
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(_fold(line) for line in lines) + "\r\n"
+
+
+def render(conferences: Iterable[Conference], name: str) -> Tuple[str, str]:
+    body = build_calendar(conferences, name)
+    etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+    return body, etag
+
+
+def calendar_response(request: Request, body: str, etag: str, filename: Optional[str] = None) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=300"}
+    if_none_match = request.headers.get("if-none-match", "")
+    # Weak comparison: the compression middleware hands clients the W/ form of the tag
+    if etag in [tag.strip().replace("W/", "", 1) for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    if filename:
+        headers["Content-Disposition"] = f'inline; filename="{filename}"'
+    return Response(content=body, media_type=ICS_MEDIA_TYPE, headers=headers)
+
+
+async def _on_conference_changed(data: dict):
+    # Conference data changed: every feed may embed it
+    await calendar_cache.clear()
+
+
+async def _on_interest_changed(data: dict):
+    await calendar_cache.delete(("user", data["user_id"]))
+
+
+bus.subscribe("conference.changed", _on_conference_changed)
+bus.subscribe("interest.changed", _on_interest_changed)
@@ -0,0 +1,114 @@
+import asyncio
+import hashlib
+import os
+import re
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import aiofiles
+from fastapi import HTTPException, UploadFile
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "static")
+IMAGES_DIR = os.path.join(STATIC_DIR, "images")
+IMAGES_URL = "/static/images"
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_IMAGE_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+CHUNK_SIZE = 64 * 1024
+
+# Variant name -> longest edge in pixels; all variants are WebP
+VARIANTS = {"thumb": 160, "card": 480, "large": 1280}
+VARIANT_QUALITY = 80
+ALLOWED_TYPES = {"image/jpeg": "jpg", "image/png": "png", "image/webp": "webp", "image/gif": "gif"}
+
+# Resizing is CPU-bound; Pillow releases the GIL while resampling
+_pool = ThreadPoolExecutor(max_workers=int(os.getenv("IMAGE_WORKERS", "2")))
+
+_HASHED_URL_RE = re.compile(rf"^{re.escape(IMAGES_URL)}/(?P<digest>[0-9a-f]{{64}})/[^/]+$")
+
+
+def variant_urls(digest: str, original_name: Optional[str] = None) -> Dict[str, str]:
+    urls = {name: f"{IMAGES_URL}/{digest}/{name}.webp" for name in VARIANTS}
+    if original_name:
+        urls["original"] = f"{IMAGES_URL}/{digest}/{original_name}"
+    return urls
+
+
+def image_variant_url(image_url: Optional[str], variant: str) -> Optional[str]:
+    """Map an uploaded image URL to one of its variants; external URLs pass through unchanged."""
+    if not image_url:
+        return image_url
+    match = _HASHED_URL_RE.match(image_url)
+    if not match or variant not in VARIANTS:
+        return image_url
+    return f"{IMAGES_URL}/{match.group('digest')}/{variant}.webp"
+
+
+def _generate_variants(directory: str, original_path: str):
+    from PIL import Image, ImageOps
+
+    with Image.open(original_path) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "P") else "RGB")
+        for name, edge in VARIANTS.items():
+            variant = img.copy()
+            variant.thumbnail((edge, edge), Image.LANCZOS)
+            tmp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex}.webp")
+            variant.save(tmp_path, "WEBP", quality=VARIANT_QUALITY, method=4)
+            os.replace(tmp_path, os.path.join(directory, f"{name}.webp"))
+
+
+async def store_upload(upload: UploadFile) -> Dict[str, str]:
+    """
+    Stream an upload to disk in chunks, store it under its SHA-256 so identical
+    files are kept once, and make sure its resized variants exist.
+    Returns {variant: url} including the original.
+    """
+    extension = ALLOWED_TYPES.get(upload.content_type or "")
+    if not extension:
+        raise HTTPException(status_code=415, detail="Unsupported image type")
+
+    os.makedirs(IMAGES_DIR, exist_ok=True)
+    tmp_path = os.path.join(IMAGES_DIR, f".upload-{uuid.uuid4().hex}")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(tmp_path, "wb") as out:
+            while True:
+                chunk = await upload.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail="Image too large")
+                digest.update(chunk)
+                await out.write(chunk)
+
+        hex_digest = digest.hexdigest()
+        directory = os.path.join(IMAGES_DIR, hex_digest)
+        original_name = f"original.{extension}"
+        original_path = os.path.join(directory, original_name)
+        if os.path.exists(original_path):
+            os.remove(tmp_path)
+        else:
+            os.makedirs(directory, exist_ok=True)
+            shutil.move(tmp_path, original_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if not all(os.path.exists(os.path.join(directory, f"{name}.webp")) for name in VARIANTS):
+        # Pillow is only loaded once an upload actually needs resizing
+        from PIL import Image
+
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(_pool, _generate_variants, directory, original_path)
+        except (OSError, Image.DecompressionBombError):
+            shutil.rmtree(directory, ignore_errors=True)
+            raise HTTPException(status_code=400, detail="Could not process image")
+
+    return variant_urls(hex_digest, original_name)
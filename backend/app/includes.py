@@ -0,0 +1,179 @@
+import asyncio
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from .cache import Cache, bus
+from .db import async_session
+from .models import Comment, Conference, ConferenceTopic, ExternalEvent, User
+from .rating_stats import load_stats
+from .recommendations import get_model
+from .schemas import CommentRead, OrganizerRead, RelatedConferenceRead
+from .serialization import trusted_model
+
+# Composed detail documents are invalidated by writes to the conference; the TTL
+# only bounds how stale a `related` section naming other conferences can get
+CONFERENCE_DETAIL_CACHE_SECONDS = float(os.getenv("CONFERENCE_DETAIL_CACHE_SECONDS", "60"))
+INCLUDE_MAX_COMMENTS = int(os.getenv("INCLUDE_MAX_COMMENTS", "50"))
+DEFAULT_LATEST_COMMENTS = 10
+RELATED_LIMIT = 5
+
+detail_cache = Cache("conference_detail", CONFERENCE_DETAIL_CACHE_SECONDS)
+
+_COMMENTS_ARG = re.compile(r"^latest(\d+)$")
+
+# (section, argument) pairs, sorted, so equivalent include= strings share a cache key
+IncludeSpec = Tuple[Tuple[str, Optional[int]], ...]
+
+
+def parse_include(text: Optional[str]) -> IncludeSpec:
+    """
+    "comments:latest10,ratings_histogram,organizer,related" -> spec.
+    Raises ValueError naming the first section it does not understand.
+    """
+    sections: Dict[str, Optional[int]] = {}
+    for part in (text or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition(":")
+        if name == "comments":
+            match = _COMMENTS_ARG.match(arg) if arg else None
+            if arg and match is None:
+                raise ValueError(f"Unknown comments option '{arg}', expected latestN")
+            sections[name] = min(int(match.group(1)) if match else DEFAULT_LATEST_COMMENTS, INCLUDE_MAX_COMMENTS)
+        elif name in SECTIONS and not arg:
+            sections[name] = None
+        else:
+            raise ValueError(f"Unknown include '{part}'")
+    return tuple(sorted(sections.items()))
+
+
+def include_key(spec: IncludeSpec) -> str:
+    return ",".join(name if arg is None else f"{name}:latest{arg}" for name, arg in spec)
+
+
+async def _comments(db: AsyncSession, conf: Conference, latest: int) -> List[CommentRead]:
+    result = await db.execute(
+        select(Comment)
+        .options(selectinload(Comment.user))
+        .where(Comment.conference_id == conf.id)
+        .order_by(Comment.created_at.desc())
+        .limit(latest)
+    )
+    return [
+        trusted_model(
+            CommentRead,
+            id=c.id,
+            user_id=c.user_id,
+            user_name=c.user.full_name,
+            conference_id=c.conference_id,
+            content=c.content,
+            created_at=c.created_at,
+        )
+        for c in result.scalars().all()
+    ]
+
+
+async def _ratings_histogram(db: AsyncSession, conf: Conference, _arg) -> Dict[str, int]:
+    return (await load_stats(db, [conf.id]))[conf.id]["histogram"]
+
+
+async def _organizer(db: AsyncSession, conf: Conference, _arg) -> Optional[OrganizerRead]:
+    if conf.organizer_id is None:
+        # Ingested from an external feed
+        return None
+    result = await db.execute(
+        select(User.id, User.full_name, func.count(Conference.id))
+        .outerjoin(Conference, Conference.organizer_id == User.id)
+        .where(User.id == conf.organizer_id)
+        .group_by(User.id, User.full_name)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    return trusted_model(OrganizerRead, id=row[0], full_name=row[1], total_conferences=row[2])
+
+
+async def _related(db: AsyncSession, conf: Conference, _arg) -> List[RelatedConferenceRead]:
+    """Nearest neighbours from the recommendation model, topped up with conferences sharing the most topics."""
+    ranked = [c for c, _ in get_model().neighbors.get(conf.id, [])][:RELATED_LIMIT]
+    if len(ranked) < RELATED_LIMIT:
+        topics = select(ConferenceTopic.topic_id).where(ConferenceTopic.conference_id == conf.id)
+        shared = func.count(ConferenceTopic.topic_id)
+        result = await db.execute(
+            select(ConferenceTopic.conference_id)
+            .where(ConferenceTopic.topic_id.in_(topics), ConferenceTopic.conference_id != conf.id)
+            .group_by(ConferenceTopic.conference_id)
+            .order_by(shared.desc(), ConferenceTopic.conference_id)
+            .limit(RELATED_LIMIT * 2)
+        )
+        ranked.extend(c for c in result.scalars().all() if c not in ranked)
+    if not ranked:
+        return []
+
+    vanished = select(ExternalEvent.conference_id).where(ExternalEvent.vanished_at.isnot(None))
+    result = await db.execute(
+        select(Conference.id, Conference.name, Conference.acronym, Conference.location, Conference.start_date)
+        .where(Conference.id.in_(ranked), Conference.id.notin_(vanished))
+    )
+    rows = {row[0]: row for row in result.all()}
+    return [
+        trusted_model(
+            RelatedConferenceRead,
+            id=row[0], name=row[1], acronym=row[2], location=row[3], start_date=row[4],
+        )
+        for row in (rows.get(c) for c in ranked)
+        if row is not None
+    ][:RELATED_LIMIT]
+
+
+SECTIONS = {
+    "comments": _comments,
+    "ratings_histogram": _ratings_histogram,
+    "organizer": _organizer,
+    "related": _related,
+}
+
+
+async def load_sections(db: AsyncSession, conf: Conference, spec: IncludeSpec) -> dict:
+    """
+    Each requested section is at most one query (related: three). With
+    several sections they run concurrently on their own pooled connections,
+    since one AsyncSession cannot serve overlapping queries.
+    """
+    if not spec:
+        return {}
+    if len(spec) == 1:
+        name, arg = spec[0]
+        return {name: await SECTIONS[name](db, conf, arg)}
+
+    async def run(name: str, arg):
+        async with async_session() as section_db:
+            return await SECTIONS[name](section_db, conf, arg)
+
+    values = await asyncio.gather(*(run(name, arg) for name, arg in spec))
+    return {name: value for (name, _), value in zip(spec, values)}
+
+
+async def _on_conference_changed(data: dict):
+    if data.get("conference_id") is None:
+        # Feed ingestion: any number of conferences changed
+        await detail_cache.clear()
+    else:
+        await detail_cache.clear_prefix(data["conference_id"])
+
+
+async def _on_activity_changed(data: dict):
+    if data.get("conference_id") is not None:
+        await detail_cache.clear_prefix(data["conference_id"])
+
+
+bus.subscribe("conference.changed", _on_conference_changed)
+bus.subscribe("rating.changed", _on_activity_changed)
+bus.subscribe("interest.changed", _on_activity_changed)
+bus.subscribe("comment.changed", _on_activity_changed)
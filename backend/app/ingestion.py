@@ -0,0 +1,144 @@
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+
+from .db import async_session
+from .models import Conference, ExternalEvent
+from .event_sources import fetch_all_sources
+from .dedupe import DuplicateIndex, build_index, canonical_url
+from .cache import bus
+from .geo import set_coordinates
+
+INGEST_INTERVAL_SECONDS = int(os.getenv("INGEST_INTERVAL_SECONDS", "1800"))
+
+# Feed fields copied onto the Conference row on every ingest
+SYNCED_FIELDS = ("name", "description", "location", "start_date", "end_date")
+
+
+async def _recently_ingested(db) -> bool:
+    """Skip if feeds were ingested moments ago, e.g. a recurring run requeued after its worker died."""
+    result = await db.execute(select(func.max(ExternalEvent.last_seen_at)))
+    last_seen = result.scalar()
+    return last_seen is not None and datetime.utcnow() - last_seen < timedelta(seconds=INGEST_INTERVAL_SECONDS / 2)
+
+
+async def upsert_events(db, source: str, items: list, index: Optional[DuplicateIndex] = None) -> dict:
+    """
+    Upsert feed items into Conference keyed by canonical website, and mark
+    previously seen events of this source that are no longer in the feed as
+    vanished. Items matching an existing conference by canonical URL or
+    similar name (an organizer's own listing, or another feed's copy) are
+    skipped as duplicates.
+    """
+    now = datetime.utcnow()
+    stats = {"created": 0, "updated": 0, "vanished": 0, "duplicates": 0}
+    if index is None:
+        index = await build_index(db)
+
+    result = await db.execute(
+        select(ExternalEvent)
+        .options(selectinload(ExternalEvent.conference))
+        .where(ExternalEvent.source == source)
+    )
+    known = {canonical_url(e.url) or e.url: e for e in result.scalars().all()}
+    by_conference = {e.conference_id: e for e in known.values()}
+
+    seen = set()
+    for item in items:
+        url = item["website"]
+        key = canonical_url(url) or url
+        if key in seen:
+            continue
+
+        external = known.get(key)
+        if external is None:
+            match = index.find(item.get("name"), url, item.get("start_date"))
+            if match is not None and match.source == source:
+                # This feed's own event re-published under a different link
+                external = by_conference.get(match.conference_id)
+                old_key = (canonical_url(external.url) or external.url) if external else None
+                if old_key is None or old_key in seen:
+                    stats["duplicates"] += 1
+                    continue
+                seen.add(old_key)
+                external.url = url
+                conf = external.conference
+                # The link shown by the API and calendar feeds follows the feed's
+                conf.website = url
+                index.add(conf.id, item.get("name"), website=url, start_date=item.get("start_date"),
+                          is_external=True, source=source)
+                stats["updated"] += 1
+            elif match is not None and (match.source is not None or not match.is_external):
+                stats["duplicates"] += 1
+                continue
+            else:
+                if match is not None:
+                    # Adopt rows created by the old lazy-insert path before creating new ones
+                    conf = await db.get(Conference, match.conference_id)
+                    stats["updated"] += 1
+                else:
+                    conf = Conference(
+                        is_external=True, organizer_id=None, website=url,
+                        **{field: item.get(field) for field in SYNCED_FIELDS},
+                    )
+                    db.add(conf)
+                    stats["created"] += 1
+                external = ExternalEvent(conference=conf, source=source, url=url, first_seen_at=now)
+                db.add(external)
+                await db.flush()
+                index.add(conf.id, item.get("name"), website=url, start_date=item.get("start_date"),
+                          is_external=True, source=source)
+        else:
+            conf = external.conference
+            stats["updated"] += 1
+        seen.add(key)
+
+        for field in SYNCED_FIELDS:
+            setattr(conf, field, item.get(field))
+        set_coordinates(conf)
+        external.last_seen_at = now
+        external.vanished_at = None
+
+    for key, external in known.items():
+        if key not in seen and external.vanished_at is None:
+            external.vanished_at = now
+            stats["vanished"] += 1
+
+    await db.commit()
+    return stats
+
+
+async def ingest_external_events(force: bool = False):
+    """Fetch all configured sources concurrently and upsert each one that succeeded."""
+    async with async_session() as db:
+        if not force and await _recently_ingested(db):
+            return None
+
+    results = await fetch_all_sources()
+
+    # One index for the whole run, so events repeated across feeds are caught too
+    async with async_session() as db:
+        index = await build_index(db)
+
+    all_stats = {}
+    for source, items in results.items():
+        if not items:
+            # A failed fetch (None) or an empty feed must not mark everything as vanished
+            continue
+        async with async_session() as db:
+            try:
+                all_stats[source] = await upsert_events(db, source, items, index)
+            except IntegrityError:
+                # Another worker inserted the same event concurrently; the next run reconciles
+                await db.rollback()
+                # The index still holds this source's rolled-back rows; later sources must not match them
+                index = await build_index(db)
+
+    if all_stats:
+        await bus.publish("conference.changed", sources=list(all_stats))
+    return all_stats
+
@@ -0,0 +1,223 @@
+import asyncio
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from .cache import worker_id
+from .db import async_session
+from .models import Job
+
+# Run workers inside each web process; set false and run `python -m app.worker` separately instead
+JOBS_IN_PROCESS = os.getenv("JOBS_IN_PROCESS", "true").lower() in ("1", "true", "yes")
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "2"))
+# Idle workers check for due jobs this often; enqueues in the same process wake them at once
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1.0"))
+JOB_TIMEOUT_SECONDS = float(os.getenv("JOB_TIMEOUT_SECONDS", "600"))
+JOB_BACKOFF_SECONDS = float(os.getenv("JOB_BACKOFF_SECONDS", "5.0"))
+JOB_MAX_BACKOFF_SECONDS = float(os.getenv("JOB_MAX_BACKOFF_SECONDS", "3600"))
+# Running jobs whose worker has been silent this long (crashed or killed) go back to pending
+JOB_LOCK_TIMEOUT_SECONDS = float(os.getenv("JOB_LOCK_TIMEOUT_SECONDS", str(JOB_TIMEOUT_SECONDS * 2)))
+
+JobHandler = Callable[[dict], Awaitable[Optional[Dict[str, Any]]]]
+
+_handlers: Dict[str, JobHandler] = {}
+_wakeup: Optional[asyncio.Event] = None
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler for failures a retry cannot fix; the job fails immediately."""
+
+
+def job_handler(kind: str):
+    """Register an async handler(payload) for a job kind; its dict return value is stored as the result."""
+    def register(func: JobHandler) -> JobHandler:
+        _handlers[kind] = func
+        return func
+    return register
+
+
+def _wake_workers():
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+async def enqueue(
+    kind: str,
+    payload: Optional[dict] = None,
+    delay: float = 0,
+    dedupe_key: Optional[str] = None,
+    max_attempts: int = 5,
+    repeat_seconds: Optional[int] = None,
+    user_id: Optional[int] = None,
+) -> Job:
+    """
+    Persist a job to run after `delay` seconds (and every `repeat_seconds`
+    after that, if given). While a job with the same dedupe_key is pending or
+    running, enqueueing again returns that job instead.
+    """
+    async with async_session() as db:
+        if dedupe_key is not None:
+            existing = await _active_with_key(db, dedupe_key)
+            if existing is not None:
+                return existing
+
+        job = Job(
+            kind=kind,
+            payload=json.dumps(payload or {}, default=str),
+            dedupe_key=dedupe_key,
+            max_attempts=max_attempts,
+            repeat_seconds=repeat_seconds,
+            run_at=datetime.utcnow() + timedelta(seconds=delay),
+            user_id=user_id,
+        )
+        db.add(job)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Another worker enqueued the same key between our check and insert
+            await db.rollback()
+            return await _active_with_key(db, dedupe_key)
+        await db.refresh(job)
+
+    if delay <= 0:
+        _wake_workers()
+    return job
+
+
+async def _active_with_key(db, dedupe_key: str) -> Optional[Job]:
+    result = await db.execute(
+        select(Job).where(Job.dedupe_key == dedupe_key, Job.status.in_(["pending", "running"]))
+    )
+    return result.scalars().first()
+
+
+async def _claim() -> Optional[Job]:
+    """Take the oldest due job. The conditional UPDATE makes the claim atomic across processes."""
+    now = datetime.utcnow()
+    async with async_session() as db:
+        result = await db.execute(
+            select(Job.id)
+            .where(Job.status == "pending", Job.run_at <= now, Job.kind.in_(list(_handlers)))
+            .order_by(Job.run_at)
+            .limit(5)
+        )
+        for job_id in result.scalars().all():
+            claimed = await db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == "pending")
+                .values(status="running", locked_by=worker_id(), locked_at=now, attempts=Job.attempts + 1)
+            )
+            await db.commit()
+            if claimed.rowcount == 1:
+                return await db.get(Job, job_id)
+    return None
+
+
+def _backoff(attempt: int) -> float:
+    delay = min(JOB_MAX_BACKOFF_SECONDS, JOB_BACKOFF_SECONDS * (2 ** (attempt - 1)))
+    return delay * (0.5 + random.random() / 2)
+
+
+async def _finish(job: Job, status: str, **values):
+    now = datetime.utcnow()
+    if status == "pending":
+        # Retry of this same row, so it keeps its dedupe key without a conflict
+        values.update(run_at=now + timedelta(seconds=_backoff(job.attempts)))
+    elif job.repeat_seconds:
+        # Recurring: record the outcome and book the next run
+        status = "pending"
+        values.update(attempts=0, finished_at=now, run_at=now + timedelta(seconds=job.repeat_seconds))
+    else:
+        values.update(finished_at=now)
+    async with async_session() as db:
+        await db.execute(update(Job).where(Job.id == job.id).values(status=status, locked_by=None, **values))
+        await db.commit()
+
+
+async def run_job(job: Job):
+    handler = _handlers[job.kind]
+    try:
+        result = await asyncio.wait_for(handler(json.loads(job.payload or "{}")), timeout=JOB_TIMEOUT_SECONDS)
+    except asyncio.CancelledError:
+        # Shutting down: hand the job back so the next worker picks it up right away
+        async with async_session() as db:
+            await db.execute(
+                update(Job)
+                .where(Job.id == job.id)
+                .values(status="pending", locked_by=None, attempts=job.attempts - 1)
+            )
+            await db.commit()
+        raise
+    except Exception as e:
+        error = f"{type(e).__name__}: {getattr(e, 'detail', None) or e}"
+        print(f"Job {job.id} ({job.kind}) attempt {job.attempts} failed: {error}")
+        retry = job.attempts < job.max_attempts and not isinstance(e, PermanentJobError)
+        await _finish(job, "pending" if retry else "failed", last_error=error)
+        return
+
+    await _finish(
+        job,
+        "completed",
+        last_error=None,
+        result=json.dumps(result, default=str) if result is not None else None,
+    )
+
+
+async def requeue_stale_jobs() -> int:
+    """Put jobs orphaned by a dead worker back in the queue."""
+    cutoff = datetime.utcnow() - timedelta(seconds=JOB_LOCK_TIMEOUT_SECONDS)
+    requeued = 0
+    async with async_session() as db:
+        result = await db.execute(select(Job.id).where(Job.status == "running", Job.locked_at < cutoff))
+        for job_id in result.scalars().all():
+            requeued += (await db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == "running", Job.locked_at < cutoff)
+                .values(status="pending", locked_by=None, last_error="worker lost")
+            )).rowcount
+        await db.commit()
+    return requeued
+
+
+async def _worker_loop():
+    while True:
+        try:
+            job = await _claim()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error claiming job: {e}")
+            job = None
+
+        if job is not None:
+            await run_job(job)
+            continue
+
+        _wakeup.clear()
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=JOB_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_worker(concurrency: int = JOB_WORKER_CONCURRENCY):
+    """Background task: run due jobs with `concurrency` loops, requeueing orphaned ones now and then."""
+    global _wakeup
+    _wakeup = asyncio.Event()
+    loops = [asyncio.create_task(_worker_loop()) for _ in range(concurrency)]
+    try:
+        while True:
+            try:
+                await requeue_stale_jobs()
+            except Exception as e:
+                print(f"Error requeueing stale jobs: {e}")
+            await asyncio.sleep(JOB_LOCK_TIMEOUT_SECONDS / 4)
+    finally:
+        for task in loops:
+            task.cancel()
+        await asyncio.gather(*loops, return_exceptions=True)
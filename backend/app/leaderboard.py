@@ -0,0 +1,142 @@
+import asyncio
+import os
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from .cache import bus
+from .db import async_session
+from .models import Conference, ExternalEvent, Rating
+
+# Bayesian average: every conference starts with this many pseudo-ratings at the catalog mean,
+# so a single 5-star vote cannot outrank a conference with dozens of 4.8s
+LEADERBOARD_PRIOR_WEIGHT = float(os.getenv("LEADERBOARD_PRIOR_WEIGHT", "5"))
+LEADERBOARD_MIN_RATINGS = int(os.getenv("LEADERBOARD_MIN_RATINGS", "1"))
+# The prior mean is re-read from the database this often; in between, writes update entries in place
+LEADERBOARD_REBUILD_SECONDS = int(os.getenv("LEADERBOARD_REBUILD_SECONDS", "3600"))
+DEFAULT_PRIOR_MEAN = 3.0
+
+
+class Leaderboard:
+    """
+    Conferences ordered by Bayesian average rating, kept in memory per worker.
+    `_order` is a sorted list of (-score, conference_id): a rating write moves
+    one entry with bisect, and a page is a slice.
+    """
+
+    def __init__(self):
+        self.prior_mean = DEFAULT_PRIOR_MEAN
+        self.built_at: Optional[datetime] = None
+        self._entries: Dict[int, Tuple[str, float, int]] = {}
+        self._keys: Dict[int, Tuple[float, int]] = {}
+        self._order: List[Tuple[float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def score(self, total: float, count: int) -> float:
+        return (LEADERBOARD_PRIOR_WEIGHT * self.prior_mean + total) / (LEADERBOARD_PRIOR_WEIGHT + count)
+
+    def remove(self, conference_id: int):
+        key = self._keys.pop(conference_id, None)
+        self._entries.pop(conference_id, None)
+        if key is not None:
+            del self._order[bisect_left(self._order, key)]
+
+    def update(self, conference_id: int, name: str, total: float, count: int):
+        self.remove(conference_id)
+        if count < LEADERBOARD_MIN_RATINGS:
+            return
+        key = (-self.score(total, count), conference_id)
+        self._entries[conference_id] = (name, total, count)
+        self._keys[conference_id] = key
+        insort(self._order, key)
+
+    def page(self, offset: int, limit: int) -> List[dict]:
+        rows = []
+        for rank, (neg_score, conference_id) in enumerate(self._order[offset:offset + limit], start=offset + 1):
+            name, total, count = self._entries[conference_id]
+            rows.append({
+                "rank": rank,
+                "conference_id": conference_id,
+                "name": name,
+                "score": round(-neg_score, 4),
+                "avg_rating": round(total / count, 4),
+                "total_ratings": count,
+            })
+        return rows
+
+
+_board = Leaderboard()
+_rebuilding: Optional[asyncio.Task] = None
+
+
+def get_leaderboard() -> Leaderboard:
+    return _board
+
+
+def _stats_query():
+    vanished = select(ExternalEvent.conference_id).where(ExternalEvent.vanished_at.isnot(None))
+    return (
+        select(Conference.id, Conference.name, func.sum(Rating.rating), func.count(Rating.id))
+        .join(Rating, Rating.conference_id == Conference.id)
+        .where(Conference.id.notin_(vanished))
+        .group_by(Conference.id, Conference.name)
+    )
+
+
+async def rebuild():
+    """Recompute every entry (and the prior mean) from the ratings table; swapped in whole."""
+    global _board
+    async with async_session() as db:
+        prior_mean = (await db.execute(select(func.avg(Rating.rating)))).scalar()
+        rows = (await db.execute(_stats_query())).all()
+
+    board = Leaderboard()
+    board.prior_mean = float(prior_mean) if prior_mean is not None else DEFAULT_PRIOR_MEAN
+    for conference_id, name, total, count in rows:
+        board.update(conference_id, name, float(total or 0), count)
+    board.built_at = datetime.utcnow()
+    _board = board
+
+
+async def refresh_conference(conference_id: int):
+    async with async_session() as db:
+        row = (await db.execute(_stats_query().where(Conference.id == conference_id))).first()
+    if row is None:
+        _board.remove(conference_id)
+    else:
+        _board.update(conference_id, row[1], float(row[2] or 0), row[3])
+
+
+async def load_leaderboard() -> Leaderboard:
+    """The current board; built on first use, refreshed in the background once stale."""
+    global _rebuilding
+    if _board.built_at is None:
+        await rebuild()
+    elif datetime.utcnow() - _board.built_at > timedelta(seconds=LEADERBOARD_REBUILD_SECONDS):
+        if _rebuilding is None or _rebuilding.done():
+            _rebuilding = asyncio.create_task(rebuild())
+    return _board
+
+
+async def _on_rating_changed(data: dict):
+    if _board.built_at is not None and data.get("conference_id") is not None:
+        await refresh_conference(data["conference_id"])
+
+
+async def _on_conference_changed(data: dict):
+    if _board.built_at is None:
+        return
+    if data.get("conference_id") is not None:
+        # Renamed or deleted
+        await refresh_conference(data["conference_id"])
+    else:
+        # Feed ingestion: any number of events may have vanished or returned
+        await rebuild()
+
+
+bus.subscribe("rating.changed", _on_rating_changed)
+bus.subscribe("conference.changed", _on_conference_changed)
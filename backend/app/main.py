@@ -1,10 +1,21 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import os
 
-from .db import engine, Base
-from .routers import conferences, auth, ratings, interests, comments, users, notifications
+from .db import engine
+from . import recommendations, jobs, tasks
+from .migrations import run_migrations
+from .warmup import readiness, warm_up
+from .http_client import http_clients
+from .cache import bus
+from .images import STATIC_DIR
+from .static_files import CachedStaticFiles, precompress_tree
+from .compression import CompressionMiddleware
+from .rate_limit import RateLimitMiddleware
+from .routers import conferences, auth, ratings, interests, comments, users, notifications, health
+from .routers import jobs as jobs_router
+from .routers import batch
 from .routers import google_integration  # NEW
 
 app = FastAPI(
@@ -24,6 +35,9 @@ prod_frontend = os.getenv("FRONTEND_URL")
 if prod_frontend:
     origins.append(prod_frontend)
 
+# Last added runs first: CORS wraps everything so 429/503 responses stay readable by the browser
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(RateLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -33,10 +47,32 @@ app.add_middleware(
 )
 
 
+background_tasks = []
+
+
 @app.on_event("startup")
 async def on_startup():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # One cheap version check when the schema is current; otherwise migrate under a lock
+    readiness.schema_version = await run_migrations(engine)
+    bus.start()
+
+    loop = asyncio.get_running_loop()
+    loop.run_in_executor(None, precompress_tree, STATIC_DIR)
+
+    background_tasks.append(asyncio.create_task(recommendations.run_worker()))
+    # Idempotent across workers: only the first call books each recurring job
+    await tasks.schedule_recurring_jobs()
+    if jobs.JOBS_IN_PROCESS:
+        background_tasks.append(asyncio.create_task(jobs.run_worker()))
+    background_tasks.append(asyncio.create_task(warm_up()))
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    for task in background_tasks:
+        task.cancel()
+    await http_clients.close()
+    await bus.stop()
 
 
 app.include_router(auth.router)
@@ -48,9 +84,11 @@ app.include_router(comments.router)
 app.include_router(users.router)
 app.include_router(google_integration.router)  # NEW
 app.include_router(notifications.router)
+app.include_router(jobs_router.router)
+app.include_router(batch.router)
+app.include_router(health.router)
 
 # Mount static files
-STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "static")
 if not os.path.exists(STATIC_DIR):
     os.makedirs(STATIC_DIR)
-app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+app.mount("/static", CachedStaticFiles(directory=STATIC_DIR), name="static")
@@ -0,0 +1,183 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from .db import Base
+from . import models  # noqa: F401  (registers every table on Base.metadata)
+from .topics import backfill_topics
+from .trending import backfill_activity
+from .geo import backfill_coordinates
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: SQLite migrations run unlocked
+    fcntl = None
+
+# Arbitrary app-wide key for pg_advisory_lock
+PG_LOCK_KEY = 726315001
+
+Migration = Callable[[AsyncConnection], Awaitable[None]]
+
+
+async def _create_tables(conn: AsyncConnection):
+    await conn.run_sync(Base.metadata.create_all)
+
+
+async def _create_missing_indexes(conn: AsyncConnection):
+    # create_all only indexes tables it creates; catch up indexes added to existing ones
+    def create(sync_conn):
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(sync_conn, checkfirst=True)
+
+    await conn.run_sync(create)
+
+
+async def _backfill_topics(conn: AsyncConnection):
+    async with AsyncSession(bind=conn) as db:
+        await backfill_topics(db)
+
+
+async def add_column(conn: AsyncConnection, table: str, column: str, ddl: str):
+    """ALTER TABLE ... ADD COLUMN unless create_all already made the column on a fresh database."""
+    def existing(sync_conn):
+        return {c["name"] for c in inspect(sync_conn).get_columns(table)}
+
+    if column not in await conn.run_sync(existing):
+        await conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+async def _add_conference_columns(conn: AsyncConnection):
+    # Databases created before these columns were added to the model
+    await add_column(conn, "conferences", "is_external", "BOOLEAN DEFAULT FALSE")
+    await add_column(conn, "conferences", "image_url", "VARCHAR")
+
+
+async def _create_jobs_table(conn: AsyncConnection):
+    await conn.run_sync(lambda sync_conn: models.Job.__table__.create(sync_conn, checkfirst=True))
+
+
+async def _create_activity_table(conn: AsyncConnection):
+    await conn.run_sync(lambda sync_conn: models.ConferenceActivity.__table__.create(sync_conn, checkfirst=True))
+    async with AsyncSession(bind=conn) as db:
+        await backfill_activity(db)
+
+
+async def _add_coordinates(conn: AsyncConnection):
+    await add_column(conn, "conferences", "latitude", "FLOAT")
+    await add_column(conn, "conferences", "longitude", "FLOAT")
+    async with AsyncSession(bind=conn) as db:
+        await backfill_coordinates(db)
+
+
+async def _add_calendar_token_version(conn: AsyncConnection):
+    await add_column(conn, "users", "calendar_token_version", "INTEGER NOT NULL DEFAULT 0")
+
+
+async def _cascade_google_events(conn: AsyncConnection):
+    # SQLite cannot alter a constraint (nor enforces one without PRAGMA foreign_keys); the ORM cascade covers it
+    if conn.dialect.name != "postgresql":
+        return
+
+    def foreign_keys(sync_conn):
+        return inspect(sync_conn).get_foreign_keys("google_calendar_events")
+
+    for fk in await conn.run_sync(foreign_keys):
+        if fk["referred_table"] != "conferences" or (fk.get("options") or {}).get("ondelete"):
+            continue
+        await conn.execute(text(f'ALTER TABLE google_calendar_events DROP CONSTRAINT "{fk["name"]}"'))
+        await conn.execute(text(
+            f'ALTER TABLE google_calendar_events ADD CONSTRAINT "{fk["name"]}" '
+            "FOREIGN KEY (conference_id) REFERENCES conferences (id) ON DELETE CASCADE"
+        ))
+
+
+# Append only; each entry runs once, in order, in its own transaction
+MIGRATIONS: List[Tuple[int, str, Migration]] = [
+    (1, "create tables", _create_tables),
+    (2, "add conference columns missing on older databases", _add_conference_columns),
+    (3, "create indexes missing on existing tables", _create_missing_indexes),
+    (4, "backfill conference topic links", _backfill_topics),
+    (5, "create jobs table", _create_jobs_table),
+    (6, "create and backfill trending activity buckets", _create_activity_table),
+    (7, "add and backfill geocoded conference coordinates", _add_coordinates),
+    (8, "add revocable calendar feed token version", _add_calendar_token_version),
+    (9, "cascade conference deletes to Google Calendar event records", _cascade_google_events),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+async def _ensure_version_table(conn: AsyncConnection):
+    await conn.execute(text("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)"))
+
+
+async def get_schema_version(engine: AsyncEngine) -> int:
+    async with engine.connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT MAX(version) FROM schema_version"))
+        except DBAPIError:
+            # Table missing: fresh database, or one created by create_all before migrations
+            return 0
+        return result.scalar() or 0
+
+
+async def _set_version(conn: AsyncConnection, version: int):
+    await conn.execute(text("DELETE FROM schema_version"))
+    await conn.execute(text("INSERT INTO schema_version (version) VALUES (:v)"), {"v": version})
+
+
+@asynccontextmanager
+async def _migration_lock(engine: AsyncEngine):
+    """Serialize migrations across worker processes sharing one database."""
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        async with engine.connect() as lock_conn:
+            await lock_conn.execute(text("SELECT pg_advisory_lock(:k)"), {"k": PG_LOCK_KEY})
+            try:
+                yield
+            finally:
+                await lock_conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": PG_LOCK_KEY})
+        return
+
+    database: Optional[str] = engine.url.database
+    if dialect != "sqlite" or fcntl is None or not database or database == ":memory:":
+        yield
+        return
+
+    lock_file = open(os.path.abspath(database) + ".migrate.lock", "w")
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(None, fcntl.flock, lock_file.fileno(), fcntl.LOCK_EX)
+        yield
+    finally:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        lock_file.close()
+
+
+async def run_migrations(engine: AsyncEngine) -> int:
+    """
+    Bring the schema up to SCHEMA_VERSION. An up-to-date database costs one
+    SELECT; otherwise the first worker to take the lock migrates and the
+    others find nothing left to do once they get it.
+    """
+    if await get_schema_version(engine) >= SCHEMA_VERSION:
+        return SCHEMA_VERSION
+
+    async with _migration_lock(engine):
+        async with engine.begin() as conn:
+            await _ensure_version_table(conn)
+        current = await get_schema_version(engine)
+        for version, description, migrate in MIGRATIONS:
+            if version <= current:
+                continue
+            print(f"Applying migration {version}: {description}")
+            async with engine.begin() as conn:
+                await migrate(conn)
+                await _set_version(conn, version)
+            current = version
+    return current
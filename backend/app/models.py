@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Float, ForeignKey, Text, DateTime, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Date, Float, ForeignKey, Text, DateTime, Boolean, UniqueConstraint, Index, Enum as SQLEnum, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -28,6 +28,8 @@ class User(Base):
     # Google Calendar integration (optional)
     google_refresh_token = Column(String, nullable=True)
     google_email = Column(String, nullable=True)
+    # Embedded in calendar feed tokens; bumping it revokes every feed URL handed out so far
+    calendar_token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Relationships
     conferences = relationship("Conference", back_populates="organizer", cascade="all, delete-orphan")
@@ -45,9 +47,9 @@ class Conference(Base):
     name = Column(String, nullable=False)
     acronym = Column(String, nullable=True, index=True)
     series = Column(String, nullable=True, index=True)
-    publisher = Column(String, nullable=True)
-    location = Column(String, nullable=True)
-    start_date = Column(Date, nullable=True)
+    publisher = Column(String, nullable=True, index=True)
+    location = Column(String, nullable=True, index=True)
+    start_date = Column(Date, nullable=True, index=True)
     end_date = Column(Date, nullable=True)
     topics = Column(Text, nullable=True)
     description = Column(Text, nullable=True)
@@ -57,6 +59,9 @@ class Conference(Base):
     is_external = Column(Boolean, default=False)
     colocated_with = Column(Text, nullable=True)
     image_url = Column(String, nullable=True)
+    # Geocoded from `location` against the bundled gazetteer on write; null when not recognized
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -68,11 +73,37 @@ class Conference(Base):
     interests = relationship("Interest", back_populates="conference", cascade="all, delete-orphan")
     comments = relationship("Comment", back_populates="conference", cascade="all, delete-orphan")
     papers = relationship("Paper", back_populates="conference", cascade="all, delete-orphan")
+    # Normalized index of the comma-separated `topics` text, kept in sync on write
+    topic_links = relationship("ConferenceTopic", back_populates="conference", cascade="all, delete-orphan")
+    external_event = relationship("ExternalEvent", back_populates="conference", uselist=False, cascade="all, delete-orphan")
+    activity = relationship("ConferenceActivity", back_populates="conference", cascade="all, delete-orphan")
+    google_events = relationship("GoogleCalendarEvent", back_populates="conference", cascade="all, delete-orphan")
 
 
 
 
 
+class Topic(Base):
+    __tablename__ = "topics"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Case/whitespace-normalized form used for lookups and filtering
+    key = Column(String, unique=True, nullable=False, index=True)
+    name = Column(String, nullable=False)
+
+    conference_links = relationship("ConferenceTopic", back_populates="topic", cascade="all, delete-orphan")
+
+
+class ConferenceTopic(Base):
+    __tablename__ = "conference_topics"
+
+    conference_id = Column(Integer, ForeignKey("conferences.id"), primary_key=True)
+    topic_id = Column(Integer, ForeignKey("topics.id"), primary_key=True, index=True)
+
+    conference = relationship("Conference", back_populates="topic_links")
+    topic = relationship("Topic", back_populates="conference_links")
+
+
 class Rating(Base):
     __tablename__ = "ratings"
 
@@ -98,6 +129,21 @@ class Interest(Base):
     conference = relationship("Conference", back_populates="interests")
 
 
+class ConferenceActivity(Base):
+    """Hourly interest/rating counters per conference, maintained on write; feeds the trending ranking."""
+    __tablename__ = "conference_activity"
+    __table_args__ = (UniqueConstraint("conference_id", "bucket_start"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    conference_id = Column(Integer, ForeignKey("conferences.id"), nullable=False, index=True)
+    # Start of the hour the counts fall in
+    bucket_start = Column(DateTime, nullable=False, index=True)
+    interests = Column(Integer, nullable=False, default=0)
+    ratings = Column(Integer, nullable=False, default=0)
+
+    conference = relationship("Conference", back_populates="activity")
+
+
 class Comment(Base):
     __tablename__ = "comments"
 
@@ -137,3 +183,86 @@ class Paper(Base):
 
     conference = relationship("Conference", back_populates="papers")
 
+
+class ExternalEvent(Base):
+    """Ingestion bookkeeping for conferences imported from external feeds."""
+    __tablename__ = "external_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    conference_id = Column(Integer, ForeignKey("conferences.id"), nullable=False, unique=True)
+    source = Column(String, nullable=False, index=True)
+    # Feed link; the upsert key, unique so concurrent ingesters cannot duplicate a row
+    url = Column(String, nullable=False, unique=True, index=True)
+    first_seen_at = Column(DateTime, default=datetime.utcnow)
+    last_seen_at = Column(DateTime, default=datetime.utcnow)
+    # Set when the event drops out of the feed; hidden from listings while set
+    vanished_at = Column(DateTime, nullable=True, index=True)
+
+    conference = relationship("Conference", back_populates="external_event")
+
+
+class GoogleCalendarEvent(Base):
+    """Google Calendar event created for a user's conference, so re-syncs don't duplicate it."""
+    __tablename__ = "google_calendar_events"
+    __table_args__ = (UniqueConstraint("user_id", "conference_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    conference_id = Column(Integer, ForeignKey("conferences.id", ondelete="CASCADE"), nullable=False, index=True)
+    event_id = Column(String, nullable=False)
+    html_link = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    conference = relationship("Conference", back_populates="google_events")
+
+
+class GoogleSyncJob(Base):
+    __tablename__ = "google_sync_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # pending -> running -> completed | failed
+    status = Column(String, nullable=False, default="pending")
+    total = Column(Integer, default=0)
+    synced = Column(Integer, default=0)
+    skipped = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class Job(Base):
+    """Background job persisted so it survives restarts; run by app.jobs workers."""
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # At most one queued or running job per dedupe key; enqueueing a duplicate returns the existing one
+        Index(
+            "ix_jobs_active_dedupe_key",
+            "dedupe_key",
+            unique=True,
+            sqlite_where=text("status IN ('pending', 'running')"),
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False, index=True)
+    payload = Column(Text, nullable=False, default="{}")
+    # pending -> running -> completed | failed; a failed attempt goes back to pending until max_attempts
+    status = Column(String, nullable=False, default="pending")
+    dedupe_key = Column(String, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    # Recurring jobs go back to pending this long after each run instead of finishing
+    repeat_seconds = Column(Integer, nullable=True)
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = Column(String, nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    result = Column(Text, nullable=True)
+    # Owner, for the status API; None for system jobs
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
@@ -0,0 +1,222 @@
+import asyncio
+import math
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .auth import BATCH_USER_SCOPE_KEY, decode_access_token
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+# memory (per worker: each of N workers allows the full rate) or redis (shared, uses CACHE_URL)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+# Anonymous clients are limited per IP, signed-in users per account
+RATE_LIMIT_IP_BURST = float(os.getenv("RATE_LIMIT_IP_BURST", "60"))
+RATE_LIMIT_IP_PER_SECOND = float(os.getenv("RATE_LIMIT_IP_PER_SECOND", "1"))
+RATE_LIMIT_USER_BURST = float(os.getenv("RATE_LIMIT_USER_BURST", "120"))
+RATE_LIMIT_USER_PER_SECOND = float(os.getenv("RATE_LIMIT_USER_PER_SECOND", "2"))
+# Behind a reverse proxy (Render and most PaaS; render.yaml turns this on), key anonymous
+# clients on the X-Forwarded-For entry our proxies appended, RATE_LIMIT_PROXY_HOPS from
+# the right. Off by default: without a proxy the header is whatever the client sent and
+# every request is keyed on its socket address (which uvicorn --forwarded-allow-ips fixes up)
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() in ("1", "true", "yes")
+RATE_LIMIT_PROXY_HOPS = max(1, int(os.getenv("RATE_LIMIT_PROXY_HOPS", "1")))
+# Admission control: in-flight requests per worker, and how long to queue before shedding
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "64"))
+ADMISSION_QUEUE_SECONDS = float(os.getenv("ADMISSION_QUEUE_SECONDS", "0.5"))
+
+# (method, path) -> (token cost, concurrency group); everything else costs 1
+ROUTE_COSTS: Dict[Tuple[str, str], Tuple[float, Optional[str]]] = {
+    # Each one runs a pbkdf2 hash
+    ("POST", "/auth/login"): (10, "auth"),
+    ("POST", "/auth/signup"): (10, "auth"),
+    ("GET", "/conferences"): (5, None),
+    ("GET", "/users/me/recommendations"): (3, None),
+    # Fired per keystroke and served from memory
+    ("GET", "/conferences/suggest"): (0.25, None),
+    ("POST", "/google/sync-interests"): (5, None),
+}
+# Concurrency group -> max in-flight requests per worker
+CONCURRENCY_GROUPS: Dict[str, int] = {
+    "auth": int(os.getenv("AUTH_MAX_CONCURRENCY", "4")),
+}
+EXEMPT_PREFIXES = ("/health", "/static", "/docs", "/redoc", "/openapi.json")
+
+
+class MemoryBuckets:
+    """Token buckets for this worker only."""
+
+    MAX_KEYS = 50_000
+
+    def __init__(self):
+        self._buckets: Dict[str, List[float]] = {}
+
+    async def take(self, key: str, cost: float, burst: float, rate: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.MAX_KEYS:
+                self._evict_full(now, burst, rate)
+            bucket = self._buckets[key] = [burst, now]
+        tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        bucket[0], bucket[1] = tokens, now
+        return allowed, tokens
+
+    def _evict_full(self, now: float, burst: float, rate: float):
+        # A bucket that has refilled completely carries no state worth keeping
+        full = [k for k, (tokens, ts) in self._buckets.items() if tokens + (now - ts) * rate >= burst]
+        for k in full:
+            del self._buckets[k]
+        if len(self._buckets) >= self.MAX_KEYS:
+            self._buckets.clear()
+
+
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - ts, 0) * rate)
+local allowed = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBuckets:
+    """Token buckets shared by every worker, updated atomically by a Lua script."""
+
+    def __init__(self, client=None):
+        if client is None:
+            from .cache import RedisBackend
+            client = RedisBackend().client
+        self.client = client
+        self._script = client.register_script(_TAKE_SCRIPT)
+
+    async def take(self, key: str, cost: float, burst: float, rate: float) -> Tuple[bool, float]:
+        try:
+            allowed, tokens = await self._script(
+                keys=[f"sciflow:ratelimit:{key}"], args=[burst, rate, cost, time.time()]
+            )
+        except Exception as e:
+            # Fail open: an unavailable limiter must not take the API down with it
+            print(f"Error checking rate limit: {e}")
+            return True, burst
+        return bool(allowed), float(tokens)
+
+
+def create_buckets(kind: str = RATE_LIMIT_BACKEND):
+    if kind == "memory":
+        return MemoryBuckets()
+    if kind == "redis":
+        return RedisBuckets()
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {kind}")
+
+
+def _client_ip(scope: Scope, headers: Headers) -> str:
+    if RATE_LIMIT_TRUST_PROXY:
+        forwarded = headers.get("x-forwarded-for")
+        if forwarded:
+            # Entries left of the ones our proxies appended are client-supplied and can be anything
+            hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+            if hops:
+                return hops[-min(RATE_LIMIT_PROXY_HOPS, len(hops))]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _user_id(headers: Headers) -> Optional[str]:
+    authorization = headers.get("authorization", "")
+    if not authorization.lower().startswith("bearer "):
+        return None
+    payload = decode_access_token(authorization[7:])
+    return str(payload["sub"]) if payload is not None else None
+
+
+def _reject(status_code: int, detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=status_code,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class RateLimitMiddleware:
+    """
+    Per-IP (anonymous) / per-user token buckets with per-route costs, then
+    admission control: a worker-wide in-flight cap plus tighter caps for
+    expensive route groups. Over the rate -> 429; no capacity within
+    ADMISSION_QUEUE_SECONDS -> 503. Both carry Retry-After.
+    """
+
+    def __init__(self, app: ASGIApp, buckets=None):
+        self.app = app
+        self.buckets = buckets if buckets is not None else create_buckets()
+        self._semaphores: Optional[Dict[str, asyncio.Semaphore]] = None
+
+    def _semaphore(self, group: str) -> asyncio.Semaphore:
+        # Created lazily so they bind to the serving event loop
+        if self._semaphores is None:
+            self._semaphores = {name: asyncio.Semaphore(limit) for name, limit in CONCURRENCY_GROUPS.items()}
+            self._semaphores["*"] = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        return self._semaphores[group]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not RATE_LIMIT_ENABLED or scope["path"].startswith(EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        if method == "OPTIONS":
+            # CORS preflights are answered without reaching a handler
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        cost, group = ROUTE_COSTS.get((method, scope["path"].rstrip("/") or "/"), (1, None))
+        user_id = _user_id(headers)
+        if user_id is not None:
+            key, burst, rate = f"user:{user_id}", RATE_LIMIT_USER_BURST, RATE_LIMIT_USER_PER_SECOND
+        else:
+            key, burst, rate = f"ip:{_client_ip(scope, headers)}", RATE_LIMIT_IP_BURST, RATE_LIMIT_IP_PER_SECOND
+
+        allowed, tokens = await self.buckets.take(key, cost, burst, rate)
+        if not allowed:
+            response = _reject(429, "Too many requests", (cost - tokens) / rate)
+            await response(scope, receive, send)
+            return
+
+        if BATCH_USER_SCOPE_KEY in scope:
+            # A POST /batch sub-request: charged above, but it runs inside the batch's admission slot
+            await self.app(scope, receive, send)
+            return
+
+        acquired = []
+        try:
+            for name in ("*", group) if group else ("*",):
+                semaphore = self._semaphore(name)
+                try:
+                    await asyncio.wait_for(semaphore.acquire(), timeout=ADMISSION_QUEUE_SECONDS)
+                except asyncio.TimeoutError:
+                    response = _reject(503, "Server busy, please retry", 1)
+                    await response(scope, receive, send)
+                    return
+                acquired.append(semaphore)
+            await self.app(scope, receive, send)
+        finally:
+            for semaphore in acquired:
+                semaphore.release()
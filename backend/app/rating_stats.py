@@ -0,0 +1,95 @@
+import math
+import os
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .cache import Cache, bus
+from .models import Rating
+
+# Entries are dropped on every rating write; the TTL only bounds memory for idle conferences
+RATING_STATS_CACHE_SECONDS = float(os.getenv("RATING_STATS_CACHE_SECONDS", "3600"))
+
+stats_cache = Cache("rating_stats", RATING_STATS_CACHE_SECONDS)
+
+
+def summarize(conference_id: int, values: List[Tuple[float, int]]) -> dict:
+    """Stats from (rating value, count) pairs: exact median and stddev without the individual rows."""
+    values = sorted(values)
+    histogram = {str(s): 0 for s in range(1, 6)}
+    count = 0
+    total = 0.0
+    for value, n in values:
+        # Half-up, so a 4.5 counts as five stars
+        histogram[str(min(5, max(1, math.floor(value + 0.5))))] += n
+        count += n
+        total += value * n
+    if count == 0:
+        return {"conference_id": conference_id, "count": 0, "average": None, "median": None, "stddev": None,
+                "histogram": histogram}
+
+    mean = total / count
+    variance = sum(n * (value - mean) ** 2 for value, n in values) / count
+
+    def nth(index: int) -> float:
+        seen = 0
+        for value, n in values:
+            seen += n
+            if index < seen:
+                return value
+        return values[-1][0]
+
+    if count % 2:
+        median = nth(count // 2)
+    else:
+        median = (nth(count // 2 - 1) + nth(count // 2)) / 2
+    return {
+        "conference_id": conference_id,
+        "count": count,
+        "average": round(mean, 4),
+        "median": round(median, 4),
+        "stddev": round(math.sqrt(variance), 4),
+        "histogram": histogram,
+    }
+
+
+async def compute_stats(db: AsyncSession, conference_ids: Iterable[int]) -> Dict[int, dict]:
+    """One GROUP BY (conference, rating value) query for any number of conferences."""
+    conference_ids = list(conference_ids)
+    values: Dict[int, List[Tuple[float, int]]] = {conference_id: [] for conference_id in conference_ids}
+    result = await db.execute(
+        select(Rating.conference_id, Rating.rating, func.count(Rating.id))
+        .where(Rating.conference_id.in_(conference_ids))
+        .group_by(Rating.conference_id, Rating.rating)
+    )
+    for conference_id, value, n in result.all():
+        values[conference_id].append((float(value), n))
+    return {conference_id: summarize(conference_id, pairs) for conference_id, pairs in values.items()}
+
+
+async def load_stats(db: AsyncSession, conference_ids: Iterable[int]) -> Dict[int, dict]:
+    """Cached stats per conference, read in one round trip; all misses are computed together in one query."""
+    conference_ids = list(dict.fromkeys(conference_ids))
+    stats: Dict[int, dict] = await stats_cache.get_many(conference_ids)
+    missing = [conference_id for conference_id in conference_ids if conference_id not in stats]
+    if missing:
+        computed = await compute_stats(db, missing)
+        await stats_cache.set_many(computed)
+        stats.update(computed)
+    return stats
+
+
+async def _on_rating_changed(data: dict):
+    if data.get("conference_id") is not None:
+        await stats_cache.delete(data["conference_id"])
+
+
+async def _on_conference_changed(data: dict):
+    # A deleted conference takes its ratings with it
+    if data.get("conference_id") is not None:
+        await stats_cache.delete(data["conference_id"])
+
+
+bus.subscribe("rating.changed", _on_rating_changed)
+bus.subscribe("conference.changed", _on_conference_changed)
@@ -0,0 +1,194 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from .cache import bus
+from .db import async_session
+from .models import Interest, Rating
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Number of neighbours kept per conference in the precomputed model
+TOP_K = int(os.getenv("RECOMMENDATIONS_TOP_K", "20"))
+# Full rebuild interval; writes mark the model dirty and trigger an earlier rebuild
+REBUILD_INTERVAL_SECONDS = int(os.getenv("RECOMMENDATIONS_REBUILD_INTERVAL", "600"))
+# Small debounce so a burst of writes only triggers a single rebuild
+REBUILD_DEBOUNCE_SECONDS = 5
+# A star rating is scaled to [0, 1]; an interest counts as a full signal
+MAX_RATING = 5.0
+
+
+class RecommendationModel:
+    """
+    Precomputed item-item similarity model.
+    `neighbors` maps a conference id to its top-K (conference_id, similarity) pairs,
+    `popular` is the fallback ranking for users without any history.
+    """
+
+    def __init__(
+        self,
+        neighbors: Dict[int, List[Tuple[int, float]]],
+        popular: List[int],
+        built_at: Optional[datetime] = None,
+    ):
+        self.neighbors = neighbors
+        self.popular = popular
+        self.built_at = built_at
+
+
+_model = RecommendationModel({}, [])
+_dirty: Optional[asyncio.Event] = None
+
+
+def get_model() -> RecommendationModel:
+    return _model
+
+
+def mark_dirty():
+    """Called after interest/rating writes so the worker rebuilds early."""
+    if _dirty is not None:
+        _dirty.set()
+
+
+async def _on_signal_changed(data: dict):
+    mark_dirty()
+
+
+# Every worker holds its own model, so writes in any worker mark all of them dirty
+bus.subscribe("interest.changed", _on_signal_changed)
+bus.subscribe("rating.changed", _on_signal_changed)
+
+
+def compute_model(
+    user_ids: "np.ndarray",
+    conference_ids: "np.ndarray",
+    weights: "np.ndarray",
+    top_k: int = TOP_K,
+) -> RecommendationModel:
+    """
+    Build the item-item cosine similarity model from (user, conference, weight) triples.
+    Pure NumPy/SciPy so it can run in a worker thread.
+    """
+    if len(weights) == 0:
+        return RecommendationModel({}, [], datetime.utcnow())
+
+    # Imported on first build rather than in every worker at boot
+    import numpy as np
+    from scipy import sparse
+
+    users, user_idx = np.unique(user_ids, return_inverse=True)
+    items, item_idx = np.unique(conference_ids, return_inverse=True)
+
+    # users x items; duplicates (interest + rating on the same pair) keep the strongest signal
+    matrix = sparse.coo_matrix(
+        (weights, (user_idx, item_idx)), shape=(len(users), len(items))
+    ).tocsr()
+    matrix.sum_duplicates()
+    matrix.data = np.minimum(matrix.data, 1.0)
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0))).ravel()
+    norms[norms == 0] = 1.0
+    normalized = matrix @ sparse.diags(1.0 / norms)
+
+    similarity = (normalized.T @ normalized).tocsr()
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+
+    neighbors: Dict[int, List[Tuple[int, float]]] = {}
+    for row in range(similarity.shape[0]):
+        start, end = similarity.indptr[row], similarity.indptr[row + 1]
+        if start == end:
+            continue
+        cols = similarity.indices[start:end]
+        scores = similarity.data[start:end]
+        if len(scores) > top_k:
+            keep = np.argpartition(-scores, top_k)[:top_k]
+            cols, scores = cols[keep], scores[keep]
+        order = np.argsort(-scores)
+        neighbors[int(items[row])] = [
+            (int(items[c]), float(s)) for c, s in zip(cols[order], scores[order])
+        ]
+
+    popularity = np.asarray((matrix > 0).sum(axis=0)).ravel()
+    popular = [int(items[i]) for i in np.argsort(-popularity, kind="stable")[: top_k * 5]]
+
+    return RecommendationModel(neighbors, popular, datetime.utcnow())
+
+
+async def load_user_signals(db, user_id: Optional[int] = None) -> Dict[Tuple[int, int], float]:
+    """Collect (user_id, conference_id) -> weight from the interest and rating tables."""
+    interest_stmt = select(Interest.user_id, Interest.conference_id)
+    rating_stmt = select(Rating.user_id, Rating.conference_id, Rating.rating)
+    if user_id is not None:
+        interest_stmt = interest_stmt.where(Interest.user_id == user_id)
+        rating_stmt = rating_stmt.where(Rating.user_id == user_id)
+
+    signals: Dict[Tuple[int, int], float] = {}
+    for uid, cid in (await db.execute(interest_stmt)).all():
+        signals[(uid, cid)] = 1.0
+    for uid, cid, value in (await db.execute(rating_stmt)).all():
+        weight = max(float(value or 0) / MAX_RATING, 0.0)
+        signals[(uid, cid)] = max(signals.get((uid, cid), 0.0), weight)
+    return signals
+
+
+async def rebuild_model():
+    global _model
+    async with async_session() as db:
+        signals = await load_user_signals(db)
+
+    if not signals:
+        # Nothing to learn from yet; avoid loading NumPy/SciPy for an empty model
+        _model = RecommendationModel({}, [], datetime.utcnow())
+        return
+
+    import numpy as np
+
+    pairs = np.array(list(signals.keys()), dtype=np.int64)
+    weights = np.fromiter(signals.values(), dtype=np.float64, count=len(signals))
+    user_ids, conference_ids = pairs[:, 0], pairs[:, 1]
+
+    loop = asyncio.get_running_loop()
+    _model = await loop.run_in_executor(None, compute_model, user_ids, conference_ids, weights)
+
+
+def recommend(user_signals: Dict[int, float], limit: int = 10) -> List[int]:
+    """
+    Score candidates from the precomputed neighbour lists of the user's conferences.
+    Cost is O(len(history) * TOP_K), independent of catalog size.
+    """
+    model = _model
+    scores: Dict[int, float] = {}
+    for conference_id, weight in user_signals.items():
+        for neighbor_id, similarity in model.neighbors.get(conference_id, []):
+            if neighbor_id in user_signals:
+                continue
+            scores[neighbor_id] = scores.get(neighbor_id, 0.0) + weight * similarity
+
+    ranked = sorted(scores, key=scores.get, reverse=True)[:limit]
+    if len(ranked) < limit:
+        seen = set(ranked) | set(user_signals)
+        ranked.extend([c for c in model.popular if c not in seen][: limit - len(ranked)])
+    return ranked
+
+
+async def run_worker():
+    """Background task: rebuild on a schedule, or shortly after writes mark the model dirty."""
+    global _dirty
+    _dirty = asyncio.Event()
+    while True:
+        try:
+            await rebuild_model()
+        except Exception as e:
+            print(f"Error rebuilding recommendation model: {e}")
+
+        try:
+            await asyncio.wait_for(_dirty.wait(), timeout=REBUILD_INTERVAL_SECONDS)
+            await asyncio.sleep(REBUILD_DEBOUNCE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _dirty.clear()
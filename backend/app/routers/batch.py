@@ -0,0 +1,105 @@
+import asyncio
+import os
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from ..auth import BATCH_USER_SCOPE_KEY, get_current_user_optional
+from ..models import User
+from ..schemas import BatchRequest, BatchResponse, BatchSubRequest
+from ..serialization import fast_response
+
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+# Sub-requests of one batch in flight at once; each holds a pooled DB connection while it runs
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+# Sub-response headers worth passing back to the client
+FORWARDED_HEADERS = ("content-type", "etag", "cache-control", "last-modified", "retry-after")
+
+router = APIRouter(tags=["batch"])
+
+
+async def _dispatch(request: Request, sub: BatchSubRequest, user: Optional[User]) -> dict:
+    """Run one GET through the full app (routing, rate limits) in-process and capture its response."""
+    url = urlsplit(sub.path)
+    if url.path.rstrip("/") == "/batch":
+        return {"id": sub.id, "status": 400, "headers": {}, "body": {"detail": "Batches cannot be nested"}}
+
+    headers = [(b"accept", b"application/json")]
+    authorization = request.headers.get("authorization")
+    if authorization:
+        # Still read by the rate limiter to charge the caller's bucket
+        headers.append((b"authorization", authorization.encode("latin-1")))
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": request.scope.get("scheme", "http"),
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "headers": headers,
+        # Authenticated once by the batch; get_current_user* return this instead of re-reading the token
+        BATCH_USER_SCOPE_KEY: user,
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    response = {"status": 500, "headers": [], "body": []}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            response["body"].append(message.get("body", b""))
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception as e:
+        # The error middleware has already sent its 500 for this sub-request
+        print(f"Error in batch sub-request {sub.path}: {e}")
+
+    body = b"".join(response["body"])
+    forwarded = {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in response["headers"]
+        if name.decode("latin-1").lower() in FORWARDED_HEADERS
+    }
+    if forwarded.get("content-type", "").startswith("application/json") and body:
+        parsed = orjson.loads(body)
+    else:
+        parsed = body.decode("utf-8", errors="replace") if body else None
+    return {"id": sub.id, "status": response["status"], "headers": forwarded, "body": parsed}
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def batch(
+    payload: BatchRequest,
+    request: Request,
+    current_user: Optional[User] = Depends(get_current_user_optional),
+):
+    """
+    Run several GET requests in one round trip. The caller is authenticated
+    once; sub-requests run concurrently, each answered with its own status,
+    in request order.
+    """
+    if not payload.requests:
+        raise HTTPException(status_code=400, detail="No requests to run")
+    if len(payload.requests) > BATCH_MAX_REQUESTS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_REQUESTS} requests per batch")
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run(sub: BatchSubRequest) -> dict:
+        async with semaphore:
+            return await _dispatch(request, sub, current_user)
+
+    responses: List[dict] = await asyncio.gather(*(run(sub) for sub in payload.requests))
+    return fast_response({"responses": responses})
@@ -8,6 +8,8 @@ from ..db import get_db
 from ..models import Comment, Conference, User
 from ..schemas import CommentCreate, CommentRead
 from ..auth import get_current_user
+from ..cache import bus
+from ..serialization import trusted_model, fast_response
 
 router = APIRouter(prefix="/conferences/{conference_id}/comments", tags=["comments"])
 
@@ -32,6 +34,7 @@ async def create_comment(
     db.add(comment)
     await db.commit()
     await db.refresh(comment)
+    await bus.publish("comment.changed", user_id=current_user.id, conference_id=conference_id)
 
     return CommentRead(
         id=comment.id,
@@ -55,8 +58,9 @@ async def list_comments(
         .order_by(Comment.created_at.desc())
     )
     comments = result.scalars().all()
-    return [
-        CommentRead(
+    return fast_response([
+        trusted_model(
+            CommentRead,
             id=c.id,
             user_id=c.user_id,
             user_name=c.user.full_name,
@@ -65,4 +69,4 @@ async def list_comments(
             created_at=c.created_at,
         )
         for c in comments
-    ]
+    ])
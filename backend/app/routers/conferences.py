@@ -1,23 +1,45 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File, Form
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, extract
 from sqlalchemy.orm import selectinload
 import uuid
 import os
 import shutil
 
 from ..db import get_db
-from ..models import Conference, User, Rating, Interest, Notification, Paper
-from ..schemas import ConferenceCreate, ConferenceRead, ConferenceUpdate, PaperRead, PaperCreate
+from ..models import Conference, User, Rating, Interest, Paper, Topic, ConferenceTopic, ExternalEvent
+from ..schemas import (
+    ConferenceCreate, ConferenceRead, ConferenceUpdate, PaperRead, PaperCreate,
+    ConferenceFacets, FacetCount, ImageRead, TrendingConferenceRead, LeaderboardEntry,
+    SuggestionRead, NearbyConferenceRead, ConferenceDocument, RatingStatsRead,
+)
 from ..auth import get_current_user, get_current_organizer, get_current_user_optional
-
-from .dev_events import fetch_dev_events
-import httpx
-import asyncio
+from ..cache import Cache, bus
+from ..jobs import enqueue
+from .. import ics
+from ..topics import sync_conference_topics, normalize_topic
+from ..images import store_upload, image_variant_url
+from ..serialization import trusted_model, fast_response
+from ..trending import TRENDING_TOP_K, load_trending
+from ..leaderboard import load_leaderboard
+from ..suggest import MAX_SUGGESTIONS, load_suggest_index
+from ..geo import load_geo_index, set_coordinates
+from ..includes import detail_cache, include_key, load_sections, parse_include
+from ..rating_stats import load_stats
 
 router = APIRouter(prefix="/conferences", tags=["conferences"])
 
+# Facet counts only change on conference writes, which publish conference.changed
+facets_cache = Cache("facets", ttl_seconds=300)
+
+
+async def _on_conference_changed(data: dict):
+    await facets_cache.clear()
+
+
+bus.subscribe("conference.changed", _on_conference_changed)
 
 
 def parse_colocated(text: Optional[str]) -> Optional[list]:
@@ -33,10 +55,32 @@ def serialize_colocated(values: Optional[list]) -> Optional[str]:
     return ", ".join(values)
 
 
+async def load_user_fields(db: AsyncSession, conference_id: int, current_user: Optional[User]) -> dict:
+    """The caller's own rating and interest; everything else in a conference read is the same for all users."""
+    if not current_user:
+        return {"user_rating": None, "user_interested": False}
+
+    user_rating_result = await db.execute(
+        select(Rating.rating).where(
+            and_(Rating.user_id == current_user.id, Rating.conference_id == conference_id)
+        )
+    )
+    user_interest_result = await db.execute(
+        select(Interest.id).where(
+            and_(Interest.user_id == current_user.id, Interest.conference_id == conference_id)
+        )
+    )
+    return {
+        "user_rating": user_rating_result.scalar_one_or_none(),
+        "user_interested": user_interest_result.scalar_one_or_none() is not None,
+    }
+
+
 async def build_conference_read(
     conf: Conference,
     db: AsyncSession,
-    current_user: Optional[User] = None
+    current_user: Optional[User] = None,
+    image_variant: str = "large",
 ) -> ConferenceRead:
     rating_result = await db.execute(
         select(
@@ -51,28 +95,20 @@ async def build_conference_read(
     )
     total_interests = interests_result.scalar()
 
-    user_rating = None
-    user_interested = False
-
-    if current_user:
-        user_rating_result = await db.execute(
-            select(Rating.rating).where(
-                and_(Rating.user_id == current_user.id, Rating.conference_id == conf.id)
-            )
+    source = "sciflow"
+    if conf.is_external:
+        source_result = await db.execute(
+            select(ExternalEvent.source).where(ExternalEvent.conference_id == conf.id)
         )
-        user_rating = user_rating_result.scalar_one_or_none()
+        source = source_result.scalar_one_or_none() or "dev.events"
 
-        user_interest_result = await db.execute(
-            select(Interest.id).where(
-                and_(Interest.user_id == current_user.id, Interest.conference_id == conf.id)
-            )
-        )
-        user_interested = user_interest_result.scalar_one_or_none() is not None
+    user_fields = await load_user_fields(db, conf.id, current_user)
 
-    return ConferenceRead(
+    return trusted_model(
+        ConferenceRead,
         id=conf.id,
         organizer_id=conf.organizer_id,
-        organizer_name=conf.organizer.full_name if conf.organizer else "Unknown",
+        organizer_name=conf.organizer.full_name if conf.organizer else (source if conf.is_external else "Unknown"),
         name=conf.name,
         acronym=conf.acronym,
         series=conf.series,
@@ -84,17 +120,17 @@ async def build_conference_read(
         description=conf.description,
         speakers=conf.speakers,
         website=conf.website,
-        image_url=conf.image_url,
+        image_url=image_variant_url(conf.image_url, image_variant),
         colocated_with=parse_colocated(conf.colocated_with),
         avg_rating=float(avg_rating) if avg_rating else None,
         rating=float(avg_rating) if avg_rating else None,
         total_ratings=total_ratings or 0,
         total_interests=total_interests or 0,
-        user_rating=user_rating,
-        user_interested=user_interested,
+        **user_fields,
 
         papers=[
-            PaperRead(
+            trusted_model(
+                PaperRead,
                 id=p.id,
                 conference_id=p.conference_id,
                 title=p.title,
@@ -104,8 +140,10 @@ async def build_conference_read(
             for p in (conf.papers or [])
         ],
         created_at=conf.created_at,
-        source="dev.events" if conf.is_external else "sciflow",
-        is_external=conf.is_external or False
+        source=source,
+        is_external=conf.is_external or False,
+        latitude=conf.latitude,
+        longitude=conf.longitude,
     )
 
 
@@ -123,34 +161,15 @@ async def create_conference(
         colocated_with=colocated,
         organizer_id=current_user.id
     )
+    set_coordinates(conf)
     db.add(conf)
+    await db.flush()
+    await sync_conference_topics(db, conf.id, conf.topics)
     await db.commit()
+    await bus.publish("conference.changed", conference_id=conf.id)
 
-    result = await db.execute(
-        select(Conference)
-        .options(selectinload(Conference.organizer), selectinload(Conference.papers))
-        .where(Conference.id == conf.id)
-    )
-    conf = result.scalar_one()
-
-    # Create notifications for all users
-    user_result = await db.execute(select(User.id))
-    user_ids = user_result.scalars().all()
-    
-    for uid in user_ids:
-        # Don't notify the organizer who created it (optional, but cleaner)
-        if uid == current_user.id:
-            continue
-            
-        notif = Notification(
-            user_id=uid,
-            title="New Conference Posted!",
-            content=f"'{conf.name}' has just been added. Check it out!",
-            conference_id=conf.id
-        )
-        db.add(notif)
-    
-    await db.commit()
+    # Fan the notification out to every user in the background
+    await enqueue("notify.new_conference", {"conference_id": conf.id}, dedupe_key=f"notify.new_conference:{conf.id}")
 
     # Re-fetch after commit to avoid expired/detached object issues
     result = await db.execute(
@@ -167,83 +186,255 @@ async def create_conference(
 async def list_conferences(
     publisher: Optional[str] = Query(None),
     min_rating: Optional[float] = Query(None),
+    topic: Optional[List[str]] = Query(None),
     db: AsyncSession = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user_optional),
 ):
+    # External events are ingested in the background; hide the ones that left their feed
+    vanished = select(ExternalEvent.conference_id).where(ExternalEvent.vanished_at.isnot(None))
     stmt = select(Conference).options(
         selectinload(Conference.organizer), 
         selectinload(Conference.papers)
-    )
+    ).where(Conference.id.notin_(vanished))
 
     if publisher:
         stmt = stmt.where(Conference.publisher == publisher)
 
+    if topic:
+        # Any of the requested topics, resolved through the indexed association table
+        keys = [normalize_topic(t) for t in topic]
+        stmt = stmt.where(
+            Conference.id.in_(
+                select(ConferenceTopic.conference_id)
+                .join(Topic, Topic.id == ConferenceTopic.topic_id)
+                .where(Topic.key.in_(keys))
+            )
+        )
+
     result = await db.execute(stmt)
     conferences = result.scalars().all()
 
     response = []
     for conf in conferences:
-        conf_read = await build_conference_read(conf, db, current_user)
+        conf_read = await build_conference_read(conf, db, current_user, image_variant="card")
         if min_rating and (conf_read.avg_rating is None or conf_read.avg_rating < min_rating):
             continue
         response.append(conf_read)
 
-    # Merge external conferences from dev.events
-    if not publisher and not min_rating:
-        external_confs = await fetch_dev_events()
-        existing_websites = {c.website for c in response if c.website}
-        for ext in external_confs:
-            if ext.website not in existing_websites:
-                response.append(ext)
+    return fast_response(response)
 
-    return response
 
+async def _count_by(db: AsyncSession, column, *joins) -> List[FacetCount]:
+    # Same visibility as the list endpoint, so a facet's count matches the results it filters to
+    vanished = select(ExternalEvent.conference_id).where(ExternalEvent.vanished_at.isnot(None))
+    stmt = select(column, func.count(Conference.id.distinct()))
+    stmt = stmt.select_from(Conference)
+    for target, onclause in joins:
+        stmt = stmt.join(target, onclause)
+    stmt = stmt.where(column.isnot(None), Conference.id.notin_(vanished)).group_by(column).order_by(func.count(Conference.id.distinct()).desc())
+    result = await db.execute(stmt)
+    return [FacetCount(value=str(value), count=count) for value, count in result.all()]
+
+
+async def _compute_facets(db: AsyncSession) -> ConferenceFacets:
+    return ConferenceFacets(
+        topics=await _count_by(
+            db,
+            Topic.name,
+            (ConferenceTopic, ConferenceTopic.conference_id == Conference.id),
+            (Topic, Topic.id == ConferenceTopic.topic_id),
+        ),
+        publishers=await _count_by(db, Conference.publisher),
+        locations=await _count_by(db, Conference.location),
+        years=await _count_by(db, extract("year", Conference.start_date)),
+    )
 
-@router.get("/{conference_id}", response_model=ConferenceRead)
-async def get_conference(
-    conference_id: int,
+
+async def load_facets(db: AsyncSession) -> ConferenceFacets:
+    return await facets_cache.get_or_set("all", lambda: _compute_facets(db))
+
+
+@router.get("/facets", response_model=ConferenceFacets)
+async def get_facets(db: AsyncSession = Depends(get_db)):
+    return await load_facets(db)
+
+
+@router.get("/trending", response_model=List[TrendingConferenceRead])
+async def get_trending(
+    window: str = Query("24h", regex="^(24h|7d)$"),
+    limit: int = Query(10, ge=1, le=TRENDING_TOP_K),
     db: AsyncSession = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user_optional),
 ):
-    stmt = (
+    """Conferences gaining interests and ratings fastest, recent activity weighted highest."""
+    ranked = (await load_trending(db, window))[:limit]
+    if not ranked:
+        return []
+
+    vanished = select(ExternalEvent.conference_id).where(ExternalEvent.vanished_at.isnot(None))
+    result = await db.execute(
         select(Conference)
         .options(selectinload(Conference.organizer), selectinload(Conference.papers))
-        .where(Conference.id == conference_id)
+        .where(Conference.id.in_([conference_id for conference_id, _ in ranked]), Conference.id.notin_(vanished))
     )
-    result = await db.execute(stmt)
-    conf = result.scalar_one_or_none()
-    
-    if not conf:
-        # Check if it's an external conference from dev.events RSS
-        external_confs = await fetch_dev_events()
-        target = next((c for c in external_confs if c.id == conference_id), None)
-        if target:
-            # Create a local record so users can interact with it
-            new_conf = Conference(
-                name=target.name,
-                description=target.description,
-                location=target.location,
-                start_date=target.start_date,
-                website=target.website,
-                is_external=True,
-                organizer_id=None
-            )
-            db.add(new_conf)
-            await db.commit()
-            await db.refresh(new_conf)
-            
-            # Re-fetch to get relationships and full data
-            stmt = (
-                select(Conference)
-                .options(selectinload(Conference.organizer), selectinload(Conference.papers))
-                .where(Conference.id == new_conf.id)
-            )
-            result = await db.execute(stmt)
-            conf = result.scalar_one()
-        else:
-            raise HTTPException(status_code=404, detail="Conference not found")
-            
-    return await build_conference_read(conf, db, current_user)
+    by_id = {conf.id: conf for conf in result.scalars().all()}
+
+    response = []
+    for conference_id, score in ranked:
+        conf = by_id.get(conference_id)
+        if conf is None:
+            continue
+        response.append(trusted_model(
+            TrendingConferenceRead,
+            score=score,
+            conference=await build_conference_read(conf, db, current_user, image_variant="card"),
+        ))
+    return fast_response(response)
+
+
+@router.get("/top", response_model=List[LeaderboardEntry])
+async def get_top_rated(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """Top-rated leaderboard by Bayesian average, served from this worker's in-memory index."""
+    board = await load_leaderboard()
+    return fast_response(board.page(offset, limit))
+
+
+@router.get("/suggest", response_model=List[SuggestionRead])
+async def suggest_conferences(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=MAX_SUGGESTIONS),
+):
+    """Typeahead on name/acronym/series, most-tracked first; served from memory, no query per keystroke."""
+    index = await load_suggest_index()
+    return fast_response(index.suggest(prefix, limit))
+
+
+@router.get("/nearby", response_model=List[NearbyConferenceRead])
+async def get_nearby(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(100, gt=0, le=20050),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+):
+    """Conferences within radius_km of (lat, lon), nearest first; located offline from the bundled gazetteer."""
+    index = await load_geo_index()
+    found = index.nearby(lat, lon, radius_km, limit)
+    if not found:
+        return []
+
+    result = await db.execute(
+        select(Conference)
+        .options(selectinload(Conference.organizer), selectinload(Conference.papers))
+        .where(Conference.id.in_([conference_id for conference_id, _ in found]))
+    )
+    by_id = {conf.id: conf for conf in result.scalars().all()}
+
+    response = []
+    for conference_id, distance in found:
+        conf = by_id.get(conference_id)
+        if conf is None:
+            continue
+        response.append(trusted_model(
+            NearbyConferenceRead,
+            distance_km=distance,
+            conference=await build_conference_read(conf, db, current_user, image_variant="card"),
+        ))
+    return fast_response(response)
+
+
+RATING_STATS_MAX_IDS = int(os.getenv("RATING_STATS_MAX_IDS", "100"))
+
+
+@router.get("/ratings/stats", response_model=List[RatingStatsRead])
+async def get_bulk_rating_stats(
+    ids: List[int] = Query(..., description="Conference ids, repeated: ?ids=1&ids=2"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Rating stats for many conferences in one call; unknown or unrated ids report a count of 0."""
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > RATING_STATS_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {RATING_STATS_MAX_IDS} ids per request")
+    stats = await load_stats(db, ids)
+    return fast_response([stats[conference_id] for conference_id in ids])
+
+
+async def load_catalog_calendar(db: AsyncSession, start: Optional[date] = None, end: Optional[date] = None):
+    """(body, etag) of the catalog feed for the given window, rendered once per cache period."""
+
+    async def render():
+        vanished = select(ExternalEvent.conference_id).where(ExternalEvent.vanished_at.isnot(None))
+        stmt = select(Conference).where(Conference.start_date.isnot(None), Conference.id.notin_(vanished))
+        if start:
+            stmt = stmt.where(func.coalesce(Conference.end_date, Conference.start_date) >= start)
+        if end:
+            stmt = stmt.where(Conference.start_date <= end)
+        result = await db.execute(stmt.order_by(Conference.start_date))
+        return ics.render(result.scalars().all(), "Sciflow - Conferences")
+
+    return await ics.calendar_cache.get_or_set(("catalog", start, end), render)
+
+
+@router.get("/calendar.ics")
+async def get_catalog_calendar(
+    request: Request,
+    start: Optional[date] = Query(None, description="Only events ending on or after this date"),
+    end: Optional[date] = Query(None, description="Only events starting on or before this date"),
+    db: AsyncSession = Depends(get_db),
+):
+    body, etag = await load_catalog_calendar(db, start, end)
+    return ics.calendar_response(request, body, etag, "sciflow-conferences.ics")
+
+
+@router.post("/images", response_model=ImageRead, status_code=201)
+async def upload_image(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_organizer),
+):
+    """Upload an image ahead of creating a conference; use urls["large"] as image_url."""
+    return ImageRead(urls=await store_upload(file))
+
+
+@router.get("/{conference_id}", response_model=ConferenceDocument)
+async def get_conference(
+    conference_id: int,
+    include: Optional[str] = Query(
+        None,
+        description="Extra sections, comma-separated: comments[:latestN], ratings_histogram, organizer, related",
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+):
+    try:
+        spec = parse_include(include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def compose():
+        stmt = (
+            select(Conference)
+            .options(selectinload(Conference.organizer), selectinload(Conference.papers))
+            .where(Conference.id == conference_id)
+        )
+        result = await db.execute(stmt)
+        conf = result.scalar_one_or_none()
+        if not conf:
+            return None
+        # Anonymous view plus sections: identical for every caller, so cached under one key
+        document = dict((await build_conference_read(conf, db)).__dict__)
+        document.update(await load_sections(db, conf, spec))
+        return document
+
+    document = await detail_cache.get_or_set((conference_id, include_key(spec)), compose)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Conference not found")
+    if current_user:
+        document = {**document, **await load_user_fields(db, conference_id, current_user)}
+    return fast_response(document)
 
 
 @router.patch("/{conference_id}", response_model=ConferenceRead)
@@ -271,7 +462,13 @@ async def update_conference(
     for field, value in data.items():
         setattr(conf, field, value)
 
+    if "topics" in data:
+        await sync_conference_topics(db, conf.id, conf.topics)
+    if "location" in data:
+        set_coordinates(conf)
+
     await db.commit()
+    await bus.publish("conference.changed", conference_id=conf.id)
 
     # Re-fetch after commit to avoid expired/detached object issues
     result = await db.execute(
@@ -299,6 +496,7 @@ async def delete_conference(
 
     await db.delete(conf)
     await db.commit()
+    await bus.publish("conference.changed", conference_id=conference_id)
     return None
 
 
@@ -323,23 +521,15 @@ async def add_paper(
         url=payload.url
     )
     db.add(paper)
-    
-    # Notify users about new paper
-    user_result = await db.execute(select(User.id))
-    user_ids = user_result.scalars().all()
-    for uid in user_ids:
-        if uid == current_user.id:
-            continue
-        notif = Notification(
-            user_id=uid,
-            title="New Research Paper Added",
-            content=f"A new paper '{payload.title}' has been added to '{conf.name}'.",
-            conference_id=conf.id
-        )
-        db.add(notif)
-        
     await db.commit()
     await db.refresh(paper)
+    await bus.publish("conference.changed", conference_id=conference_id)
+
+    await enqueue(
+        "notify.new_paper",
+        {"conference_id": conference_id, "title": payload.title},
+        dedupe_key=f"notify.new_paper:{paper.id}",
+    )
 
     return PaperRead(
         id=paper.id,
@@ -348,3 +538,24 @@ async def add_paper(
         url=paper.url,
         created_at=paper.created_at
     )
+
+
+@router.post("/{conference_id}/image", response_model=ImageRead, status_code=201)
+async def upload_conference_image(
+    conference_id: int,
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_organizer),
+    db: AsyncSession = Depends(get_db),
+):
+    result = await db.execute(select(Conference).where(Conference.id == conference_id))
+    conf = result.scalar_one_or_none()
+    if not conf:
+        raise HTTPException(status_code=404, detail="Conference not found")
+    if conf.organizer_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    urls = await store_upload(file)
+    conf.image_url = urls["large"]
+    await db.commit()
+    await bus.publish("conference.changed", conference_id=conference_id)
+    return ImageRead(urls=urls)
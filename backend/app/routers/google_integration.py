@@ -1,15 +1,16 @@
 from typing import Optional
 import json
-import requests
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from ..db import get_db
-from ..models import User, Conference
+from ..models import User, Conference, GoogleCalendarEvent, GoogleSyncJob
+from ..schemas import GoogleSyncJobRead
 from ..auth import get_current_user
-from ..google_calendar import get_flow, create_calendar_event
+from ..google_calendar import get_flow, exchange_code, fetch_userinfo
+from ..jobs import enqueue
 
 router = APIRouter(prefix="/google", tags=["google"])
 
@@ -50,11 +51,8 @@ async def google_callback(
     """
     Google redirects here after the user approves.
     """
-    flow = get_flow()
-    flow.fetch_token(code=code)
-
-    creds = flow.credentials
-    if not creds.refresh_token:
+    tokens = await exchange_code(code)
+    if not tokens.get("refresh_token"):
         # If we didn't get a refresh token, it might be because the user already approved.
         # But for 'offline' access/prompt='consent', we usually get it.
         pass
@@ -74,17 +72,12 @@ async def google_callback(
         result = await db.execute(select(User).where(User.id == user_id))
         user = result.scalar_one_or_none()
         if user:
-            if creds.refresh_token:
-                user.google_refresh_token = creds.refresh_token
+            if tokens.get("refresh_token"):
+                user.google_refresh_token = tokens["refresh_token"]
             
             # Also get email from Google to be safe
-            userinfo_resp = requests.get(
-                "https://www.googleapis.com/oauth2/v3/userinfo",
-                headers={"Authorization": f"Bearer {creds.token}"},
-                timeout=10,
-            )
-            if userinfo_resp.status_code == 200:
-                userinfo = userinfo_resp.json()
+            userinfo = await fetch_userinfo(tokens["access_token"])
+            if userinfo:
                 user.google_email = userinfo.get("email")
             
             db.add(user)
@@ -105,24 +98,84 @@ async def add_conference_to_calendar(
     db: AsyncSession = Depends(get_db),
 ):
     """
-    Creates a Google Calendar event for this conference using the
-    refresh token stored for the current user.
+    Queues creation of a Google Calendar event for this conference using the
+    refresh token stored for the current user. Returns the link right away if
+    the event already exists, otherwise 202 with a job to poll at /jobs/{job_id}.
     """
     if not current_user.google_refresh_token:
         raise HTTPException(status_code=400, detail="Google Calendar not connected")
 
-    result = await db.execute(select(Conference).where(Conference.id == conference_id))
-    conf = result.scalar_one_or_none()
-    if not conf:
+    result = await db.execute(select(Conference.id).where(Conference.id == conference_id))
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Conference not found")
 
-    event_link = create_calendar_event(
-        refresh_token=current_user.google_refresh_token,
-        summary=conf.name,
-        description=(conf.description or "") + f"\nWebsite: {conf.website or ''}",
-        location=conf.location,
-        start_date=conf.start_date,
-        end_date=conf.end_date,
+    result = await db.execute(
+        select(GoogleCalendarEvent).where(
+            GoogleCalendarEvent.user_id == current_user.id,
+            GoogleCalendarEvent.conference_id == conference_id,
+        )
+    )
+    existing = result.scalar_one_or_none()
+    if existing:
+        return {"message": "Event already in Google Calendar", "event_link": existing.html_link}
+
+    job = await enqueue(
+        "google.add_event",
+        {"user_id": current_user.id, "conference_id": conference_id},
+        dedupe_key=f"google.add_event:{current_user.id}:{conference_id}",
+        user_id=current_user.id,
+    )
+    return JSONResponse(
+        {"message": "Adding event to Google Calendar", "job_id": job.id, "status": job.status},
+        status_code=202,
+    )
+
+
+@router.post("/sync-interests", response_model=GoogleSyncJobRead, status_code=202)
+async def sync_interests(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Queue a background job that adds every conference the user is interested in
+    to their Google Calendar. Poll the returned job for progress.
+    """
+    if not current_user.google_refresh_token:
+        raise HTTPException(status_code=400, detail="Google Calendar not connected")
+
+    # One active job per user; a second click just returns the running one
+    result = await db.execute(
+        select(GoogleSyncJob).where(
+            GoogleSyncJob.user_id == current_user.id,
+            GoogleSyncJob.status.in_(["pending", "running"]),
+        )
     )
+    job = result.scalars().first()
+    if job:
+        return job
 
-    return {"message": "Event created in Google Calendar", "event_link": event_link}
+    job = GoogleSyncJob(user_id=current_user.id, status="pending")
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    await enqueue(
+        "google.sync_interests",
+        {"sync_job_id": job.id},
+        dedupe_key=f"google.sync_interests:{current_user.id}",
+        # run_sync_job retries batches itself and records its own failure
+        max_attempts=1,
+        user_id=current_user.id,
+    )
+    return job
+
+
+@router.get("/sync-interests/{job_id}", response_model=GoogleSyncJobRead)
+async def get_sync_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    job = await db.get(GoogleSyncJob, job_id)
+    if not job or job.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    return job
@@ -0,0 +1,28 @@
+from fastapi import APIRouter
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from ..event_sources import sources_health
+from ..http_client import http_clients
+from ..warmup import readiness
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/sources")
+async def get_sources_health():
+    """Per-source fetch health of the external event aggregator (as seen by this worker)."""
+    return sources_health()
+
+
+@router.get("/http")
+async def get_http_metrics():
+    """Per-host outbound request counts and latency of this worker's pooled HTTP clients."""
+    return http_clients.metrics()
+
+
+@router.get("/ready")
+async def get_readiness():
+    """503 until this worker has migrated and warmed its caches; point the platform health check here."""
+    status_code = 200 if readiness.ready else 503
+    return JSONResponse(jsonable_encoder(readiness.as_dict()), status_code=status_code)
@@ -9,6 +9,9 @@ from ..models import Interest, Conference, User
 from ..schemas import ConferenceRead
 from ..auth import get_current_user
 from .conferences import build_conference_read
+from ..serialization import fast_response
+from ..cache import bus
+from ..trending import record_activity
 
 router = APIRouter(prefix="/interests", tags=["interests"])
 
@@ -33,7 +36,9 @@ async def mark_interested(
 
     interest = Interest(user_id=current_user.id, conference_id=conference_id)
     db.add(interest)
+    await record_activity(db, conference_id, interests=1)
     await db.commit()
+    await bus.publish("interest.changed", user_id=current_user.id, conference_id=conference_id)
     return {"message": "Marked as interested"}
 
 
@@ -54,6 +59,7 @@ async def remove_interest(
 
     await db.delete(interest)
     await db.commit()
+    await bus.publish("interest.changed", user_id=current_user.id, conference_id=conference_id)
     return None
 
 
@@ -69,4 +75,6 @@ async def get_my_interests(
         .where(Interest.user_id == current_user.id)
     )
     conferences = result.scalars().all()
-    return [await build_conference_read(c, db, current_user) for c in conferences]
+    return fast_response(
+        [await build_conference_read(c, db, current_user, image_variant="card") for c in conferences]
+    )
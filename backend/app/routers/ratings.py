@@ -4,8 +4,12 @@ from sqlalchemy import select, and_
 
 from ..db import get_db
 from ..models import Rating, Conference, User
-from ..schemas import RatingCreate, RatingRead
+from ..schemas import RatingCreate, RatingRead, RatingStatsRead
 from ..auth import get_current_user
+from ..cache import bus
+from ..trending import record_activity
+from ..rating_stats import load_stats
+from ..serialization import fast_response
 
 router = APIRouter(prefix="/conferences/{conference_id}/ratings", tags=["ratings"])
 
@@ -37,7 +41,24 @@ async def create_or_update_rating(
             rating=payload.rating,
         )
         db.add(rating)
+        # Only first ratings count towards trending; re-rating is not new attention
+        await record_activity(db, conference_id, ratings=1)
 
     await db.commit()
     await db.refresh(rating)
+    await bus.publish("rating.changed", user_id=current_user.id, conference_id=conference_id)
     return rating
+
+
+@router.get("/stats", response_model=RatingStatsRead)
+async def get_rating_stats(
+    conference_id: int,
+    db: AsyncSession = Depends(get_db),
+):
+    """Histogram, average, median and standard deviation of the ratings, cached until the next rating."""
+    stats = (await load_stats(db, [conference_id]))[conference_id]
+    if stats["count"] == 0:
+        conf_result = await db.execute(select(Conference.id).where(Conference.id == conference_id))
+        if conf_result.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Conference not found")
+    return fast_response(stats)
@@ -1,14 +1,16 @@
 from typing import List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from ..db import get_db
-from ..models import User, Conference
+from ..models import User, Conference, Interest
 from ..schemas import ConferenceRead, UserRead
-from ..auth import get_current_user, get_current_organizer
+from ..auth import get_current_user, get_current_organizer, get_calendar_user, create_calendar_token
 from .conferences import build_conference_read
+from ..serialization import fast_response
+from .. import recommendations, ics
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -29,4 +31,70 @@ async def get_my_conferences(
         .where(Conference.organizer_id == current_user.id)
     )
     conferences = result.scalars().all()
-    return [await build_conference_read(c, db, current_user) for c in conferences]
+    return fast_response(
+        [await build_conference_read(c, db, current_user, image_variant="card") for c in conferences]
+    )
+
+
+@router.get("/me/recommendations", response_model=List[ConferenceRead])
+async def get_my_recommendations(
+    limit: int = Query(10, ge=1, le=50),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    signals = await recommendations.load_user_signals(db, current_user.id)
+    user_signals = {cid: weight for (_, cid), weight in signals.items()}
+    conference_ids = recommendations.recommend(user_signals, limit)
+    if not conference_ids:
+        return []
+
+    result = await db.execute(
+        select(Conference)
+        .options(selectinload(Conference.organizer), selectinload(Conference.papers))
+        .where(Conference.id.in_(conference_ids))
+    )
+    by_id = {c.id: c for c in result.scalars().all()}
+    return fast_response([
+        await build_conference_read(by_id[cid], db, current_user, image_variant="card")
+        for cid in conference_ids
+        if cid in by_id
+    ])
+
+
+@router.get("/me/calendar-token")
+async def get_calendar_token(current_user: User = Depends(get_current_user)):
+    """Subscription URL for the user's interests feed, to paste into a calendar client."""
+    token = create_calendar_token(current_user)
+    return {"token": token, "url": f"/users/me/calendar.ics?token={token}"}
+
+
+@router.post("/me/calendar-token/rotate")
+async def rotate_calendar_token(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Revoke every feed URL issued so far and return a fresh one."""
+    user = await db.get(User, current_user.id)
+    user.calendar_token_version = (user.calendar_token_version or 0) + 1
+    await db.commit()
+    token = create_calendar_token(user)
+    return {"token": token, "url": f"/users/me/calendar.ics?token={token}"}
+
+
+@router.get("/me/calendar.ics")
+async def get_my_calendar(
+    request: Request,
+    current_user: User = Depends(get_calendar_user),
+    db: AsyncSession = Depends(get_db),
+):
+    async def render():
+        result = await db.execute(
+            select(Conference)
+            .join(Interest)
+            .where(Interest.user_id == current_user.id)
+            .order_by(Conference.start_date)
+        )
+        return ics.render(result.scalars().all(), "Sciflow - My conferences")
+
+    body, etag = await ics.calendar_cache.get_or_set(("user", current_user.id), render)
+    return ics.calendar_response(request, body, etag, "sciflow-interests.ics")
@@ -1,6 +1,7 @@
 from datetime import date, datetime
-from typing import List, Optional
-from pydantic import BaseModel, EmailStr
+import json
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, EmailStr, validator
 from enum import Enum
 
 
@@ -93,12 +94,58 @@ class ConferenceRead(ConferenceBase):
     created_at: datetime
     source: str = "sciflow"
     is_external: bool = False
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
 
 
     class Config:
         orm_mode = True
 
 
+class TrendingConferenceRead(BaseModel):
+    score: float
+    conference: ConferenceRead
+
+
+class NearbyConferenceRead(BaseModel):
+    distance_km: float
+    conference: ConferenceRead
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    conference_id: int
+    name: str
+    score: float
+    avg_rating: float
+    total_ratings: int
+
+
+class SuggestionRead(BaseModel):
+    conference_id: int
+    name: str
+    acronym: Optional[str] = None
+    series: Optional[str] = None
+    total_interests: int
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class ConferenceFacets(BaseModel):
+    topics: List[FacetCount] = []
+    publishers: List[FacetCount] = []
+    locations: List[FacetCount] = []
+    years: List[FacetCount] = []
+
+
+class ImageRead(BaseModel):
+    # Variant name (thumb, card, large, original) -> URL
+    urls: Dict[str, str]
+
+
 class RatingCreate(BaseModel):
     rating: float
 
@@ -114,6 +161,16 @@ class RatingRead(BaseModel):
         orm_mode = True
 
 
+class RatingStatsRead(BaseModel):
+    conference_id: int
+    count: int
+    average: Optional[float] = None
+    median: Optional[float] = None
+    stddev: Optional[float] = None
+    # Star (rounded rating, "1".."5") -> number of ratings
+    histogram: Dict[str, int]
+
+
 class CommentCreate(BaseModel):
     content: str
 
@@ -143,6 +200,79 @@ class NotificationRead(BaseModel):
         orm_mode = True
 
 
+class GoogleSyncJobRead(BaseModel):
+    id: int
+    user_id: int
+    status: str
+    total: int
+    synced: int
+    skipped: int
+    failed: int
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+
+class JobRead(BaseModel):
+    id: int
+    kind: str
+    status: str
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    last_error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    @validator("result", pre=True)
+    def parse_result(cls, v):
+        # Stored as JSON text on the row
+        return json.loads(v) if isinstance(v, str) else v
+
+    class Config:
+        orm_mode = True
+
+
+class BatchSubRequest(BaseModel):
+    # Echoed back so clients can match responses without relying on order
+    id: Optional[str] = None
+    method: str = "GET"
+    path: str
+
+    @validator("method")
+    def only_reads(cls, v):
+        # Reads have no ordering or transaction concerns, so they can run concurrently
+        if v.upper() != "GET":
+            raise ValueError("only GET sub-requests can be batched")
+        return "GET"
+
+    @validator("path")
+    def local_path(cls, v):
+        if not v.startswith("/") or v.startswith("//"):
+            raise ValueError("path must be an absolute path on this API, e.g. /conferences/1")
+        return v
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest]
+
+
+class BatchSubResponse(BaseModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = {}
+    # Parsed JSON for JSON responses, text otherwise
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    responses: List[BatchSubResponse]
+
+
 class PaperCreate(BaseModel):
     title: str
     url: str
@@ -159,4 +289,28 @@ class PaperRead(BaseModel):
         orm_mode = True
 
 
+class OrganizerRead(BaseModel):
+    id: int
+    full_name: str
+    total_conferences: int
+
+
+class RelatedConferenceRead(BaseModel):
+    id: int
+    name: str
+    acronym: Optional[str] = None
+    location: Optional[str] = None
+    start_date: Optional[date] = None
+
+
+class ConferenceDocument(ConferenceRead):
+    """GET /conferences/{id} with ?include= sections; a section is present only when requested."""
+    comments: Optional[List[CommentRead]] = None
+    # Star (rounded rating, "1".."5") -> number of ratings
+    ratings_histogram: Optional[Dict[str, int]] = None
+    organizer: Optional[OrganizerRead] = None
+    related: Optional[List[RelatedConferenceRead]] = None
+
+
 ConferenceRead.update_forward_refs()
+ConferenceDocument.update_forward_refs()
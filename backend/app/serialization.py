@@ -0,0 +1,44 @@
+import os
+from typing import Any, Type, TypeVar
+
+import orjson
+from pydantic import BaseModel
+from starlette.responses import Response
+
+# Debug/CI switch: build read models with full validation and let FastAPI's
+# response_model check every response, instead of the trusted fast path.
+VALIDATE_RESPONSES = os.getenv("VALIDATE_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def _default(obj: Any):
+    # construct()-built models keep every field, in declaration order, in __dict__
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default)
+
+
+def trusted_model(model: Type[ModelT], **fields) -> ModelT:
+    """Build a read model from values that already have the right types (DB rows)."""
+    if VALIDATE_RESPONSES:
+        return model(**fields)
+    return model.construct(**fields)
+
+
+def fast_response(content: Any, status_code: int = 200):
+    """
+    Serialize trusted models straight to JSON with orjson, skipping FastAPI's
+    second response_model validation pass. In VALIDATE_RESPONSES mode the content
+    is returned as-is so the declared response_model still validates it.
+    """
+    if VALIDATE_RESPONSES:
+        return content
+    return FastJSONResponse(content, status_code=status_code)
@@ -0,0 +1,211 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import stat
+import uuid
+from email.utils import formatdate
+
+import aiofiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, PlainTextResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional; gzip variants are still produced and served
+    brotli = None
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+# Text-like types worth precompressing; images are already compressed
+COMPRESSIBLE_EXTENSIONS = {".svg", ".css", ".js", ".json", ".txt", ".xml", ".html", ".map", ".ico"}
+PRECOMPRESS_MIN_BYTES = 1024
+
+# Uploads live under images/<sha256>/, so their URLs change whenever content does;
+# only those are cached as immutable, everything else revalidates
+_CONTENT_ADDRESSED_RE = re.compile(r"(^|/)images/[0-9a-f]{64}/")
+_RANGE_RE = re.compile(r"^bytes=(?P<start>\d*)-(?P<end>\d*)$")
+
+def precompress(full_path: str) -> None:
+    """Write .gz (and .br when brotli is installed) siblings if they are missing, stale or worth it."""
+    if os.path.splitext(full_path)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+        return
+    source_stat = os.stat(full_path)
+    if source_stat.st_size < PRECOMPRESS_MIN_BYTES:
+        return
+
+    encoders = [(".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        encoders.append((".br", lambda data: brotli.compress(data, quality=11)))
+
+    data = None
+    for suffix, encode in encoders:
+        target = full_path + suffix
+        if os.path.exists(target) and os.stat(target).st_mtime >= source_stat.st_mtime:
+            continue
+        if data is None:
+            with open(full_path, "rb") as f:
+                data = f.read()
+        compressed = encode(data)
+        if len(compressed) >= len(data):
+            continue
+        # Every worker precompresses at startup; a private tmp file keeps their writes apart
+        tmp = f"{target}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp, target)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+def precompress_tree(directory: str) -> None:
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith((".gz", ".br", ".tmp")):
+                continue
+            try:
+                precompress(os.path.join(root, name))
+            except OSError as e:
+                print(f"Error precompressing {name}: {e}")
+
+
+class RangeFileResponse(FileResponse):
+    """FileResponse that sends only bytes [start, end] of the file."""
+
+    def __init__(self, path, start: int, end: int, **kwargs):
+        super().__init__(path, status_code=206, **kwargs)
+        self.start = start
+        self.end = end
+        self.headers["content-length"] = str(end - start + 1)
+        size = self.stat_result.st_size
+        self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if self.send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        remaining = self.end - self.start + 1
+        async with aiofiles.open(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                remaining -= len(chunk)
+                more_body = remaining > 0 and len(chunk) > 0
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                if not chunk:
+                    break
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles with long-lived caching for content-addressed uploads, precompressed
+    gzip/brotli variants negotiated via Accept-Encoding, strong ETags and single
+    byte-range requests.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            return PlainTextResponse("Method Not Allowed", status_code=405)
+
+        full_path, stat_result = await self.lookup_path(path)
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            return PlainTextResponse("Not Found", status_code=404)
+
+        immutable = bool(_CONTENT_ADDRESSED_RE.search(path.replace(os.sep, "/")))
+        return self.cached_file_response(full_path, stat_result, scope, immutable)
+
+    def cached_file_response(
+        self, full_path: str, stat_result: os.stat_result, scope: Scope, immutable: bool
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        media_type = mimetypes.guess_type(full_path)[0] or "text/plain"
+        compressible = os.path.splitext(full_path)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+        serve_path, serve_stat, encoding = full_path, stat_result, None
+        if compressible and not request_headers.get("range"):
+            accepted = {
+                part.split(";")[0].strip().lower()
+                for part in request_headers.get("accept-encoding", "").split(",")
+            }
+            for name, suffix in (("br", ".br"), ("gzip", ".gz")):
+                if name in accepted and os.path.isfile(full_path + suffix):
+                    candidate = os.stat(full_path + suffix)
+                    if candidate.st_mtime >= stat_result.st_mtime:
+                        serve_path, serve_stat, encoding = full_path + suffix, candidate, name
+                        break
+
+        etag_base = f"{stat_result.st_mtime}-{stat_result.st_size}-{encoding or 'identity'}"
+        headers = {
+            "etag": '"' + hashlib.md5(etag_base.encode()).hexdigest() + '"',
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "cache-control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+            "accept-ranges": "bytes",
+        }
+        if compressible:
+            headers["vary"] = "Accept-Encoding"
+        if encoding:
+            headers["content-encoding"] = encoding
+
+        if self.is_not_modified(headers, request_headers):
+            return Response(status_code=304, headers={k: v for k, v in headers.items() if k != "content-encoding"})
+
+        byte_range = self._parse_range(request_headers, headers["etag"], stat_result.st_size)
+        if byte_range == "invalid":
+            return Response(status_code=416, headers={"content-range": f"bytes */{stat_result.st_size}"})
+        if byte_range is not None:
+            start, end = byte_range
+            return RangeFileResponse(
+                full_path, start, end, headers=headers, media_type=media_type,
+                stat_result=stat_result, method=scope["method"],
+            )
+
+        return FileResponse(
+            serve_path, headers=headers, media_type=media_type,
+            stat_result=serve_stat, method=scope["method"],
+        )
+
+    def is_not_modified(self, response_headers, request_headers: Headers) -> bool:
+        """
+        Weak If-None-Match comparison (RFC 7232 3.2): files compressed on the
+        fly by CompressionMiddleware reach the client with the W/ form of the tag.
+        """
+        if_none_match = request_headers.get("if-none-match")
+        if not if_none_match:
+            return super().is_not_modified(response_headers, request_headers)
+        tags = {tag.strip().replace("W/", "", 1) for tag in if_none_match.split(",")}
+        # If-Modified-Since only counts when there is no If-None-Match
+        return "*" in tags or response_headers["etag"].replace("W/", "", 1) in tags
+
+    @staticmethod
+    def _parse_range(request_headers: Headers, etag: str, size: int):
+        """Return (start, end), "invalid", or None to send the whole file."""
+        range_header = request_headers.get("range")
+        if not range_header:
+            return None
+        if_range = request_headers.get("if-range")
+        if if_range and if_range != etag:
+            return None
+        match = _RANGE_RE.match(range_header.strip())
+        if not match:
+            # Multiple ranges or other units: fall back to the full body
+            return None
+        start, end = match.group("start"), match.group("end")
+        if start == "":
+            if end == "":
+                return "invalid"
+            length = int(end)
+            if length == 0:
+                return "invalid"
+            return max(size - length, 0), size - 1
+        start = int(start)
+        end = int(end) if end else size - 1
+        if start >= size or end < start:
+            return "invalid"
+        return start, min(end, size - 1)
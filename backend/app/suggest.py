@@ -0,0 +1,183 @@
+import heapq
+import os
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from .cache import bus
+from .db import async_session
+from .dedupe import fold
+from .models import Conference, ExternalEvent, Interest
+
+# Prefixes matching at least this many keys keep their ranking until the index next changes,
+# so short prefixes on a large catalog are ranked in full once rather than on every keystroke
+SUGGEST_MEMO_MIN_KEYS = int(os.getenv("SUGGEST_MEMO_MIN_KEYS", "256"))
+MAX_SUGGESTIONS = 20
+_MEMO_MAX_PREFIXES = 4096
+# Sorts after any character a folded key can contain
+_KEY_END = "\U0010ffff"
+
+
+def _keys(name: Optional[str], acronym: Optional[str], series: Optional[str]) -> List[str]:
+    """Every word-start suffix of each field, so "learn" finds "Machine Learning"."""
+    keys = set()
+    for value in (name, acronym, series):
+        words = fold(value)
+        for i in range(len(words)):
+            keys.add(" ".join(words[i:]))
+    return sorted(keys)
+
+
+class SuggestIndex:
+    """
+    Typeahead over conference name/acronym/series, kept in memory per worker.
+    `_keys` is a sorted list of (key, conference_id); a prefix is two bisects
+    bounding its range, and every match in the range is ranked by interest
+    count. Rankings of large ranges are memoized until the next change.
+    """
+
+    def __init__(self):
+        self.built_at: Optional[datetime] = None
+        self._keys: List[Tuple[str, int]] = []
+        self._by_conference: Dict[int, List[str]] = {}
+        # conference id -> (name, acronym, series)
+        self._labels: Dict[int, Tuple[str, Optional[str], Optional[str]]] = {}
+        self._interests: Dict[int, int] = {}
+        # prefix -> top MAX_SUGGESTIONS conference ids, for prefixes with large ranges
+        self._top: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def remove(self, conference_id: int):
+        for key in self._by_conference.pop(conference_id, []):
+            i = bisect_left(self._keys, (key, conference_id))
+            if i < len(self._keys) and self._keys[i] == (key, conference_id):
+                del self._keys[i]
+        self._labels.pop(conference_id, None)
+        self._interests.pop(conference_id, None)
+        self._top.clear()
+
+    def update(self, conference_id: int, name: str, acronym: Optional[str], series: Optional[str], interests: int = 0):
+        self.remove(conference_id)
+        keys = _keys(name, acronym, series)
+        for key in keys:
+            insort(self._keys, (key, conference_id))
+        self._by_conference[conference_id] = keys
+        self._labels[conference_id] = (name, acronym, series)
+        self._interests[conference_id] = interests
+        self._top.clear()
+
+    @classmethod
+    def build(cls, rows) -> "SuggestIndex":
+        """Index (id, name, acronym, series, interests) rows with one sort instead of an insort per key."""
+        index = cls()
+        for conference_id, name, acronym, series, interests in rows:
+            keys = _keys(name, acronym, series)
+            index._keys.extend((key, conference_id) for key in keys)
+            index._by_conference[conference_id] = keys
+            index._labels[conference_id] = (name, acronym, series)
+            index._interests[conference_id] = interests or 0
+        index._keys.sort()
+        return index
+
+    def set_interests(self, conference_id: int, interests: int):
+        if conference_id in self._labels and self._interests.get(conference_id) != interests:
+            self._interests[conference_id] = interests
+            self._top.clear()
+
+    def _rank(self, lo: int, hi: int, limit: int) -> List[int]:
+        matches = {conference_id for _, conference_id in self._keys[lo:hi]}
+        return heapq.nsmallest(limit, matches, key=lambda c: (-self._interests.get(c, 0), self._labels[c][0]))
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[dict]:
+        query = " ".join(fold(prefix))
+        if not query:
+            return []
+        limit = min(limit, MAX_SUGGESTIONS)
+        lo = bisect_left(self._keys, (query, -1))
+        hi = bisect_left(self._keys, (query + _KEY_END, -1), lo)
+        if hi - lo < SUGGEST_MEMO_MIN_KEYS:
+            ranked = self._rank(lo, hi, limit)
+        else:
+            top = self._top.get(query)
+            if top is None:
+                if len(self._top) >= _MEMO_MAX_PREFIXES:
+                    self._top.clear()
+                top = self._top[query] = self._rank(lo, hi, MAX_SUGGESTIONS)
+            ranked = top[:limit]
+        return [
+            {
+                "conference_id": conference_id,
+                "name": self._labels[conference_id][0],
+                "acronym": self._labels[conference_id][1],
+                "series": self._labels[conference_id][2],
+                "total_interests": self._interests.get(conference_id, 0),
+            }
+            for conference_id in ranked
+        ]
+
+
+_index = SuggestIndex()
+
+
+def _rows_query():
+    vanished = select(ExternalEvent.conference_id).where(ExternalEvent.vanished_at.isnot(None))
+    interests = (
+        select(Interest.conference_id, func.count(Interest.id).label("total"))
+        .group_by(Interest.conference_id)
+        .subquery()
+    )
+    return (
+        select(Conference.id, Conference.name, Conference.acronym, Conference.series, interests.c.total)
+        .outerjoin(interests, interests.c.conference_id == Conference.id)
+        .where(Conference.id.notin_(vanished))
+    )
+
+
+async def rebuild():
+    global _index
+    async with async_session() as db:
+        rows = (await db.execute(_rows_query())).all()
+    index = SuggestIndex.build(rows)
+    index.built_at = datetime.utcnow()
+    _index = index
+
+
+async def load_suggest_index() -> SuggestIndex:
+    if _index.built_at is None:
+        await rebuild()
+    return _index
+
+
+async def _on_conference_changed(data: dict):
+    if _index.built_at is None:
+        return
+    conference_id = data.get("conference_id")
+    if conference_id is None:
+        # Feed ingestion: any number of events may have been added, renamed or vanished
+        await rebuild()
+        return
+    async with async_session() as db:
+        row = (await db.execute(_rows_query().where(Conference.id == conference_id))).first()
+    if row is None:
+        _index.remove(conference_id)
+    else:
+        _index.update(row[0], row[1], row[2], row[3], row[4] or 0)
+
+
+async def _on_interest_changed(data: dict):
+    conference_id = data.get("conference_id")
+    if _index.built_at is None or conference_id is None:
+        return
+    async with async_session() as db:
+        total = (await db.execute(
+            select(func.count(Interest.id)).where(Interest.conference_id == conference_id)
+        )).scalar()
+    _index.set_interests(conference_id, total or 0)
+
+
+bus.subscribe("conference.changed", _on_conference_changed)
+bus.subscribe("interest.changed", _on_interest_changed)
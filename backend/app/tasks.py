@@ -0,0 +1,146 @@
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import insert, literal, select
+from sqlalchemy.exc import IntegrityError
+
+from .db import async_session
+from .jobs import PermanentJobError, enqueue, job_handler
+from .models import Conference, GoogleCalendarEvent, Notification, User
+from .google_calendar import create_calendar_event
+from .google_sync import run_sync_job
+from . import ingestion, trending
+
+
+async def _notify_all_users(except_user_id: int, title: str, content: str, conference_id: int) -> int:
+    # One INSERT ... SELECT instead of a row per user through the ORM
+    async with async_session() as db:
+        result = await db.execute(
+            insert(Notification).from_select(
+                ["user_id", "title", "content", "conference_id", "is_read", "created_at"],
+                select(
+                    User.id,
+                    literal(title),
+                    literal(content),
+                    literal(conference_id),
+                    literal(False),
+                    literal(datetime.utcnow()),
+                ).where(User.id != except_user_id),
+            )
+        )
+        await db.commit()
+        return result.rowcount
+
+
+@job_handler("notify.new_conference")
+async def notify_new_conference(payload: dict):
+    async with async_session() as db:
+        conf = await db.get(Conference, payload["conference_id"])
+    if conf is None:
+        return {"notified": 0}
+    notified = await _notify_all_users(
+        conf.organizer_id,
+        "New Conference Posted!",
+        f"'{conf.name}' has just been added. Check it out!",
+        conf.id,
+    )
+    return {"notified": notified}
+
+
+@job_handler("notify.new_paper")
+async def notify_new_paper(payload: dict):
+    async with async_session() as db:
+        conf = await db.get(Conference, payload["conference_id"])
+    if conf is None:
+        return {"notified": 0}
+    notified = await _notify_all_users(
+        conf.organizer_id,
+        "New Research Paper Added",
+        f"A new paper '{payload['title']}' has been added to '{conf.name}'.",
+        conf.id,
+    )
+    return {"notified": notified}
+
+
+@job_handler("google.add_event")
+async def add_google_calendar_event(payload: dict):
+    user_id, conference_id = payload["user_id"], payload["conference_id"]
+    async with async_session() as db:
+        result = await db.execute(
+            select(GoogleCalendarEvent).where(
+                GoogleCalendarEvent.user_id == user_id,
+                GoogleCalendarEvent.conference_id == conference_id,
+            )
+        )
+        existing = result.scalar_one_or_none()
+        if existing:
+            # A retry after the event was already recorded
+            return {"event_link": existing.html_link}
+        user = await db.get(User, user_id)
+        conf = await db.get(Conference, conference_id)
+
+    if user is None or conf is None or not user.google_refresh_token:
+        raise PermanentJobError("Conference gone or Google Calendar disconnected")
+
+    try:
+        event = await create_calendar_event(
+            refresh_token=user.google_refresh_token,
+            summary=conf.name,
+            description=(conf.description or "") + f"\nWebsite: {conf.website or ''}",
+            location=conf.location,
+            start_date=conf.start_date,
+            end_date=conf.end_date,
+        )
+    except HTTPException as e:
+        if e.status_code < 500:
+            # Revoked or invalid credentials; the user has to reconnect
+            raise PermanentJobError(e.detail)
+        raise
+    async with async_session() as db:
+        db.add(GoogleCalendarEvent(
+            user_id=user_id,
+            conference_id=conference_id,
+            event_id=event.get("id", ""),
+            html_link=event.get("htmlLink"),
+        ))
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Recorded concurrently by an interest sync
+            await db.rollback()
+    return {"event_link": event.get("htmlLink")}
+
+
+@job_handler("google.sync_interests")
+async def sync_google_interests(payload: dict):
+    # Progress and failures are tracked on the GoogleSyncJob row the client polls
+    await run_sync_job(payload["sync_job_id"])
+
+
+@job_handler("ingest.external_events")
+async def ingest_external_events(payload: dict):
+    stats = await ingestion.ingest_external_events()
+    return {"sources": stats}
+
+
+@job_handler("trending.prune")
+async def prune_trending_activity(payload: dict):
+    async with async_session() as db:
+        return {"deleted": await trending.prune_activity(db)}
+
+
+async def schedule_recurring_jobs():
+    """Book the recurring jobs; dedupe keys keep one of each however many workers call this."""
+    await enqueue(
+        "ingest.external_events",
+        dedupe_key="ingest.external_events",
+        repeat_seconds=ingestion.INGEST_INTERVAL_SECONDS,
+        # The next scheduled run is the retry
+        max_attempts=1,
+    )
+    await enqueue(
+        "trending.prune",
+        dedupe_key="trending.prune",
+        repeat_seconds=6 * 3600,
+        max_attempts=1,
+    )
@@ -0,0 +1,63 @@
+import re
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Conference, ConferenceTopic, Topic
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_topic(name: str) -> str:
+    return _WHITESPACE_RE.sub(" ", name).strip().casefold()
+
+
+def split_topics(text: Optional[str]) -> Dict[str, str]:
+    """Split the free-text `topics` column into {normalized key: display name}."""
+    if not text:
+        return {}
+    topics = {}
+    for part in text.split(","):
+        name = _WHITESPACE_RE.sub(" ", part).strip()
+        if name:
+            topics.setdefault(name.casefold(), name)
+    return topics
+
+
+async def get_or_create_topics(db: AsyncSession, topics: Dict[str, str]) -> List[Topic]:
+    if not topics:
+        return []
+    result = await db.execute(select(Topic).where(Topic.key.in_(list(topics))))
+    existing = {t.key: t for t in result.scalars().all()}
+    for key, name in topics.items():
+        if key not in existing:
+            topic = Topic(key=key, name=name)
+            db.add(topic)
+            existing[key] = topic
+    await db.flush()
+    return [existing[key] for key in topics]
+
+
+async def sync_conference_topics(db: AsyncSession, conference_id: int, text: Optional[str]):
+    """Replace the conference's topic links with the ones parsed from `text`. Caller commits."""
+    topics = await get_or_create_topics(db, split_topics(text))
+    await db.execute(delete(ConferenceTopic).where(ConferenceTopic.conference_id == conference_id))
+    for topic in topics:
+        db.add(ConferenceTopic(conference_id=conference_id, topic_id=topic.id))
+
+
+async def backfill_topics(db: AsyncSession):
+    """Index conferences that have topic text but no links yet (rows created before the index existed)."""
+    linked = select(ConferenceTopic.conference_id)
+    result = await db.execute(
+        select(Conference.id, Conference.topics).where(
+            Conference.topics.isnot(None),
+            Conference.id.notin_(linked),
+        )
+    )
+    rows = result.all()
+    for conference_id, text in rows:
+        await sync_conference_topics(db, conference_id, text)
+    if rows:
+        await db.commit()
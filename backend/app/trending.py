@@ -0,0 +1,130 @@
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .cache import Cache
+from .db import engine
+from .models import ConferenceActivity, Interest, Rating
+
+# window -> (span, half-life); activity one half-life old counts half as much as activity now
+WINDOWS: Dict[str, Tuple[timedelta, timedelta]] = {
+    "24h": (timedelta(hours=24), timedelta(hours=6)),
+    "7d": (timedelta(days=7), timedelta(days=1)),
+}
+TRENDING_TOP_K = int(os.getenv("TRENDING_TOP_K", "50"))
+# The ranking is recomputed at most this often per window rather than on every write
+TRENDING_CACHE_SECONDS = float(os.getenv("TRENDING_CACHE_SECONDS", "60"))
+# Buckets older than the longest window are never read again
+RETENTION = max(span for span, _ in WINDOWS.values()) + timedelta(hours=1)
+INTEREST_WEIGHT = 1.0
+RATING_WEIGHT = 0.5
+
+trending_cache = Cache("trending", TRENDING_CACHE_SECONDS)
+
+
+def bucket_start(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def _insert():
+    return postgresql.insert if engine.dialect.name == "postgresql" else sqlite.insert
+
+
+async def record_activity(db: AsyncSession, conference_id: int, interests: int = 0, ratings: int = 0):
+    """Add to the conference's current hourly bucket, in the caller's transaction."""
+    stmt = _insert()(ConferenceActivity).values(
+        conference_id=conference_id,
+        bucket_start=bucket_start(datetime.utcnow()),
+        interests=interests,
+        ratings=ratings,
+    )
+    # Atomic increment; concurrent writers to the same bucket cannot lose counts
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["conference_id", "bucket_start"],
+        set_={
+            "interests": ConferenceActivity.interests + stmt.excluded.interests,
+            "ratings": ConferenceActivity.ratings + stmt.excluded.ratings,
+        },
+    )
+    await db.execute(stmt)
+
+
+async def compute_trending(db: AsyncSession, window: str) -> List[Tuple[int, float]]:
+    """
+    Top (conference_id, score) pairs for the window. Only buckets inside the
+    window are read, so the cost follows recent activity, not total history.
+    """
+    import numpy as np
+
+    span, half_life = WINDOWS[window]
+    now = datetime.utcnow()
+    result = await db.execute(
+        select(
+            ConferenceActivity.conference_id,
+            ConferenceActivity.bucket_start,
+            ConferenceActivity.interests,
+            ConferenceActivity.ratings,
+        ).where(ConferenceActivity.bucket_start >= bucket_start(now - span))
+    )
+    rows = result.all()
+    if not rows:
+        return []
+
+    n = len(rows)
+    conference_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=n)
+    age_seconds = np.fromiter(((now - r[1]).total_seconds() for r in rows), dtype=np.float64, count=n)
+    counts = np.array([(r[2], r[3]) for r in rows], dtype=np.float64)
+
+    decay = np.exp2(-age_seconds / half_life.total_seconds())
+    weights = (counts @ np.array([INTEREST_WEIGHT, RATING_WEIGHT])) * decay
+    conferences, index = np.unique(conference_ids, return_inverse=True)
+    scores = np.bincount(index, weights=weights)
+
+    k = min(TRENDING_TOP_K, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return [(int(conferences[i]), round(float(scores[i]), 4)) for i in top if scores[i] > 0]
+
+
+async def load_trending(db: AsyncSession, window: str) -> List[Tuple[int, float]]:
+    return await trending_cache.get_or_set(window, lambda: compute_trending(db, window))
+
+
+async def prune_activity(db: AsyncSession, now: Optional[datetime] = None) -> int:
+    cutoff = bucket_start((now or datetime.utcnow()) - RETENTION)
+    result = await db.execute(delete(ConferenceActivity).where(ConferenceActivity.bucket_start < cutoff))
+    await db.commit()
+    return result.rowcount
+
+
+async def backfill_activity(db: AsyncSession):
+    """Rebuild the buckets still inside RETENTION from interest/rating timestamps."""
+    since = datetime.utcnow() - RETENTION
+    buckets: Dict[Tuple[int, datetime], Counter] = {}
+    for model, field in ((Interest, "interests"), (Rating, "ratings")):
+        result = await db.execute(
+            select(model.conference_id, model.created_at).where(model.created_at >= since)
+        )
+        for conference_id, created_at in result.all():
+            buckets.setdefault((conference_id, bucket_start(created_at)), Counter())[field] += 1
+
+    await db.execute(delete(ConferenceActivity))
+    if buckets:
+        await db.execute(
+            insert(ConferenceActivity),
+            [
+                {
+                    "conference_id": conference_id,
+                    "bucket_start": start,
+                    "interests": counts["interests"],
+                    "ratings": counts["ratings"],
+                }
+                for (conference_id, start), counts in buckets.items()
+            ],
+        )
+    await db.commit()
@@ -0,0 +1,68 @@
+import os
+import time
+from datetime import datetime
+from typing import Optional
+
+from .db import async_session
+from .routers.conferences import list_conferences, load_facets, load_catalog_calendar
+from . import geo, leaderboard, suggest
+
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+
+
+class Readiness:
+    """Per-worker boot state reported by /health/ready."""
+
+    def __init__(self):
+        self.schema_version: Optional[int] = None
+        self.warmed = False
+        self.warmup_ms: Optional[float] = None
+        self.ready_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_at is not None
+
+    def as_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "schema_version": self.schema_version,
+            "warmed": self.warmed,
+            "warmup_ms": self.warmup_ms,
+            "ready_at": self.ready_at,
+            "error": self.error,
+        }
+
+
+readiness = Readiness()
+
+
+async def warm_caches():
+    """
+    Fill the catalog caches (facets, full ICS feed), build the top-rated
+    leaderboard, typeahead and nearby indexes, and run the list query once,
+    so the first real requests skip query compilation, pool connects and renders.
+    """
+    await leaderboard.rebuild()
+    await suggest.rebuild()
+    await geo.rebuild()
+    async with async_session() as db:
+        await load_facets(db)
+        await load_catalog_calendar(db)
+        await list_conferences(publisher=None, min_rating=None, topic=None, db=db, current_user=None)
+
+
+async def warm_up():
+    """Background boot step: warm caches (best effort), then report this worker ready."""
+    if WARMUP_ON_STARTUP:
+        started = time.perf_counter()
+        try:
+            await warm_caches()
+            readiness.warmed = True
+        except Exception as e:
+            # A cold cache is slower, not broken; still become ready
+            readiness.error = f"warm-up failed: {e}"
+            print(f"Error warming caches: {e}")
+        readiness.warmup_ms = round((time.perf_counter() - started) * 1000, 1)
+    readiness.ready_at = datetime.utcnow()
@@ -0,0 +1,25 @@
+"""
+Standalone job worker, for deployments that keep jobs out of the web processes:
+
+    JOBS_IN_PROCESS=false gunicorn ...   # web
+    python -m app.worker                 # jobs
+"""
+import asyncio
+
+from .db import engine
+from .migrations import run_migrations
+from .cache import bus
+from . import jobs, tasks
+
+
+async def main():
+    await run_migrations(engine)
+    await tasks.schedule_recurring_jobs()
+    try:
+        await jobs.run_worker()
+    finally:
+        await bus.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
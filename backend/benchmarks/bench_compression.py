@@ -0,0 +1,94 @@
+"""
+Response compression benchmark for the GET /conferences payload.
+
+Builds a synthetic ConferenceRead list (descriptions and papers included) and,
+for each encoder and level, reports compressed size, CPU time per request and
+an estimated end-to-end time (CPU + transfer) at the given bandwidth. Pick the
+level with the lowest total for COMPRESSION_*_LEVEL / COMPRESSION_BROTLI_QUALITY.
+
+Usage (from backend/):
+    python -m benchmarks.bench_compression [conferences] [bandwidth_mbit]
+"""
+import sys
+import os
+import gzip
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.compression import brotli, zstandard
+from app.schemas import ConferenceRead
+
+ROUNDS = 5
+WORDS = (
+    "machine learning systems distributed computing graph neural networks reproducibility "
+    "benchmark dataset optimization compilers security privacy human-computer interaction"
+).split()
+
+
+def synthetic_payload(count: int) -> bytes:
+    conferences = []
+    for i in range(count):
+        text = " ".join(WORDS[(i + j) % len(WORDS)] for j in range(80))
+        conferences.append(ConferenceRead(
+            id=i,
+            name=f"International Conference on Topic {i}",
+            acronym=f"ICT{i % 100}",
+            publisher=["IEEE", "ACM", "Springer"][i % 3],
+            location=f"City {i % 200}, Country {i % 40}",
+            start_date=date(2026, 1, 1) + timedelta(days=i % 365),
+            end_date=date(2026, 1, 3) + timedelta(days=i % 365),
+            topics="machine learning, systems, security",
+            description=text,
+            website=f"https://conf{i}.example.org",
+            organizer_name=f"Organizer {i % 50}",
+            avg_rating=3.5,
+            total_ratings=i % 30,
+            total_interests=i % 70,
+            papers=[
+                {"id": i * 10 + p, "conference_id": i, "title": f"Paper {p} on {WORDS[p % len(WORDS)]}",
+                 "url": f"https://papers.example.org/{i}/{p}", "created_at": datetime(2026, 1, 1)}
+                for p in range(3)
+            ],
+            created_at=datetime(2026, 1, 1),
+        ))
+    return ("[" + ",".join(c.json() for c in conferences) + "]").encode()
+
+
+def encoders():
+    for level in (1, 4, 6, 9):
+        yield f"gzip -{level}", lambda data, level=level: gzip.compress(data, compresslevel=level, mtime=0)
+    if brotli is not None:
+        for quality in (1, 4, 6, 11):
+            yield f"br q{quality}", lambda data, q=quality: brotli.compress(data, quality=q)
+    if zstandard is not None:
+        for level in (1, 3, 9, 19):
+            yield f"zstd -{level}", lambda data, level=level: zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    bandwidth_mbit = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+    body = synthetic_payload(count)
+    bytes_per_second = bandwidth_mbit * 1_000_000 / 8
+
+    print(f"Payload: {count} conferences, {len(body) / 1024:.0f} KiB, bandwidth {bandwidth_mbit} Mbit/s")
+    print(f"{'encoder':<10} {'bytes':>10} {'ratio':>7} {'cpu ms':>8} {'xfer ms':>8} {'total ms':>9}")
+    identity_ms = len(body) / bytes_per_second * 1000
+    print(f"{'identity':<10} {len(body):>10} {1.0:>7.2f} {0.0:>8.1f} {identity_ms:>8.1f} {identity_ms:>9.1f}")
+
+    for label, encode in encoders():
+        started = time.process_time()
+        for _ in range(ROUNDS):
+            compressed = encode(body)
+        cpu_ms = (time.process_time() - started) / ROUNDS * 1000
+        transfer_ms = len(compressed) / bytes_per_second * 1000
+        print(
+            f"{label:<10} {len(compressed):>10} {len(body) / len(compressed):>7.2f} "
+            f"{cpu_ms:>8.1f} {transfer_ms:>8.1f} {cpu_ms + transfer_ms:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
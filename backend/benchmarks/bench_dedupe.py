@@ -0,0 +1,84 @@
+"""
+Near-duplicate lookup benchmark for ingestion.
+
+Compares scoring an incoming event name against every catalog entry
+(pairwise trigram Jaccard) with the inverted trigram index in app.dedupe,
+which only scores entries sharing a trigram with the query. Reports ms per
+1,000 lookups and checks both find the same matches.
+
+Usage (from backend/):
+    python -m benchmarks.bench_dedupe [catalog_size]
+"""
+import sys
+import os
+import random
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.dedupe import DEDUPE_NAME_THRESHOLD, DuplicateIndex, normalize_name, trigrams
+
+QUERIES = 1000
+WORDS = (
+    "machine learning vision language robotics systems data mining security networks databases "
+    "graphics theory quantum biology health software engineering web search retrieval privacy "
+    "distributed computing hardware architecture optimization statistics signal processing"
+).split()
+
+
+def catalog(size: int):
+    rng = random.Random(3)
+    rows = []
+    for i in range(size):
+        year = rng.choice([2025, 2026, 2027])
+        # Real names carry a series acronym or place that sets them apart
+        tag = "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.randint(3, 5)))
+        name = f"{tag} " + " ".join(rng.sample(WORDS, 3)).title() + f" Conference {year}"
+        rows.append((i, name, date(year, 1, 1) + timedelta(days=rng.randrange(360))))
+    return rows
+
+
+def pairwise(prepared, name):
+    query = trigrams(normalize_name(name))
+    best = None
+    for conference_id, grams in prepared:
+        similarity = len(query & grams) / len(query | grams)
+        if similarity >= DEDUPE_NAME_THRESHOLD and (best is None or similarity > best[1]):
+            best = (conference_id, similarity)
+    return best[0] if best else None
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rows = catalog(size)
+    rng = random.Random(5)
+    # Half the queries are re-listings of catalog entries, half are new events
+    queries = [rng.choice(rows)[1].replace("Conference", "Intl. Conf.") for _ in range(QUERIES // 2)]
+    queries += ["NEW " + " ".join(rng.sample(WORDS, 4)).title() + " Summit 2026" for _ in range(QUERIES // 2)]
+
+    started = time.perf_counter()
+    index = DuplicateIndex()
+    for conference_id, name, start in rows:
+        index.add(conference_id, name, start_date=start)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"Catalog of {size}, {QUERIES} lookups (index built in {build_ms:.0f} ms)")
+
+    sample = queries[:50]
+    prepared = [(conference_id, trigrams(normalize_name(name))) for conference_id, name, _ in rows]
+    started = time.perf_counter()
+    expected = [pairwise(prepared, q) for q in sample]
+    pairwise_ms = (time.perf_counter() - started) / len(sample) * QUERIES * 1000
+    print(f"{'pairwise':<10} {pairwise_ms:10.1f} ms / 1,000 lookups (extrapolated from {len(sample)})")
+
+    started = time.perf_counter()
+    found = [index.similar(q) for q in queries]
+    indexed_ms = (time.perf_counter() - started) * 1000
+    print(f"{'indexed':<10} {indexed_ms:10.1f} ms / 1,000 lookups")
+
+    agree = sum((m[0].conference_id if m else None) == e for m, e in zip(found, expected))
+    print(f"agreement with pairwise on the sample: {agree}/{len(sample)}")
+
+
+if __name__ == "__main__":
+    main()
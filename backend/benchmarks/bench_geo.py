@@ -0,0 +1,58 @@
+"""
+Nearby-search benchmark for GET /conferences/nearby.
+
+Places a synthetic catalog at gazetteer cities and times radius queries on
+the grid index against measuring every conference, plus geocoding one
+location string. Reports microseconds per op.
+
+Usage (from backend/):
+    python -m benchmarks.bench_geo [conferences]
+"""
+import sys
+import os
+import random
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.geo import GeoIndex, _gazetteer, geocode, haversine_km
+
+ROUNDS = 500
+
+
+def measure(label: str, func):
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    us = (time.perf_counter() - started) / ROUNDS * 1_000_000
+    print(f"{label:<34} {us:10.1f} us / op")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rng = random.Random(7)
+    cities = [(lat, lon) for entries in _gazetteer().values() for _, lat, lon in entries]
+    points = {}
+    for i in range(count):
+        lat, lon = rng.choice(cities)
+        points[i] = (lat + rng.uniform(-0.2, 0.2), lon + rng.uniform(-0.2, 0.2))
+    index = GeoIndex()
+    for conference_id, (lat, lon) in points.items():
+        index.update(conference_id, lat, lon)
+
+    def full_scan(lat, lon, radius_km):
+        found = sorted(
+            (haversine_km(lat, lon, plat, plon), conference_id)
+            for conference_id, (plat, plon) in points.items()
+        )
+        return [(conference_id, d) for d, conference_id in found if d <= radius_km][:20]
+
+    berlin = (52.52, 13.405)
+    measure("grid nearby(Berlin, 100 km)", lambda: index.nearby(*berlin, 100, 20))
+    measure("grid nearby(Berlin, 1000 km)", lambda: index.nearby(*berlin, 1000, 20))
+    measure("full scan (Berlin, 100 km)", lambda: full_scan(*berlin, 100))
+    measure("geocode('Cambridge, MA, USA')", lambda: geocode("Cambridge, MA, USA"))
+
+
+if __name__ == "__main__":
+    main()
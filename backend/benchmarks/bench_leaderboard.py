@@ -0,0 +1,61 @@
+"""
+Leaderboard benchmark for GET /conferences/top.
+
+Compares the previous approach (average every conference's ratings, then sort
+in Python) against the in-memory Bayesian leaderboard: one incremental update
+after a rating write, and serving a 20-entry page. Reports microseconds per op.
+
+Usage (from backend/):
+    python -m benchmarks.bench_leaderboard [conferences]
+"""
+import sys
+import os
+import random
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.leaderboard import Leaderboard
+
+ROUNDS = 1000
+
+
+def stats(count: int):
+    rng = random.Random(7)
+    rows = []
+    for i in range(count):
+        n = rng.randint(1, 40)
+        rows.append((i, f"Conference {i}", sum(rng.randint(1, 5) for _ in range(n)), n))
+    return rows
+
+
+def sort_averages(rows):
+    return sorted(rows, key=lambda r: r[2] / r[3], reverse=True)[:20]
+
+
+def measure(label: str, func, rounds: int = ROUNDS):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    us = (time.perf_counter() - started) / rounds * 1_000_000
+    print(f"{label:<28} {us:10.1f} us / op")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rows = stats(count)
+    board = Leaderboard()
+    for conference_id, name, total, n in rows:
+        board.update(conference_id, name, total, n)
+
+    rng = random.Random(11)
+    print(f"{count} rated conferences")
+    measure("sort all averages", lambda: sort_averages(rows), rounds=50)
+    measure("update one conference", lambda: board.update(
+        rng.randrange(count), "Conference", rng.randint(5, 200), rng.randint(1, 40)))
+    measure("page (offset 0, limit 20)", lambda: board.page(0, 20))
+    measure("page (offset 5000, limit 20)", lambda: board.page(min(5000, count - 20), 20))
+
+
+if __name__ == "__main__":
+    main()
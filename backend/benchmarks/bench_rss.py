@@ -0,0 +1,74 @@
+"""
+Micro-benchmark for the dev.events RSS parser.
+
+Compares the streaming FeedParser against the previous whole-document
+ET.fromstring approach on a synthetic feed.
+
+Usage (from backend/):
+    python -m benchmarks.bench_rss [items]
+"""
+import sys
+import os
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.dev_events import parse_feed, _normalize_item
+
+CHUNK_SIZE = 64 * 1024
+DATES = ["September 24, 2026", "Sep 24-25 2026", "Sep 30 - Oct 2, 2026", "Dec 30, 2026 - Jan 2, 2027"]
+
+
+def synthetic_feed(items: int) -> bytes:
+    parts = ['<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>dev.events</title>']
+    for i in range(items):
+        parts.append(
+            "<item>"
+            f"<title>Conference {i}</title>"
+            f"<link>https://dev.events/conferences/conference-{i}</link>"
+            f"<description>Conference {i} is happening on {DATES[i % len(DATES)]}, City {i % 300}, Country. "
+            f"More information: https://dev.events/conferences/conference-{i}</description>"
+            "<pubDate>Mon, 01 Jan 2026 00:00:00 GMT</pubDate>"
+            "<category>conference</category>"
+            "</item>"
+        )
+    parts.append("</channel></rss>")
+    return "".join(parts).encode()
+
+
+def parse_whole_document(body: bytes) -> list:
+    root = ET.fromstring(body)
+    return [
+        _normalize_item({child.tag: child.text for child in item})
+        for item in root.findall(".//item")
+    ]
+
+
+def parse_streaming(body: bytes) -> list:
+    chunks = (body[i:i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE))
+    return list(parse_feed(chunks))
+
+
+def measure(label: str, func, body: bytes):
+    tracemalloc.start()
+    started = time.perf_counter()
+    items = func(body)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<16} {len(items):>7} items  {elapsed * 1000:8.1f} ms  peak {peak / 1024 / 1024:6.1f} MiB")
+
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    body = synthetic_feed(items)
+    print(f"Synthetic feed: {items} items, {len(body) / 1024 / 1024:.1f} MiB")
+    # Peak memory includes the parsed result list in both cases
+    measure("whole-document", parse_whole_document, body)
+    measure("streaming", parse_streaming, body)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Serialization benchmark for conference list responses.
+
+Compares the validated path (ConferenceRead(**fields), then FastAPI's
+response_model validation + jsonable_encoder + stdlib json) against the trusted
+fast path (ConferenceRead.construct + orjson) used by the hot list endpoints.
+Reports CPU ms per 1,000 conferences.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization [conferences]
+"""
+import sys
+import os
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.schemas import ConferenceRead, PaperRead
+from app.serialization import FastJSONResponse
+
+ROUNDS = 5
+
+
+def conference_fields(count: int) -> List[dict]:
+    rows = []
+    for i in range(count):
+        rows.append(dict(
+            id=i,
+            organizer_id=i % 50,
+            organizer_name=f"Organizer {i % 50}",
+            name=f"International Conference on Topic {i}",
+            acronym=f"ICT{i % 100}",
+            publisher=["IEEE", "ACM", "Springer"][i % 3],
+            location=f"City {i % 200}",
+            start_date=date(2026, 1, 1) + timedelta(days=i % 365),
+            end_date=date(2026, 1, 3) + timedelta(days=i % 365),
+            topics="machine learning, systems",
+            description="A conference about things. " * 20,
+            website=f"https://conf{i}.example.org",
+            colocated_with=None,
+            avg_rating=3.5,
+            rating=3.5,
+            total_ratings=i % 30,
+            total_interests=i % 70,
+            papers=[
+                dict(id=i * 10 + p, conference_id=i, title=f"Paper {p}",
+                     url=f"https://papers.example.org/{i}/{p}", created_at=datetime(2026, 1, 1))
+                for p in range(3)
+            ],
+            created_at=datetime(2026, 1, 1),
+            source="sciflow",
+            is_external=False,
+        ))
+    return rows
+
+
+def validated(rows: List[dict], field) -> bytes:
+    models = [
+        ConferenceRead(**{**row, "papers": [PaperRead(**p) for p in row["papers"]]})
+        for row in rows
+    ]
+    content = asyncio.get_event_loop().run_until_complete(
+        serialize_response(field=field, response_content=models)
+    )
+    return JSONResponse(content).body
+
+
+def trusted(rows: List[dict], field=None) -> bytes:
+    models = [
+        ConferenceRead.construct(**{**row, "papers": [PaperRead.construct(**p) for p in row["papers"]]})
+        for row in rows
+    ]
+    return FastJSONResponse(models).body
+
+
+def measure(label: str, func, rows: List[dict], field) -> bytes:
+    started = time.process_time()
+    for _ in range(ROUNDS):
+        body = func(rows, field)
+    cpu_ms = (time.process_time() - started) / ROUNDS * 1000
+    per_thousand = cpu_ms / len(rows) * 1000
+    print(f"{label:<10} {cpu_ms:9.1f} ms total  {per_thousand:8.1f} ms / 1,000 conferences  {len(body) / 1024:8.0f} KiB")
+    return body
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rows = conference_fields(count)
+    field = create_response_field(name="response", type_=List[ConferenceRead])
+    print(f"Serializing {count} conferences, averaged over {ROUNDS} rounds")
+    measure("validated", validated, rows, field)
+    measure("trusted", trusted, rows, field)
+
+
+if __name__ == "__main__":
+    main()
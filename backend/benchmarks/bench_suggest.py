@@ -0,0 +1,61 @@
+"""
+Typeahead benchmark for GET /conferences/suggest.
+
+Builds the in-memory prefix index over a synthetic catalog and times
+suggestion lookups for short and longer prefixes, plus one incremental
+update (a conference renamed). Reports microseconds per op.
+
+Usage (from backend/):
+    python -m benchmarks.bench_suggest [conferences]
+"""
+import sys
+import os
+import random
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.suggest import SuggestIndex
+
+ROUNDS = 2000
+WORDS = (
+    "machine learning vision language robotics systems data mining security networks databases "
+    "graphics theory quantum biology health software engineering web search retrieval privacy"
+).split()
+
+
+def measure(label: str, func):
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    us = (time.perf_counter() - started) / ROUNDS * 1_000_000
+    print(f"{label:<30} {us:10.1f} us / op")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rng = random.Random(3)
+    rows = []
+    for i in range(count):
+        name = "International Conference on " + " ".join(rng.sample(WORDS, 2)).title() + f" {2025 + i % 3}"
+        acronym = "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(4))
+        rows.append((i, name, acronym, None, rng.randint(0, 500)))
+    started = time.perf_counter()
+    index = SuggestIndex.build(rows)
+    print(f"{count} conferences indexed in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def cold(prefix):
+        # Ranking a short prefix in full, as after an interest change
+        index._top.clear()
+        index.suggest(prefix)
+
+    measure("suggest('m') (cold)", lambda: cold("m"))
+    measure("suggest('m')", lambda: index.suggest("m"))
+    measure("suggest('machine lea')", lambda: index.suggest("machine lea"))
+    measure("suggest('qzx') (no match)", lambda: index.suggest("qzx"))
+    measure("update (rename one)", lambda: index.update(
+        rng.randrange(count), "Renamed " + rng.choice(WORDS), "RNM", "Series", 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Cold-start import budget check for the API workers.
+
+Imports app.main in fresh interpreters with `python -X importtime` and fails
+(exit status 1) when the cumulative import time exceeds the budget, or when a
+heavy integration that should load lazily on first use is imported at boot.
+Meant to be run in CI next to the other benchmarks.
+
+Usage (from backend/):
+    python -m benchmarks.check_import_time [budget_ms]
+"""
+import sys
+import os
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 3
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+
+# Top-level packages that must only be imported on first use
+LAZY_MODULES = {
+    "numpy",
+    "scipy",
+    "PIL",
+    "google_auth_oauthlib",
+    "googleapiclient",
+    "google.auth",
+    "requests",
+}
+
+
+def import_profile():
+    """Return ({module: cumulative_us}, total_us for app.main) from one cold import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        sys.exit(1)
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules, modules.get("app.main", 0)
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+
+    totals = []
+    for _ in range(RUNS):
+        modules, total_us = import_profile()
+        totals.append(total_us / 1000)
+    best_ms = min(totals)
+
+    eager = sorted(
+        lazy for lazy in LAZY_MODULES
+        if any(name == lazy or name.startswith(lazy + ".") for name in modules)
+    )
+
+    slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[1:11]
+    print(f"import app.main: best {best_ms:.0f} ms of {RUNS} runs (budget {budget_ms:.0f} ms)")
+    for name, cumulative in slowest:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if best_ms > budget_ms:
+        print(f"FAIL: cold import exceeds budget by {best_ms - budget_ms:.0f} ms")
+        failed = True
+    if eager:
+        print(f"FAIL: imported at startup but should be lazy: {', '.join(eager)}")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,9 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app.db import async_session
 from app.models import User, Conference, UserRole
+from app.dedupe import build_index
+from app.geo import set_coordinates
+from app.topics import sync_conference_topics
 from sqlalchemy.future import select
 
 # Real-world conference data (approximate dates/locations for future events)
@@ -237,11 +240,11 @@ CONFERENCES_DATA = [
 async def seed_data():
     print("Starting database population...")
     
-    # Create tables if they don't exist
-    from app.db import engine, Base
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-        
+    # Same schema path as app startup, so the app finds the database at the current version
+    from app.db import engine
+    from app.migrations import run_migrations
+    await run_migrations(engine)
+
     async with async_session() as session:
         async with session.begin():
             # 1. Get or Create an Organizer User
@@ -265,13 +268,10 @@ async def seed_data():
 
             # 2. Insert Conferences
             count = 0
+            # Same canonical website or a near-identical name counts as already present
+            index = await build_index(session)
             for conf_data in CONFERENCES_DATA:
-                # Check if conference with same name exists to avoid duplicates
-                stmt = select(Conference).where(Conference.name == conf_data["name"])
-                result = await session.execute(stmt)
-                existing_conf = result.scalars().first()
-
-                if existing_conf:
+                if index.find(conf_data["name"], conf_data["website"], conf_data["start_date"]):
                     print(f"Skipping {conf_data['acronym']}: Already exists.")
                     continue
 
@@ -293,7 +293,11 @@ async def seed_data():
                     colocated_with=colocated,
                     publisher="IEEE" if "IEEE" in conf_data["name"] else "ACM" if "ACM" in conf_data["name"] else "Sciflow"
                 )
+                set_coordinates(new_conf)
                 session.add(new_conf)
+                await session.flush()
+                await sync_conference_topics(session, new_conf.id, new_conf.topics)
+                index.add(new_conf.id, new_conf.name, new_conf.acronym, new_conf.website, new_conf.start_date)
                 count += 1
             
             print(f"Added {count} new conferences.")
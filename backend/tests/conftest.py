@@ -0,0 +1,51 @@
+import os
+import sqlite3
+import sys
+import tempfile
+
+import pytest
+
+# Configure the app before it is imported: a throwaway SQLite database, jobs run
+# by the test rather than a background loop, and no rate limits unless a test
+# turns them on
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="sciflow-tests-"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ["JOBS_IN_PROCESS"] = "false"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ.setdefault("CACHE_BACKEND", "memory")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def sqlite(client):
+    """Plain connection to the app's database, for arranging and checking rows behind the API."""
+    conn = sqlite3.connect(DB_PATH)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def signup(client):
+    counter = {"n": 0}
+
+    def _signup(role: str = "user") -> dict:
+        counter["n"] += 1
+        email = f"{role}{counter['n']}-{os.urandom(4).hex()}@example.org"
+        r = client.post(
+            "/auth/signup",
+            json={"email": email, "password": "pw", "full_name": email.split("@")[0], "role": role},
+        )
+        assert r.status_code == 201, r.text
+        return {"Authorization": "Bearer " + r.json()["access_token"]}
+
+    return _signup
@@ -0,0 +1,132 @@
+import asyncio
+import json
+
+import pytest
+
+from app import cache
+from app.cache import Cache, FileBackend, InvalidationBus, MemoryBackend, RedisBackend, worker_id
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+@pytest.fixture(params=["memory", "file", "redis"])
+def backend(request, tmp_path, monkeypatch):
+    if request.param == "memory":
+        new = MemoryBackend()
+    elif request.param == "file":
+        new = FileBackend(str(tmp_path / "cache.db"))
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        new = RedisBackend(client=fakeredis.aioredis.FakeRedis())
+    monkeypatch.setattr(cache, "backend", new)
+    yield new
+    _run(new.close())
+
+
+def test_set_get_delete(backend):
+    c = Cache("test", 60)
+
+    async def scenario():
+        await c.set(1, {"a": 1})
+        assert await c.get(1) == {"a": 1}
+        await c.delete(1)
+        assert await c.get(1, "missing") == "missing"
+
+    _run(scenario())
+
+
+def test_get_many_set_many(backend):
+    c = Cache("test", 60)
+
+    async def scenario():
+        await c.set(1, "one")
+        await c.set_many({2: "two", (3, "x"): {"three": 3}})
+        return await c.get_many([1, 2, (3, "x"), 4])
+
+    assert _run(scenario()) == {1: "one", 2: "two", (3, "x"): {"three": 3}}
+
+
+def test_get_many_skips_expired(backend):
+    if isinstance(backend, RedisBackend):
+        pytest.skip("expiry is the server's job")
+    c = Cache("test", 60)
+
+    async def scenario():
+        await c.set_many({1: "gone"}, ttl_seconds=0.01)
+        await asyncio.sleep(0.05)
+        return await c.get_many([1])
+
+    assert _run(scenario()) == {}
+
+
+def test_clear_prefix_only_drops_matching_tuple_keys(backend):
+    c = Cache("test", 60)
+
+    async def scenario():
+        await c.set((1, "a"), "1a")
+        await c.set((1, "b"), "1b")
+        await c.set((11, "a"), "11a")
+        await c.clear_prefix(1)
+        return [await c.get(k) for k in ((1, "a"), (1, "b"), (11, "a"))]
+
+    assert _run(scenario()) == [None, None, "11a"]
+
+
+def test_publish_invalidates_in_this_worker(backend):
+    c = Cache("test", 60)
+    bus = InvalidationBus()
+
+    async def on_changed(data):
+        await c.delete(data["conference_id"])
+
+    bus.subscribe("conference.changed", on_changed)
+
+    async def scenario():
+        await c.set(7, "stale")
+        await bus.publish("conference.changed", conference_id=7)
+        return await c.get(7)
+
+    assert _run(scenario()) is None
+
+
+def test_other_workers_events_are_handled_and_own_are_skipped(tmp_path, monkeypatch):
+    shared = FileBackend(str(tmp_path / "cache.db"))
+    monkeypatch.setattr(cache, "backend", shared)
+    monkeypatch.setattr(cache, "CACHE_BUS_POLL_SECONDS", 0.01)
+    handled = []
+    bus = InvalidationBus()
+
+    async def on_changed(data):
+        handled.append(data["conference_id"])
+
+    bus.subscribe("conference.changed", on_changed)
+
+    async def scenario():
+        bus.start()
+        await asyncio.sleep(0.05)
+        for origin, conference_id in ((worker_id(), 1), ("another-worker", 2)):
+            message = {"origin": origin, "event": "conference.changed", "data": {"conference_id": conference_id}}
+            await shared.publish(json.dumps(message))
+        for _ in range(100):
+            if handled:
+                break
+            await asyncio.sleep(0.01)
+        await bus.stop()
+
+    _run(scenario())
+    assert handled == [2]
+
+
+def test_worker_id_is_per_process(monkeypatch):
+    first = worker_id()
+    assert worker_id() == first
+    # As seen by a worker forked after the id was first made
+    monkeypatch.setattr(cache.os, "getpid", lambda: -1)
+    assert worker_id() != first
+    assert worker_id().startswith("-1-")
@@ -0,0 +1,60 @@
+import jwt
+
+from app.auth import ALGORITHM, SECRET_KEY
+
+
+def _feed_token(client, headers) -> str:
+    r = client.get("/users/me/calendar-token", headers=headers)
+    assert r.status_code == 200, r.text
+    return r.json()["token"]
+
+
+def test_feed_token_opens_feed(client, signup):
+    token = _feed_token(client, signup())
+    r = client.get("/users/me/calendar.ics", params={"token": token})
+    assert r.status_code == 200
+    assert r.text.startswith("BEGIN:VCALENDAR")
+
+
+def test_feed_token_is_not_an_api_credential(client, signup):
+    headers = signup()
+    assert client.get("/users/me/recommendations", headers=headers).status_code == 200
+    token = _feed_token(client, headers)
+    bearer = {"Authorization": f"Bearer {token}"}
+    assert client.get("/users/me/recommendations", headers=bearer).status_code == 401
+    assert client.get("/users/me/calendar-token", headers=bearer).status_code == 401
+
+
+def test_legacy_calendar_scope_rejected(client, signup):
+    headers = signup()
+    sub = jwt.decode(headers["Authorization"][7:], SECRET_KEY, algorithms=[ALGORITHM])["sub"]
+    legacy = jwt.encode({"sub": sub, "scope": "calendar"}, SECRET_KEY, algorithm=ALGORITHM)
+    r = client.get("/users/me/recommendations", headers={"Authorization": f"Bearer {legacy}"})
+    assert r.status_code == 401
+    # Nor does it open the feed: it was not signed with the feed key
+    assert client.get("/users/me/calendar.ics", params={"token": legacy}).status_code == 401
+
+
+def test_access_token_does_not_open_feed(client, signup):
+    headers = signup()
+    r = client.get("/users/me/calendar.ics", params={"token": headers["Authorization"][7:]})
+    assert r.status_code == 401
+
+
+def test_rotation_revokes_old_urls(client, signup):
+    headers = signup()
+    old = _feed_token(client, headers)
+    r = client.post("/users/me/calendar-token/rotate", headers=headers)
+    assert r.status_code == 200, r.text
+    new = r.json()["token"]
+    assert new != old
+    assert client.get("/users/me/calendar.ics", params={"token": old}).status_code == 401
+    assert client.get("/users/me/calendar.ics", params={"token": new}).status_code == 200
+
+
+def test_feed_revalidates_with_weak_etag(client, signup):
+    token = _feed_token(client, signup())
+    etag = client.get("/users/me/calendar.ics", params={"token": token}).headers["etag"]
+    weak = etag if etag.startswith("W/") else "W/" + etag
+    r = client.get("/users/me/calendar.ics", params={"token": token}, headers={"If-None-Match": weak})
+    assert r.status_code == 304
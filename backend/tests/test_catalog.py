@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from app.routers.conferences import facets_cache
+from populate_db import CONFERENCES_DATA, seed_data
+
+
+@pytest.fixture
+def run(client):
+    # The loop the TestClient runs the app (and its engine) on
+    return asyncio.get_event_loop().run_until_complete
+
+
+def _facet(facets, name, value):
+    return next((f["count"] for f in facets[name] if f["value"] == value), 0)
+
+
+def test_seeded_conferences_are_topic_indexed(client, run):
+    run(seed_data())
+    emnlp = next(c for c in CONFERENCES_DATA if c["acronym"] == "EMNLP 2025")
+    r = client.get("/conferences", params={"topic": "computational linguistics"})
+    assert emnlp["website"] in [c["website"] for c in r.json()]
+
+
+def test_facets_skip_vanished_external_events(client, run, sqlite):
+    for name, vanished in (("Visible Facet Conf", None), ("Vanished Facet Conf", "2026-01-01 00:00:00")):
+        cursor = sqlite.execute(
+            "INSERT INTO conferences (name, publisher, is_external) VALUES (?, 'FacetPub', 1)", (name,)
+        )
+        sqlite.execute(
+            "INSERT INTO external_events (conference_id, source, url, vanished_at) VALUES (?, 'test', ?, ?)",
+            (cursor.lastrowid, f"https://feed.example/{cursor.lastrowid}", vanished),
+        )
+    sqlite.commit()
+    # Rows written behind the app's back: drop the cached facets by hand
+    run(facets_cache.clear())
+
+    listed = client.get("/conferences", params={"publisher": "FacetPub"}).json()
+    facets = client.get("/conferences/facets").json()
+    assert [c["name"] for c in listed] == ["Visible Facet Conf"]
+    assert _facet(facets, "publishers", "FacetPub") == len(listed) == 1
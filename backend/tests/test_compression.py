@@ -0,0 +1,104 @@
+import asyncio
+import zlib
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.compression import CompressionMiddleware, negotiate_encoding
+
+CHUNKS = [b'{"part": "%d", "pad": "%s"}\n' % (i, b"x" * 2000) for i in range(3)]
+
+
+def _big(request):
+    return JSONResponse({"items": ["y" * 50] * 100}, headers={"ETag": '"abc"'})
+
+
+def _small(request):
+    return JSONResponse({"ok": True}, headers={"ETag": '"small"'})
+
+
+async def _stream(request):
+    async def body():
+        for chunk in CHUNKS:
+            yield chunk
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+@pytest.fixture
+def client():
+    app = Starlette(routes=[Route("/big", _big), Route("/small", _small), Route("/stream", _stream)])
+    app.add_middleware(CompressionMiddleware)
+    return TestClient(app)
+
+
+def _capture(client, path, encoding):
+    """Raw body messages as the middleware sends them, before any client-side decoding."""
+    messages = []
+    requested = []
+
+    async def receive():
+        if requested:
+            # Streaming responses listen for a disconnect that never comes
+            await asyncio.Event().wait()
+        requested.append(True)
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "scheme": "http", "server": ("test", 80), "client": ("1.2.3.4", 1),
+        "http_version": "1.1", "headers": [(b"accept-encoding", encoding.encode())],
+    }
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(client.app(scope, receive, send))
+    finally:
+        loop.close()
+    return messages
+
+
+def test_negotiation():
+    assert negotiate_encoding("gzip, br") in ("br", "gzip")
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("") is None
+
+
+def test_compressed_response_gets_weak_etag(client):
+    r = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["etag"] == 'W/"abc"'
+    assert r.json()["items"][0] == "y" * 50
+
+
+def test_small_response_untouched(client):
+    r = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in r.headers
+    assert r.headers["etag"] == '"small"'
+
+
+def test_streamed_gzip_chunks_are_flushed(client):
+    messages = _capture(client, "/stream", "gzip")
+    bodies = [m["body"] for m in messages if m["type"] == "http.response.body"]
+    decoder = zlib.decompressobj(31)
+    # Each chunk decodes to exactly what the app had sent by then
+    for original, compressed in zip(CHUNKS, bodies):
+        assert decoder.decompress(compressed) == original
+    assert decoder.decompress(b"".join(bodies[len(CHUNKS):])) + decoder.flush() == b""
+    assert decoder.eof
+
+
+def test_streamed_brotli_chunks_are_flushed(client):
+    brotli = pytest.importorskip("brotli")
+    messages = _capture(client, "/stream", "br")
+    bodies = [m["body"] for m in messages if m["type"] == "http.response.body"]
+    decoder = brotli.Decompressor()
+    for original, compressed in zip(CHUNKS, bodies):
+        assert decoder.process(compressed) == original
+    assert decoder.process(b"".join(bodies[len(CHUNKS):])) == b""
+    assert decoder.is_finished()
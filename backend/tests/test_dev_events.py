@@ -0,0 +1,37 @@
+from datetime import date
+
+import pytest
+
+from app.dev_events import parse_feed, parse_when
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("September 24, 2026", (date(2026, 9, 24), date(2026, 9, 24), None)),
+    ("Sep 24-25 2026", (date(2026, 9, 24), date(2026, 9, 25), None)),
+    ("Sep. 24 – 25, 2026, Berlin, Germany", (date(2026, 9, 24), date(2026, 9, 25), "Berlin, Germany")),
+    ("Sep 30 - Oct 2, 2026", (date(2026, 9, 30), date(2026, 10, 2), None)),
+    ("Dec 30, 2026 - Jan 2, 2027", (date(2026, 12, 30), date(2027, 1, 2), None)),
+    ("Dec 30 - Jan 2, 2027, Online", (date(2026, 12, 30), date(2027, 1, 2), "Online")),
+    ("Dec 31 - 31, 2026", (date(2026, 12, 31), date(2026, 12, 31), None)),
+])
+def test_parse_when(text, expected):
+    assert parse_when(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "soon", "Smarch 3, 2026", "Feb 30, 2026", "Sep 24"])
+def test_parse_when_unparseable(text):
+    assert parse_when(text) == (None, None, None)
+
+
+def test_parse_feed_in_chunks():
+    body = (
+        b"<rss><channel><title>dev.events</title>"
+        b"<item><title>PyCon</title><link>https://dev.events/py</link>"
+        b"<description>PyCon is happening on Dec 30 - Jan 2, 2027, Lisbon, Portugal. More information: x</description>"
+        b"</item><item><title>No link</title></item></channel></rss>"
+    )
+    items = list(parse_feed(body[i:i + 16] for i in range(0, len(body), 16)))
+    assert len(items) == 1
+    assert items[0]["website"] == "https://dev.events/py"
+    assert (items[0]["start_date"], items[0]["end_date"]) == (date(2026, 12, 30), date(2027, 1, 2))
+    assert items[0]["location"] == "Lisbon, Portugal"
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from app.event_sources import BufferedAdapter, EventSource, JSONAdapter, fetch_all_sources
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class StubSource(EventSource):
+    def __init__(self, name, result):
+        super().__init__(name, f"https://{name}.example/feed.json", "json", retries=0)
+        self.result = result
+
+    async def _fetch_once(self):
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_json_adapter_skips_malformed_entries():
+    body = b'[1, "x", null, {"name": 3, "url": 5}, {"title": "Good Conf", "url": "https://good.example"}]'
+    items = JSONAdapter().parse(body)
+    assert [item["website"] for item in items] == ["https://good.example"]
+    assert JSONAdapter().parse(b'{"events": 5}') == []
+    assert JSONAdapter().parse(b'"just a string"') == []
+
+
+def test_one_broken_source_does_not_fail_the_others():
+    good = StubSource("good", [{"website": "https://a.example", "name": "A"}])
+    broken = StubSource("broken", AttributeError("'int' object has no attribute 'get'"))
+    by_source = _run(fetch_all_sources([broken, good]))
+    assert by_source["broken"] is None
+    assert [item["website"] for item in by_source["good"]] == ["https://a.example"]
+    assert broken.last_error.startswith("AttributeError")
+    assert broken.breaker.failures == 1
+
+
+def test_duplicate_websites_kept_by_first_source():
+    first = StubSource("first", [{"website": "https://a.example"}])
+    second = StubSource("second", [{"website": "https://a.example"}, {"website": "https://b.example"}])
+    by_source = _run(fetch_all_sources([first, second]))
+    assert [item["website"] for item in by_source["second"]] == ["https://b.example"]
+
+
+def test_source_raising_outside_its_fetch_loop_is_contained():
+    class Exploding(StubSource):
+        async def fetch(self):
+            raise RuntimeError("boom")
+
+    good = StubSource("good", [{"website": "https://c.example"}])
+    by_source = _run(fetch_all_sources([Exploding("exploding", []), good]))
+    assert by_source == {"exploding": None, "good": [{"website": "https://c.example"}]}
+
+
+def test_buffered_adapter_requires_parse():
+    class NoParse(BufferedAdapter):
+        pass
+
+    with pytest.raises(TypeError):
+        NoParse()
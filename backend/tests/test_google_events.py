@@ -0,0 +1,40 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.models import Conference
+from tests.conftest import DB_PATH
+
+
+async def _delete_conference(conference_id: int):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{DB_PATH}")
+    try:
+        async with AsyncSession(engine) as db:
+            await db.delete(await db.get(Conference, conference_id))
+            await db.commit()
+    finally:
+        await engine.dispose()
+
+
+def test_deleting_conference_removes_synced_event_records(client, signup, sqlite):
+    headers = signup("organizer")
+    r = client.post("/conferences", json={"name": "Delete Me Conf"}, headers=headers)
+    assert r.status_code in (200, 201), r.text
+    conference_id = r.json()["id"]
+    user_id = sqlite.execute("SELECT organizer_id FROM conferences WHERE id = ?", (conference_id,)).fetchone()[0]
+    sqlite.execute(
+        "INSERT INTO google_calendar_events (user_id, conference_id, event_id) VALUES (?, ?, 'evt')",
+        (user_id, conference_id),
+    )
+    sqlite.commit()
+
+    # Not asyncio.run: that would unset the event loop the TestClient keeps using
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(_delete_conference(conference_id))
+    finally:
+        loop.close()
+    remaining = sqlite.execute(
+        "SELECT COUNT(*) FROM google_calendar_events WHERE conference_id = ?", (conference_id,)
+    ).fetchone()[0]
+    assert remaining == 0
@@ -0,0 +1,66 @@
+import asyncio
+
+import jwt
+import pytest
+
+from app import google_sync
+from app.auth import ALGORITHM, SECRET_KEY
+from app.google_sync import run_sync_job
+
+
+@pytest.fixture
+def run(client):
+    # The loop the TestClient runs the app (and its engine) on
+    return asyncio.get_event_loop().run_until_complete
+
+
+@pytest.fixture
+def sync_job(client, signup, sqlite):
+    """Id of a pending GoogleSyncJob for a fresh user, optionally with Google connected."""
+    def make(connected: bool = True) -> int:
+        headers = signup()
+        user_id = jwt.decode(headers["Authorization"][7:], SECRET_KEY, algorithms=[ALGORITHM])["sub"]
+        if connected:
+            sqlite.execute("UPDATE users SET google_refresh_token = 'refresh' WHERE id = ?", (user_id,))
+        cursor = sqlite.execute("INSERT INTO google_sync_jobs (user_id, status) VALUES (?, 'pending')", (user_id,))
+        sqlite.commit()
+        return cursor.lastrowid
+
+    return make
+
+
+def _state(sqlite, job_id):
+    return sqlite.execute("SELECT status, error, finished_at FROM google_sync_jobs WHERE id = ?", (job_id,)).fetchone()
+
+
+def test_completed(run, sync_job, sqlite, monkeypatch):
+    async def refresh(token):
+        return "access"
+
+    monkeypatch.setattr(google_sync, "refresh_access_token", refresh)
+    job_id = sync_job()
+    run(run_sync_job(job_id))
+    status, error, finished_at = _state(sqlite, job_id)
+    assert (status, error) == ("completed", None) and finished_at is not None
+
+
+def test_failure_before_running_is_recorded(run, sync_job, sqlite):
+    job_id = sync_job(connected=False)
+    run(run_sync_job(job_id))
+    assert _state(sqlite, job_id)[:2] == ("failed", "Google Calendar is no longer connected")
+
+
+def test_timeout_does_not_leave_job_running(run, sync_job, sqlite, monkeypatch):
+    async def hang(token):
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(google_sync, "refresh_access_token", hang)
+    job_id = sync_job()
+    with pytest.raises(asyncio.TimeoutError):
+        run(asyncio.wait_for(run_sync_job(job_id), timeout=0.2))
+    status, error, finished_at = _state(sqlite, job_id)
+    assert status == "failed" and "cancelled" in error and finished_at is not None
+
+
+def test_missing_job_is_a_no_op(run):
+    run(run_sync_job(10 ** 9))
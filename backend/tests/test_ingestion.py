@@ -0,0 +1,64 @@
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app import ingestion
+from app.db import async_session
+from app.ingestion import ingest_external_events, upsert_events
+
+
+@pytest.fixture
+def run(client):
+    # The loop the TestClient runs the app (and its engine) on
+    return asyncio.get_event_loop().run_until_complete
+
+
+def _item(name, website, start=date(2027, 5, 3)):
+    return {"name": name, "website": website, "description": "", "location": "Lisbon, Portugal",
+            "start_date": start, "end_date": start}
+
+
+async def _upsert(source, items):
+    async with async_session() as db:
+        return await upsert_events(db, source, items)
+
+
+def test_repointed_event_updates_website(run, sqlite):
+    run(_upsert("repoint", [_item("Repointed Systems Symposium 2027", "https://old.example/rss-2027")]))
+    stats = run(_upsert("repoint", [_item("Repointed Systems Symposium 2027", "https://new.example/rss-2027")]))
+    assert (stats["created"], stats["updated"]) == (0, 1)
+    rows = sqlite.execute(
+        "SELECT c.website, e.url FROM conferences c JOIN external_events e ON e.conference_id = c.id "
+        "WHERE c.name = 'Repointed Systems Symposium 2027'"
+    ).fetchall()
+    assert rows == [("https://new.example/rss-2027", "https://new.example/rss-2027")]
+
+
+def test_rolled_back_source_does_not_dedupe_later_sources(run, sqlite, monkeypatch):
+    event = _item("Rollback Robotics Forum 2027", "https://rollback.example/2027")
+
+    async def fetch_all_sources():
+        return {"first": [event], "second": [event]}
+
+    real_upsert = ingestion.upsert_events
+
+    async def upsert(db, source, items, index=None):
+        if source == "first":
+            # As if another worker had inserted the event between our check and commit
+            async def conflict():
+                raise IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed"))
+            db.commit = conflict
+        return await real_upsert(db, source, items, index)
+
+    monkeypatch.setattr(ingestion, "fetch_all_sources", fetch_all_sources)
+    monkeypatch.setattr(ingestion, "upsert_events", upsert)
+    stats = run(ingest_external_events(force=True))
+    assert "first" not in stats
+    assert stats["second"]["created"] == 1
+    sources = sqlite.execute(
+        "SELECT e.source FROM conferences c JOIN external_events e ON e.conference_id = c.id "
+        "WHERE c.name = 'Rollback Robotics Forum 2027'"
+    ).fetchall()
+    assert sources == [("second",)]
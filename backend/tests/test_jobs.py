@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+
+from app import jobs
+from app.db import async_session
+from app.jobs import PermanentJobError, enqueue, run_job
+from app.models import Job
+
+calls = {"flaky": 0}
+
+
+async def _flaky(payload):
+    calls["flaky"] += 1
+    if calls["flaky"] < payload["succeed_on"]:
+        raise RuntimeError("try again")
+    return {"attempt": calls["flaky"]}
+
+
+async def _permanent(payload):
+    raise PermanentJobError("bad payload")
+
+
+@pytest.fixture
+def run(client, monkeypatch):
+    # Only the test kinds are claimable, whatever else the app has queued
+    monkeypatch.setattr(jobs, "_handlers", {"test.flaky": _flaky, "test.permanent": _permanent})
+    calls["flaky"] = 0
+    # The loop the TestClient runs the app (and its engine) on
+    return asyncio.get_event_loop().run_until_complete
+
+
+async def _load(job_id: int) -> Job:
+    async with async_session() as db:
+        return await db.get(Job, job_id)
+
+
+async def _attempt(job_id: int, make_due: bool = True) -> Job:
+    if make_due:
+        # Skip the backoff wait
+        async with async_session() as db:
+            await db.execute(update(Job).where(Job.id == job_id).values(run_at=datetime.utcnow()))
+            await db.commit()
+    job = await jobs._claim()
+    assert job is not None and job.id == job_id
+    assert job.status == "running" and job.locked_by == jobs.worker_id()
+    await run_job(job)
+    return await _load(job_id)
+
+
+def test_failed_attempt_is_retried_with_backoff(run):
+    job = run(enqueue("test.flaky", {"succeed_on": 3}))
+
+    after = run(_attempt(job.id))
+    assert (after.status, after.attempts, after.last_error) == ("pending", 1, "RuntimeError: try again")
+    assert after.run_at > datetime.utcnow()
+    # Not due yet, so nothing is claimed
+    assert run(jobs._claim()) is None
+
+    run(_attempt(job.id))
+    done = run(_attempt(job.id))
+    assert (done.status, done.attempts, done.last_error) == ("completed", 3, None)
+    assert done.result == '{"attempt": 3}'
+
+
+def test_max_attempts_is_honored(run):
+    job = run(enqueue("test.flaky", {"succeed_on": 99}, max_attempts=2))
+    run(_attempt(job.id))
+    failed = run(_attempt(job.id))
+    assert (failed.status, failed.attempts) == ("failed", 2)
+    assert failed.finished_at is not None
+
+
+def test_permanent_error_fails_at_once(run):
+    job = run(enqueue("test.permanent"))
+    failed = run(_attempt(job.id))
+    assert (failed.status, failed.attempts, failed.last_error) == ("failed", 1, "PermanentJobError: bad payload")
+
+
+def test_dedupe_key_returns_active_job(run):
+    first = run(enqueue("test.flaky", {"succeed_on": 1}, dedupe_key="same"))
+    second = run(enqueue("test.flaky", {"succeed_on": 1}, dedupe_key="same"))
+    assert second.id == first.id
+    run(_attempt(first.id))
+    # Finished jobs no longer hold the key
+    third = run(enqueue("test.flaky", {"succeed_on": 1}, dedupe_key="same"))
+    assert third.id != first.id
+    run(_attempt(third.id))
+
+
+def test_backoff_doubles_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(jobs.random, "random", lambda: 1.0)
+    monkeypatch.setattr(jobs, "JOB_BACKOFF_SECONDS", 5.0)
+    monkeypatch.setattr(jobs, "JOB_MAX_BACKOFF_SECONDS", 30.0)
+    assert [jobs._backoff(n) for n in range(1, 6)] == [5.0, 10.0, 20.0, 30.0, 30.0]
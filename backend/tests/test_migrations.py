@@ -0,0 +1,66 @@
+import asyncio
+
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.migrations import SCHEMA_VERSION, get_schema_version, run_migrations
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def _columns(engine, table):
+    async with engine.connect() as conn:
+        return await conn.run_sync(lambda c: {col["name"] for col in inspect(c).get_columns(table)})
+
+
+def test_fresh_database_reaches_current_version(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/fresh.db")
+        try:
+            assert await get_schema_version(engine) == 0
+            assert await run_migrations(engine) == SCHEMA_VERSION
+            # Up to date: nothing left to apply
+            assert await run_migrations(engine) == SCHEMA_VERSION
+            assert "calendar_token_version" in await _columns(engine, "users")
+            async with engine.connect() as conn:
+                rows = (await conn.execute(text("SELECT version FROM schema_version"))).all()
+            assert rows == [(SCHEMA_VERSION,)]
+        finally:
+            await engine.dispose()
+
+    _run(scenario())
+
+
+def test_old_database_is_upgraded_and_backfilled(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/old.db")
+        try:
+            await run_migrations(engine)
+            # Roll the schema back to how version 6 left it
+            async with engine.begin() as conn:
+                await conn.execute(text("ALTER TABLE conferences DROP COLUMN latitude"))
+                await conn.execute(text("ALTER TABLE conferences DROP COLUMN longitude"))
+                await conn.execute(text("ALTER TABLE users DROP COLUMN calendar_token_version"))
+                await conn.execute(text("UPDATE schema_version SET version = 6"))
+                await conn.execute(text(
+                    "INSERT INTO conferences (name, location, is_external) VALUES ('Old Conf', 'Vancouver, Canada', 0)"
+                ))
+
+            assert await run_migrations(engine) == SCHEMA_VERSION
+            assert {"latitude", "longitude"} <= await _columns(engine, "conferences")
+            assert "calendar_token_version" in await _columns(engine, "users")
+            async with engine.connect() as conn:
+                lat, lon = (await conn.execute(
+                    text("SELECT latitude, longitude FROM conferences WHERE name = 'Old Conf'")
+                )).one()
+            assert round(lat) == 49 and round(lon) == -123
+        finally:
+            await engine.dispose()
+
+    _run(scenario())
@@ -0,0 +1,94 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app import rate_limit
+from app.auth import create_access_token, create_calendar_token
+from app.models import User
+from app.rate_limit import MemoryBuckets, RateLimitMiddleware
+
+
+def _ok(request):
+    return PlainTextResponse("ok")
+
+
+@pytest.fixture
+def limited(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_IP_BURST", 3)
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_IP_PER_SECOND", 0.001)
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_USER_BURST", 5)
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_USER_PER_SECOND", 0.001)
+    app = Starlette(routes=[Route("/ping", _ok), Route("/conferences", _ok)])
+    app.add_middleware(RateLimitMiddleware, buckets=MemoryBuckets())
+    return TestClient(app)
+
+
+def test_burst_then_429_with_retry_after(limited):
+    assert [limited.get("/ping").status_code for _ in range(3)] == [200, 200, 200]
+    r = limited.get("/ping")
+    assert r.status_code == 429
+    assert int(r.headers["retry-after"]) >= 1
+
+
+def test_route_cost(limited):
+    # GET /conferences costs 5, more than the whole anonymous burst
+    assert limited.get("/conferences").status_code == 429
+
+
+def test_spoofed_forwarded_for_ignored_by_default(limited):
+    codes = [
+        limited.get("/ping", headers={"X-Forwarded-For": f"10.0.0.{i}"}).status_code
+        for i in range(4)
+    ]
+    assert codes == [200, 200, 200, 429]
+
+
+def test_trusted_proxy_uses_last_hop(limited, monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUST_PROXY", True)
+    # The client controls every hop but the one our proxy appended
+    codes = [
+        limited.get("/ping", headers={"X-Forwarded-For": f"10.0.0.{i}, 203.0.113.7"}).status_code
+        for i in range(4)
+    ]
+    assert codes == [200, 200, 200, 429]
+    assert limited.get("/ping", headers={"X-Forwarded-For": "203.0.113.8"}).status_code == 200
+
+
+def test_signed_in_users_have_their_own_bucket(limited):
+    for _ in range(3):
+        limited.get("/ping")
+    assert limited.get("/ping").status_code == 429
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": 1})}
+    assert [limited.get("/ping", headers=headers).status_code for _ in range(6)] == [200] * 5 + [429]
+
+
+def test_calendar_token_does_not_get_a_user_bucket(limited):
+    token = create_calendar_token(User(id=2, calendar_token_version=0))
+    headers = {"Authorization": f"Bearer {token}"}
+    assert [limited.get("/ping", headers=headers).status_code for _ in range(4)] == [200, 200, 200, 429]
+
+
+def test_clients_behind_the_proxy_get_their_own_buckets(limited, monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUST_PROXY", True)
+    # Every request arrives from the proxy's socket address; only the header tells clients apart
+    for _ in range(3):
+        assert limited.get("/ping", headers={"X-Forwarded-For": "198.51.100.1"}).status_code == 200
+    assert limited.get("/ping", headers={"X-Forwarded-For": "198.51.100.1"}).status_code == 429
+    assert limited.get("/ping", headers={"X-Forwarded-For": "198.51.100.2"}).status_code == 200
+    # No header (a health check from inside the platform): the socket address
+    assert limited.get("/ping").status_code == 200
+
+
+def test_proxy_hops_pick_the_outermost_proxys_entry(limited, monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUST_PROXY", True)
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_PROXY_HOPS", 2)
+    # spoofed, client (added by the CDN), CDN (added by the load balancer)
+    codes = [
+        limited.get("/ping", headers={"X-Forwarded-For": f"10.0.0.{i}, 203.0.113.9, 192.0.2.1"}).status_code
+        for i in range(4)
+    ]
+    assert codes == [200, 200, 200, 429]
+    assert limited.get("/ping", headers={"X-Forwarded-For": "203.0.113.10, 192.0.2.1"}).status_code == 200
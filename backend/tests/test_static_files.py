@@ -0,0 +1,64 @@
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from app.compression import CompressionMiddleware
+from app.static_files import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, CachedStaticFiles, precompress_tree
+
+
+@pytest.fixture
+def static(tmp_path):
+    upload = tmp_path / "images" / ("a" * 64)
+    upload.mkdir(parents=True)
+    (upload / "photo.png").write_bytes(b"png")
+    (tmp_path / "logo.png").write_bytes(b"logo")
+    app = Starlette(routes=[Mount("/static", CachedStaticFiles(directory=str(tmp_path)))])
+    return TestClient(app)
+
+
+def test_uploads_are_immutable(static):
+    r = static.get(f"/static/images/{'a' * 64}/photo.png")
+    assert r.status_code == 200
+    assert r.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+
+def test_other_files_revalidate(static):
+    r = static.get("/static/logo.png")
+    assert r.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+    assert static.get("/static/logo.png", headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+
+
+def test_range_request(static):
+    r = static.get("/static/logo.png", headers={"Range": "bytes=1-2"})
+    assert r.status_code == 206
+    assert r.content == b"og"
+
+
+def test_concurrent_precompress_leaves_whole_variants(tmp_path):
+    data = b"body { color: red; }\n" * 2000
+    (tmp_path / "app.css").write_bytes(data)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        # Four workers starting at once, as gunicorn -w 4 does
+        list(pool.map(lambda _: precompress_tree(str(tmp_path)), range(4)))
+    assert gzip.decompress((tmp_path / "app.css.gz").read_bytes()) == data
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".tmp")]
+
+
+def test_compressed_on_the_fly_revalidates_with_weak_etag(tmp_path):
+    # No precompressed sibling: CompressionMiddleware compresses it and weakens the tag
+    (tmp_path / "data.json").write_text('{"pad": "%s"}' % ("x" * 4000))
+    app = Starlette(routes=[Mount("/static", CachedStaticFiles(directory=str(tmp_path)))])
+    app.add_middleware(CompressionMiddleware)
+    client = TestClient(app)
+    r = client.get("/static/data.json", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["etag"].startswith("W/")
+    again = client.get("/static/data.json", headers={"Accept-Encoding": "gzip", "If-None-Match": r.headers["etag"]})
+    assert again.status_code == 304
+    other = client.get("/static/data.json", headers={"If-None-Match": 'W/"other", "another"'})
+    assert other.status_code == 200
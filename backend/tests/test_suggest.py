@@ -0,0 +1,40 @@
+from app.suggest import SuggestIndex
+
+
+def _catalog(n: int = 1200):
+    # Alphabetically, the popular one sorts after every other match
+    rows = [(i, f"Alpha Conference {i:05d}", None, None, 1) for i in range(n)]
+    rows.append((n, "Alpha Zeta Summit", "AZS", None, 500))
+    return rows
+
+
+def test_popular_match_beyond_the_first_keys_ranks_first():
+    index = SuggestIndex.build(_catalog())
+    for prefix in ("a", "alpha", "al"):
+        assert index.suggest(prefix, 3)[0]["name"] == "Alpha Zeta Summit"
+
+
+def test_ranking_follows_interest_changes():
+    index = SuggestIndex.build(_catalog())
+    assert index.suggest("alpha", 1)[0]["conference_id"] == 1200
+    index.set_interests(7, 900)
+    assert [s["conference_id"] for s in index.suggest("alpha", 2)] == [7, 1200]
+    index.remove(7)
+    assert index.suggest("alpha", 1)[0]["conference_id"] == 1200
+    index.update(8, "Beta Workshop", None, None, 1000)
+    assert index.suggest("alpha", 1)[0]["conference_id"] == 1200
+    assert index.suggest("beta")[0]["conference_id"] == 8
+
+
+def test_word_starts_acronyms_and_ties():
+    index = SuggestIndex.build([
+        (1, "International Conference on Machine Learning", "ICML", None, 10),
+        (2, "Machine Vision Days", None, None, 10),
+        (3, "Robotics Summit", None, "RSS", 0),
+    ])
+    # Equal interest: alphabetical by name
+    assert [s["conference_id"] for s in index.suggest("mach")] == [1, 2]
+    assert [s["conference_id"] for s in index.suggest("icm")] == [1]
+    assert [s["conference_id"] for s in index.suggest("rss")] == [3]
+    assert index.suggest("zz") == []
+    assert index.suggest("  ") == []
@@ -44,10 +44,30 @@ function ConferenceDetail() {
   const [uploading, setUploading] = useState(false)
 
   useEffect(() => {
-    fetchConference()
-    fetchComments()
+    loadPage()
   }, [id])
 
+  // First paint: conference and comments in one round trip
+  const loadPage = async () => {
+    try {
+      const { data } = await api.post('/batch', {
+        requests: [
+          { id: 'conference', path: `/conferences/${id}` },
+          { id: 'comments', path: `/conferences/${id}/comments` },
+        ],
+      })
+      const [conf, comms] = data.responses
+      if (conf.status !== 200) throw new Error(`conference: ${conf.status}`)
+      setConference(conf.body)
+      if (conf.body.user_rating) setRating(conf.body.user_rating)
+      if (comms.status === 200) setComments(comms.body)
+      setLoading(false)
+    } catch (err) {
+      fetchConference()
+      fetchComments()
+    }
+  }
+
   const fetchConference = async () => {
     try {
       const response = await api.get(`/conferences/${id}`)
@@ -110,7 +130,19 @@ function ConferenceDetail() {
     if (!user) return alert('Please login first')
     try {
       const response = await api.post(`/google/conferences/${id}/add`)
-      setGoogleMsg('✅ Added! ' + response.data.event_link)
+      if (response.status !== 202) {
+        setGoogleMsg('✅ Added! ' + response.data.event_link)
+        return
+      }
+      // Created by a background job; poll it for the event link
+      setGoogleMsg('Adding to Google Calendar...')
+      for (let i = 0; i < 30; i++) {
+        await new Promise((resolve) => setTimeout(resolve, 1000))
+        const { data: job } = await api.get(`/jobs/${response.data.job_id}`)
+        if (job.status === 'completed') return setGoogleMsg('✅ Added! ' + job.result.event_link)
+        if (job.status === 'failed') return setGoogleMsg('Failed to add to Google Calendar')
+      }
+      setGoogleMsg('Still adding to Google Calendar, check back shortly')
     } catch (err) {
       const detail = err.response?.data?.detail
       if (detail === 'Google Calendar not connected') {